@@ -0,0 +1,34 @@
+"""audit log indexes
+
+Revision ID: 2d8b6f4c1e97
+Revises: 9f3c1a7e5d20
+Create Date: 2026-10-16 14:21:05.412983
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8b6f4c1e97'
+down_revision: Union[str, Sequence[str], None] = '9f3c1a7e5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_audit_logs_contract_created', 'audit_logs', ['contract_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_audit_logs_created', 'audit_logs', ['created_at', 'id'], unique=False)
+    op.create_index('ix_audit_logs_action_created', 'audit_logs', ['action', 'created_at', 'id'], unique=False)
+    op.create_index('ix_audit_logs_field_created', 'audit_logs', ['field_name', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_audit_logs_field_created', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_action_created', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_created', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_contract_created', table_name='audit_logs')
@@ -0,0 +1,50 @@
+"""processing jobs queue
+
+Revision ID: 4b7d2e91a0c3
+Revises: c6e1834ad073
+Create Date: 2026-10-16 09:12:31.504117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7d2e91a0c3'
+down_revision: Union[str, Sequence[str], None] = 'c6e1834ad073'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('processing_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('contract_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='jobstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.Column('locked_by', sa.String(length=255), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_processing_jobs_claim', 'processing_jobs', ['status', 'run_after'], unique=False)
+    op.create_index('ix_processing_jobs_lease', 'processing_jobs', ['status', 'lease_expires_at'], unique=False)
+    op.create_index('ix_processing_jobs_contract_id', 'processing_jobs', ['contract_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_processing_jobs_contract_id', table_name='processing_jobs')
+    op.drop_index('ix_processing_jobs_lease', table_name='processing_jobs')
+    op.drop_index('ix_processing_jobs_claim', table_name='processing_jobs')
+    op.drop_table('processing_jobs')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,35 @@
+"""contract counts and list index
+
+Revision ID: 6a1f0c3b8d54
+Revises: 2d8b6f4c1e97
+Create Date: 2026-10-16 16:40:52.107734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1f0c3b8d54'
+down_revision: Union[str, Sequence[str], None] = '2d8b6f4c1e97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('contract_counts',
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('status')
+    )
+    op.create_index('ix_contracts_created_id', 'contracts', ['created_at', 'id'], unique=False)
+    # Counters are seeded from the contracts table on API startup (reconcile_contract_counts)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contracts_created_id', table_name='contracts')
+    op.drop_table('contract_counts')
@@ -0,0 +1,46 @@
+"""extraction cache
+
+Revision ID: 9f3c1a7e5d20
+Revises: 4b7d2e91a0c3
+Create Date: 2026-10-16 10:02:17.861250
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f3c1a7e5d20'
+down_revision: Union[str, Sequence[str], None] = '4b7d2e91a0c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('extraction_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('prompt_version', sa.String(length=32), nullable=False),
+    sa.Column('model', sa.String(length=200), nullable=False),
+    sa.Column('billing_config', sa.JSON(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_accessed_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index('ix_extraction_cache_expires_at', 'extraction_cache', ['expires_at'], unique=False)
+    op.create_index('ix_extraction_cache_last_accessed_at', 'extraction_cache', ['last_accessed_at'], unique=False)
+    op.add_column('contracts', sa.Column('file_sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_contracts_file_sha256'), 'contracts', ['file_sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_contracts_file_sha256'), table_name='contracts')
+    op.drop_column('contracts', 'file_sha256')
+    op.drop_index('ix_extraction_cache_last_accessed_at', table_name='extraction_cache')
+    op.drop_index('ix_extraction_cache_expires_at', table_name='extraction_cache')
+    op.drop_table('extraction_cache')
@@ -0,0 +1,28 @@
+"""contract version
+
+Revision ID: a8c4e1f95b37
+Revises: f3b7a0d52c86
+Create Date: 2026-10-17 10:12:48.305517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c4e1f95b37'
+down_revision: Union[str, Sequence[str], None] = 'f3b7a0d52c86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contracts', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('contracts', 'version')
@@ -0,0 +1,38 @@
+"""contract stats hourly
+
+Revision ID: b3e9d27f6a18
+Revises: 6a1f0c3b8d54
+Create Date: 2026-10-16 18:12:30.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e9d27f6a18'
+down_revision: Union[str, Sequence[str], None] = '6a1f0c3b8d54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('contract_stats_hourly',
+    sa.Column('hour', sa.DateTime(), nullable=False),
+    sa.Column('uploaded', sa.BigInteger(), nullable=False),
+    sa.Column('completed', sa.BigInteger(), nullable=False),
+    sa.Column('failed', sa.BigInteger(), nullable=False),
+    sa.Column('processing_seconds', sa.Float(), nullable=False),
+    sa.Column('processing_samples', sa.BigInteger(), nullable=False),
+    sa.Column('fields_total', sa.BigInteger(), nullable=False),
+    sa.Column('fields_low_confidence', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('hour')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('contract_stats_hourly')
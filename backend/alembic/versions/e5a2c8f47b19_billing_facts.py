@@ -0,0 +1,68 @@
+"""billing facts
+
+Revision ID: e5a2c8f47b19
+Revises: b3e9d27f6a18
+Create Date: 2026-10-16 19:04:06.218455
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2c8f47b19'
+down_revision: Union[str, Sequence[str], None] = 'b3e9d27f6a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('billing_facts',
+    sa.Column('contract_id', sa.UUID(), nullable=False),
+    sa.Column('vendor', sa.String(length=255), nullable=True),
+    sa.Column('client', sa.String(length=255), nullable=True),
+    sa.Column('contract_value', sa.Numeric(precision=18, scale=2), nullable=True),
+    sa.Column('currency', sa.String(length=3), nullable=True),
+    sa.Column('billing_frequency', sa.String(length=20), nullable=True),
+    sa.Column('due_days', sa.Integer(), nullable=True),
+    sa.Column('auto_renews', sa.Boolean(), nullable=True),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('contract_id')
+    )
+    op.create_index('ix_billing_facts_frequency_value', 'billing_facts', ['billing_frequency', 'contract_value'], unique=False)
+    op.create_index('ix_billing_facts_value', 'billing_facts', ['contract_value'], unique=False)
+    op.create_index('ix_billing_facts_end_date', 'billing_facts', ['end_date'], unique=False)
+    op.create_index('ix_billing_facts_start_date', 'billing_facts', ['start_date'], unique=False)
+    op.create_index('ix_billing_facts_due_days', 'billing_facts', ['due_days'], unique=False)
+    op.create_table('billing_fact_usage_tiers',
+    sa.Column('contract_id', sa.UUID(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('tier_name', sa.String(length=255), nullable=True),
+    sa.Column('unit_type', sa.String(length=100), nullable=True),
+    sa.Column('min_units', sa.Numeric(precision=18, scale=2), nullable=True),
+    sa.Column('max_units', sa.Numeric(precision=18, scale=2), nullable=True),
+    sa.Column('price_per_unit', sa.Numeric(precision=18, scale=6), nullable=True),
+    sa.Column('flat_fee', sa.Numeric(precision=18, scale=2), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['billing_facts.contract_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('contract_id', 'position')
+    )
+    op.create_index('ix_billing_fact_usage_tiers_unit_type', 'billing_fact_usage_tiers', ['unit_type'], unique=False)
+    # Existing contracts are backfilled on API startup (backfill_billing_facts)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_billing_fact_usage_tiers_unit_type', table_name='billing_fact_usage_tiers')
+    op.drop_table('billing_fact_usage_tiers')
+    op.drop_index('ix_billing_facts_due_days', table_name='billing_facts')
+    op.drop_index('ix_billing_facts_start_date', table_name='billing_facts')
+    op.drop_index('ix_billing_facts_end_date', table_name='billing_facts')
+    op.drop_index('ix_billing_facts_value', table_name='billing_facts')
+    op.drop_index('ix_billing_facts_frequency_value', table_name='billing_facts')
+    op.drop_table('billing_facts')
@@ -0,0 +1,42 @@
+"""contract search pages
+
+Revision ID: f3b7a0d52c86
+Revises: e5a2c8f47b19
+Create Date: 2026-10-17 08:41:19.730164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b7a0d52c86'
+down_revision: Union[str, Sequence[str], None] = 'e5a2c8f47b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('contract_search_pages',
+    sa.Column('contract_id', sa.UUID(), nullable=False),
+    sa.Column('page', sa.Integer(), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    # Must match services.search_service.SEARCH_LANGUAGE, which queries use
+    sa.Column('search_vector', postgresql.TSVECTOR(),
+              sa.Computed("to_tsvector('english', body)", persisted=True), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('contract_id', 'page')
+    )
+    op.create_index('ix_contract_search_pages_vector', 'contract_search_pages', ['search_vector'],
+                    unique=False, postgresql_using='gin')
+    # Existing contracts are indexed on API startup (backfill_search_index)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contract_search_pages_vector', table_name='contract_search_pages', postgresql_using='gin')
+    op.drop_table('contract_search_pages')
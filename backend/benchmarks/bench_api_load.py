@@ -0,0 +1,191 @@
+# Load test for the API's database path
+#
+#   cd backend && python -m benchmarks.bench_api_load --seed 500 --duration 20 --concurrency 64
+#   cd backend && python -m benchmarks.bench_api_load --url http://localhost:8000 --label before --output load.jsonl
+#
+# Without --url the API is started with uvicorn against DATABASE_URL. Completed
+# contracts with audit history are seeded, then --concurrency clients request a
+# mix of list, detail, audit feed and stats endpoints for --duration seconds.
+# Reports requests/sec and latency percentiles per endpoint. To compare two
+# builds (e.g. before and after a change), run each with --url, a --label and
+# the same --output file; every run in the file is printed side by side.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+from benchmarks.stub_llm_server import CANNED_BILLING_CONFIG
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# (name, weight, path template); {id} is a random seeded contract
+ENDPOINTS = [
+    ("list", 3, "/api/contracts?limit=20"),
+    ("detail", 4, "/api/contracts/{id}?fields=status,billing_config,audit_log"),
+    ("audit_feed", 2, "/api/audit?limit=50"),
+    ("stats", 1, "/api/stats"),
+]
+
+
+def seed_contracts(count: int, audit_per_contract: int = 3) -> list[str]:
+    from datetime import datetime, timedelta
+
+    from database import SessionLocal
+    from models import AuditLog, Contract, ContractStatus
+
+    db = SessionLocal()
+    try:
+        ids = [str(row.id) for row in db.query(Contract.id).limit(1000)]
+        started = datetime.utcnow()
+        for i in range(max(0, count - len(ids))):
+            contract_id = uuid.uuid4()
+            created = started - timedelta(seconds=i)
+            db.add(Contract(
+                id=contract_id, filename=f"{contract_id}.txt", original_filename=f"load-test-{i}.txt",
+                file_path="", status=ContractStatus.COMPLETED, billing_config=CANNED_BILLING_CONFIG,
+                raw_text="Load test contract. " * 500, created_at=created, updated_at=created,
+            ))
+            db.add_all(
+                AuditLog(contract_id=contract_id, field_name="billing_config", action="extracted",
+                         new_value={"extracted": True}, created_at=created + timedelta(milliseconds=n))
+                for n in range(audit_per_contract)
+            )
+            ids.append(str(contract_id))
+            if i % 100 == 99:
+                db.commit()
+        db.commit()
+        return ids
+    finally:
+        db.close()
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+
+
+async def wait_until_up(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{url}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"API at {url} did not come up within {timeout}s")
+
+
+async def run_load(url: str, ids: list[str], concurrency: int, duration: float) -> dict[str, list]:
+    names = [name for name, _, _ in ENDPOINTS]
+    weights = [weight for _, weight, _ in ENDPOINTS]
+    paths = {name: path for name, _, path in ENDPOINTS}
+    samples: dict[str, list] = {name: [] for name in names}
+    deadline = time.monotonic() + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60.0) as client:
+        async def one_client():
+            while time.monotonic() < deadline:
+                name = random.choices(names, weights)[0]
+                path = paths[name].format(id=random.choice(ids))
+                started = time.perf_counter()
+                try:
+                    ok = (await client.get(path)).status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                samples[name].append((time.perf_counter() - started, ok))
+
+        await asyncio.gather(*(one_client() for _ in range(concurrency)))
+    return samples
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(pct / 100 * len(sorted_values)))]
+
+
+def summarize(samples: list, duration: float) -> dict:
+    latencies = sorted(latency for latency, _ in samples)
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, ok in samples if not ok),
+        "rps": round(len(samples) / duration, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def print_runs(runs: list[dict]):
+    print(f"{'run':<16} {'endpoint':<12} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for run in runs:
+        for endpoint, stats in run["endpoints"].items():
+            print(f"{run['label']:<16} {endpoint:<12} {stats['rps']:>8} {stats['p50_ms']:>8} "
+                  f"{stats['p95_ms']:>8} {stats['p99_ms']:>8} {stats['errors']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API read endpoints")
+    parser.add_argument("--url", help="benchmark a running API instead of starting one")
+    parser.add_argument("--port", type=int, default=8950)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when starting the API")
+    parser.add_argument("--seed", type=int, default=500, help="contracts to make sure exist before the run")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output", type=Path, help="append the result as a JSON line and print every run in it")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server = start_server(args.port, args.workers)
+        url = f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(wait_until_up(url))
+        ids = seed_contracts(args.seed)
+        if not ids:
+            raise SystemExit("No contracts to request; run with --seed > 0")
+
+        samples = asyncio.run(run_load(url, ids, args.concurrency, args.duration))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    run = {
+        "label": args.label,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "endpoints": {
+            "all": summarize([s for endpoint in samples.values() for s in endpoint], args.duration),
+            **{name: summarize(endpoint, args.duration) for name, endpoint in samples.items()},
+        },
+    }
+    runs = [run]
+    if args.output:
+        if args.output.exists():
+            runs = [json.loads(line) for line in args.output.read_text().splitlines() if line.strip()] + runs
+        with args.output.open("a") as f:
+            f.write(json.dumps(run) + "\n")
+    print_runs(runs)
+
+
+if __name__ == "__main__":
+    os.chdir(BACKEND_DIR)
+    main()
@@ -0,0 +1,91 @@
+# Benchmark: legacy pdfplumber extraction vs adaptive PyMuPDF + targeted tables
+#
+#   cd backend && python -m benchmarks.bench_extraction_modes --corpus /path/to/pdfs
+#   cd backend && python -m benchmarks.bench_extraction_modes --synthetic 20 --pages 30
+#
+# For every PDF both modes are timed, and the adaptive output is scored against
+# the legacy output: word recall/precision over the whole text, and the share of
+# legacy table rows that also appear in the adaptive output.
+
+import argparse
+import re
+import statistics
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from benchmarks.corpus import make_corpus
+from services.pdf_service import extract_text_from_file
+
+WORD_RE = re.compile(r"[A-Za-z0-9$%.,/-]+")
+TABLE_RE = re.compile(r"\[Table on Page \d+\n(.*?)\]", re.S)
+
+
+def _timed(path: Path, mode: str) -> tuple[float, str]:
+    started = time.perf_counter()
+    text = extract_text_from_file(str(path), mode=mode)
+    return time.perf_counter() - started, text
+
+
+def _word_scores(reference: str, candidate: str) -> tuple[float, float]:
+    ref = Counter(WORD_RE.findall(reference))
+    cand = Counter(WORD_RE.findall(candidate))
+    overlap = sum((ref & cand).values())
+    recall = overlap / max(1, sum(ref.values()))
+    precision = overlap / max(1, sum(cand.values()))
+    return recall, precision
+
+
+def _table_row_recall(reference: str, candidate: str) -> float:
+    ref_rows = {row for table in TABLE_RE.findall(reference) for row in table.splitlines() if row.strip()}
+    if not ref_rows:
+        return 1.0
+    cand_rows = {row for table in TABLE_RE.findall(candidate) for row in table.splitlines() if row.strip()}
+    return len(ref_rows & cand_rows) / len(ref_rows)
+
+
+def run(paths: list[Path]):
+    rows = []
+    print(f"{'document':<28} {'legacy_s':>9} {'adaptive_s':>11} {'speedup':>8} {'recall':>7} {'precision':>10} {'table_rows':>11}")
+    for path in paths:
+        legacy_s, legacy_text = _timed(path, "pdfplumber")
+        adaptive_s, adaptive_text = _timed(path, "adaptive")
+        recall, precision = _word_scores(legacy_text, adaptive_text)
+        tables = _table_row_recall(legacy_text, adaptive_text)
+        rows.append((legacy_s, adaptive_s, recall, precision, tables))
+        print(f"{path.name[:28]:<28} {legacy_s:>9.3f} {adaptive_s:>11.3f} {legacy_s / adaptive_s:>7.1f}x "
+              f"{recall:>7.3f} {precision:>10.3f} {tables:>11.3f}")
+
+    if not rows:
+        print("No PDFs found")
+        return
+
+    legacy_total = sum(r[0] for r in rows)
+    adaptive_total = sum(r[1] for r in rows)
+    print()
+    print(f"documents:          {len(rows)}")
+    print(f"wall time legacy:   {legacy_total:.2f}s")
+    print(f"wall time adaptive: {adaptive_total:.2f}s ({legacy_total / adaptive_total:.1f}x faster)")
+    print(f"median word recall: {statistics.median(r[2] for r in rows):.3f}")
+    print(f"median precision:   {statistics.median(r[3] for r in rows):.3f}")
+    print(f"min table recall:   {min(r[4] for r in rows):.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legacy vs adaptive PDF extraction")
+    parser.add_argument("--corpus", type=Path, help="directory of PDFs to benchmark")
+    parser.add_argument("--synthetic", type=int, default=10, help="synthetic PDFs to generate without --corpus")
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--table-density", type=float, default=0.15)
+    args = parser.parse_args()
+
+    if args.corpus:
+        run(sorted(args.corpus.glob("**/*.pdf")))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        run(make_corpus(Path(tmp), args.synthetic, args.pages, args.table_density))
+
+
+if __name__ == "__main__":
+    main()
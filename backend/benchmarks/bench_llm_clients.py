@@ -0,0 +1,101 @@
+# Load test for the shared LLM clients against the local stub API
+#
+#   cd backend && python -m benchmarks.bench_llm_clients --calls 200 --concurrency 50 --error-rate 0.1
+#
+# Fires concurrent extract_billing_config calls at benchmarks.stub_llm_server and
+# reports throughput, latency percentiles, how many provider errors were retried
+# and the peak number of requests the stub saw in flight, which should never
+# exceed OPENAI_MAX_CONCURRENCY. It also reports how many input tokens the
+# stub's simulated prompt cache served; the extraction prompt is under the
+# providers' 1024-token minimum, so pass e.g. --prompt-cache-min-tokens 512 to see hits.
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from pathlib import Path
+
+from benchmarks.stub_llm_server import StubSettings, run_in_thread
+
+SAMPLE_CONTRACT = Path(__file__).resolve().parents[2] / "sample_contract.txt"
+
+
+async def run_calls(calls: int, concurrency: int) -> tuple[list[float], int]:
+    from services.llm_clients import aclose_llm_clients
+    from services.llm_service import extract_billing_config
+
+    text = SAMPLE_CONTRACT.read_text()
+    callers = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def one_call():
+        nonlocal failures
+        async with callers:
+            started = time.perf_counter()
+            try:
+                await extract_billing_config(text)
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                failures += 1
+
+    await asyncio.gather(*(one_call() for _ in range(calls)))
+    await aclose_llm_clients()
+    return latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pooled, rate-limited LLM clients")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent callers")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--retry-after", type=float, default=0.2)
+    parser.add_argument("--rpm", type=int, default=10_000, help="OPENAI_RPM for the run")
+    parser.add_argument("--tpm", type=int, default=10_000_000, help="OPENAI_TPM for the run")
+    parser.add_argument("--prompt-cache-min-tokens", type=int, default=1024)
+    args = parser.parse_args()
+
+    server, app = run_in_thread(StubSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        retry_after_seconds=args.retry_after,
+        prompt_cache_min_tokens=args.prompt_cache_min_tokens,
+    ), port=args.port)
+
+    # Provider settings are read at import time, so set them before importing services
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{args.port}/v1"
+    os.environ["ANTHROPIC_BASE_URL"] = f"http://127.0.0.1:{args.port}"
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("ANTHROPIC_API_KEY", "stub")
+    os.environ.setdefault("LLM_BACKOFF_BASE_SECONDS", "0.1")
+    os.environ["OPENAI_RPM"] = str(args.rpm)
+    os.environ["OPENAI_TPM"] = str(args.tpm)
+
+    started = time.perf_counter()
+    latencies, failures = asyncio.run(run_calls(args.calls, args.concurrency))
+    elapsed = time.perf_counter() - started
+    stats = app.state.stats
+    server.should_exit = True
+
+    from services.llm_clients import PROVIDER_LIMITS
+
+    latencies.sort()
+    print(f"calls:               {args.calls} ({failures} failed)")
+    print(f"wall time:           {elapsed:.2f}s  ({args.calls / elapsed:.1f} calls/s)")
+    if latencies:
+        print(f"latency p50/p95/max: {statistics.median(latencies):.3f}s / "
+              f"{latencies[int(0.95 * (len(latencies) - 1))]:.3f}s / {latencies[-1]:.3f}s")
+    print(f"provider requests:   {stats.requests} ({stats.errors} injected errors retried or failed over)")
+    print(f"requests by API:     {stats.by_path}")
+    print(f"peak in flight:      {stats.max_in_flight} "
+          f"(OPENAI_MAX_CONCURRENCY={PROVIDER_LIMITS['openai'].max_concurrency})")
+    print(f"input tokens:        {stats.input_tokens} ({stats.cached_input_tokens} from the prompt cache, "
+          f"{stats.cache_write_tokens} written to it)")
+
+
+if __name__ == "__main__":
+    main()
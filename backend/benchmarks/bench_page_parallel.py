@@ -0,0 +1,65 @@
+# Benchmark: sequential vs page-parallel PDF extraction
+#
+#   cd backend && python -m benchmarks.bench_page_parallel --pages 10 50 100 200 --workers 4
+#
+# Generates synthetic PDFs of each size, extracts them with the sequential
+# extract_text_from_file and with ExtractionExecutor's page-range fan-out,
+# checks the outputs are identical and reports the speedup per page count.
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import make_pdf
+from services.extraction_executor import ExtractionExecutor
+from services.pdf_service import extract_text_from_file
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def run(page_counts: list[int], workers: int, table_density: float, repeat: int):
+    executor = ExtractionExecutor(max_workers=workers, timeout=600)
+    # Warm the pool so process start-up is not billed to the first document
+    await executor.run(sum, [1])
+
+    print(f"{'pages':>6} {'sequential_s':>13} {'parallel_s':>11} {'speedup':>8} {'identical':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in page_counts:
+            path = make_pdf(Path(tmp) / f"bench_{pages}.pdf", pages, table_density, seed=pages)
+            sequential_text = extract_text_from_file(str(path))
+            sequential = _best_of(repeat, lambda: extract_text_from_file(str(path)))
+
+            parallel_text = await executor.extract_text(str(path))
+            parallel = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await executor.extract_text(str(path))
+                parallel = min(parallel, time.perf_counter() - started)
+
+            identical = sequential_text == parallel_text
+            print(f"{pages:>6} {sequential:>13.2f} {parallel:>11.2f} {sequential / parallel:>7.2f}x {str(identical):>10}")
+
+    executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs page-parallel PDF extraction")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--table-density", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args.pages, args.workers, args.table_density, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
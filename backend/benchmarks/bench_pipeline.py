@@ -0,0 +1,293 @@
+# Offline end-to-end pipeline benchmark
+#
+#   cd backend && python -m benchmarks.bench_pipeline --docs 40 --pages 20 --table-density 0.2 --text-ratio 0.25
+#   cd backend && python -m benchmarks.bench_pipeline --latency-ms 2000 --error-rate 0.05 --label slow-llm
+#
+# Generates a synthetic corpus (benchmarks/corpus.py), uploads every contract
+# through the API and processes the queue with an in-process worker, with the
+# LLM providers replaced by benchmarks.stub_llm_server at the given latency
+# and error rate. The database is DATABASE_URL, as for the API; the contracts
+# the run creates are deleted again unless --keep is given.
+#
+# Reports latency percentiles per stage (upload, queue wait, text extraction,
+# LLM, database writes and end to end), documents/sec and peak RSS of this
+# process and of the extraction pool's processes. Each run is appended to
+# --output (benchmarks/results/pipeline.jsonl) and compared with the previous
+# run there with the same settings; --fail-on-regression exits non-zero when
+# throughput or a stage's p95 got more than --tolerance worse.
+
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+from benchmarks.corpus import make_corpus
+from benchmarks.stub_llm_server import StubSettings, run_in_thread
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "pipeline.jsonl"
+
+STAGES = ["upload", "queue_wait", "text_extraction", "llm", "db_write", "end_to_end"]
+# Settings that must match for two runs to be compared
+CONFIG_KEYS = ["docs", "pages", "table_density", "text_ratio", "latency_ms", "jitter_ms",
+               "error_rate", "worker_concurrency"]
+
+# Stage timings of the job the current task is processing
+_job_timings: contextvars.ContextVar[dict] = contextvars.ContextVar("job_timings")
+
+
+def _configure_environment(args):
+    # Read at import time by the services, so set before importing them
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{args.stub_port}/v1"
+    os.environ["ANTHROPIC_BASE_URL"] = f"http://127.0.0.1:{args.stub_port}"
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("ANTHROPIC_API_KEY", "stub")
+    os.environ.setdefault("LLM_BACKOFF_BASE_SECONDS", "0.1")
+    os.environ["WORKER_STATUS_PORT"] = "0"
+    os.environ.setdefault("WORKER_POLL_INTERVAL", "0.1")
+    # Every run extracts the same corpus, so a warm cache would skip the LLM stage
+    if not args.cache:
+        os.environ["EXTRACTION_CACHE_ENABLED"] = "false"
+
+
+# Wrap an async pipeline step so its duration is added to the current job's timings
+def _timed(stage: str, fn):
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            timings = _job_timings.get(None)
+            if timings is not None:
+                timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+    return wrapper
+
+
+def _instrument(jobs: dict):
+    import worker
+    from services import pipeline
+
+    pipeline.extract_billing_config = _timed("llm", pipeline.extract_billing_config)
+    pipeline.extraction_executor.extract_text = _timed("text_extraction", pipeline.extraction_executor.extract_text)
+
+    process_contract = worker.process_contract
+
+    async def timed_process_contract(contract_id, db):
+        timings = {"started": time.perf_counter()}
+        _job_timings.set(timings)
+        try:
+            await process_contract(contract_id, db)
+        finally:
+            timings["finished"] = time.perf_counter()
+            jobs[str(contract_id)] = timings
+
+    worker.process_contract = timed_process_contract
+
+
+async def _upload_all(client: httpx.AsyncClient, paths: list[Path], concurrency: int) -> dict:
+    uploads = {}
+    slots = asyncio.Semaphore(concurrency)
+
+    async def upload(path: Path):
+        async with slots:
+            media_type = "application/pdf" if path.suffix == ".pdf" else "text/plain"
+            started = time.perf_counter()
+            response = await client.post("/api/contracts/upload",
+                                         files={"file": (path.name, path.read_bytes(), media_type)})
+            response.raise_for_status()
+            uploads[response.json()["contract_id"]] = {"started": started, "uploaded": time.perf_counter()}
+
+    await asyncio.gather(*(upload(path) for path in paths))
+    return uploads
+
+
+async def run_pipeline(paths: list[Path], args) -> dict:
+    from database import AsyncSessionLocal
+    from main import app
+    from models import Contract, ContractStatus
+    from sqlalchemy import func, select
+    import worker as worker_module
+
+    # Per-job INFO logs would dominate the output
+    logging.getLogger().setLevel(logging.WARNING)
+
+    jobs: dict = {}
+    _instrument(jobs)
+    worker = worker_module.Worker(args.worker_concurrency)
+
+    # ASGITransport does not run the lifespan, which creates the tables and starts the event listener
+    async with app.router.lifespan_context(app):
+        worker_task = asyncio.create_task(worker.run())
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120.0) as client:
+            started = time.perf_counter()
+            uploads = await _upload_all(client, paths, args.upload_concurrency)
+            while len([cid for cid in uploads if cid in jobs]) < len(uploads):
+                if worker_task.done():
+                    raise RuntimeError("Worker stopped before the queue was drained") from worker_task.exception()
+                await asyncio.sleep(0.05)
+            elapsed = time.perf_counter() - started
+
+            worker.stop()
+            await worker_task
+
+            async with AsyncSessionLocal() as db:
+                failed = await db.scalar(select(func.count()).select_from(Contract).where(
+                    Contract.id.in_(list(uploads)), Contract.status == ContractStatus.FAILED,
+                ))
+
+            if not args.keep:
+                for contract_id in uploads:
+                    await client.delete(f"/api/contracts/{contract_id}")
+
+    samples = {stage: [] for stage in STAGES}
+    for contract_id, upload in uploads.items():
+        job = jobs[contract_id]
+        text = job.get("text_extraction", 0.0)
+        llm = job.get("llm", 0.0)
+        samples["upload"].append(upload["uploaded"] - upload["started"])
+        samples["queue_wait"].append(job["started"] - upload["uploaded"])
+        samples["text_extraction"].append(text)
+        samples["llm"].append(llm)
+        samples["db_write"].append(job["finished"] - job["started"] - text - llm)
+        samples["end_to_end"].append(job["finished"] - upload["started"])
+
+    return {"elapsed": elapsed, "failed": failed, "samples": samples}
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(pct / 100 * len(sorted_values)))]
+
+
+def summarize(values: list[float]) -> dict:
+    values = sorted(values)
+    return {
+        "mean_ms": round(1000 * sum(values) / len(values), 1) if values else 0.0,
+        "p50_ms": round(1000 * _percentile(values, 50), 1),
+        "p95_ms": round(1000 * _percentile(values, 95), 1),
+        "p99_ms": round(1000 * _percentile(values, 99), 1),
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def compare(run: dict, previous: dict, tolerance: float) -> list[str]:
+    print(f"\ncompared with {previous['label']} ({previous['timestamp']}, {previous.get('revision') or '?'})")
+    print(f"{'metric':<24} {'previous':>10} {'current':>10} {'change':>8}")
+    regressions = []
+
+    def row(name: str, old: float, new: float, higher_is_better: bool = False):
+        change = (new - old) / old if old else 0.0
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<24} {old:>10} {new:>10} {change:>+8.1%}{flag}")
+
+    row("docs_per_sec", previous["docs_per_sec"], run["docs_per_sec"], higher_is_better=True)
+    for stage in STAGES:
+        row(f"{stage} p95_ms", previous["stages"][stage]["p95_ms"], run["stages"][stage]["p95_ms"])
+    row("peak_rss_mb", previous["peak_rss_mb"], run["peak_rss_mb"])
+    return regressions
+
+
+def print_run(run: dict):
+    config = run["config"]
+    print(f"{config['docs']} docs x {config['pages']} pages, table density {config['table_density']}, "
+          f"text ratio {config['text_ratio']}; stub LLM {config['latency_ms']}±{config['jitter_ms']} ms, "
+          f"error rate {config['error_rate']}; worker concurrency {config['worker_concurrency']}\n")
+    print(f"{'stage':<16} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage, stats in run["stages"].items():
+        print(f"{stage:<16} {stats['mean_ms']:>9} {stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}")
+    print(f"\ndocs/sec:        {run['docs_per_sec']} ({run['failed']} failed, {run['elapsed_s']}s)")
+    print(f"peak RSS:        {run['peak_rss_mb']} MB (extraction processes: {run['peak_child_rss_mb']} MB)")
+    print(f"LLM requests:    {run['llm_requests']} ({run['llm_injected_errors']} injected errors)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark upload → text extraction → LLM → DB write offline")
+    parser.add_argument("--docs", type=int, default=40)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--table-density", type=float, default=0.1, help="share of PDF pages with a pricing table")
+    parser.add_argument("--text-ratio", type=float, default=0.25, help="share of contracts that are .txt files")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="stub LLM latency")
+    parser.add_argument("--jitter-ms", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of stub LLM requests that fail")
+    parser.add_argument("--stub-port", type=int, default=8902)
+    parser.add_argument("--worker-concurrency", type=int, default=4)
+    parser.add_argument("--upload-concurrency", type=int, default=8)
+    parser.add_argument("--cache", action="store_true", help="leave the extraction cache enabled")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark's contracts afterwards")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown before a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    _configure_environment(args)
+    server, stub = run_in_thread(StubSettings(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        retry_after_seconds=0.2,
+    ), port=args.stub_port)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = make_corpus(Path(tmp), args.docs, args.pages, args.table_density, args.text_ratio, args.seed)
+            result = asyncio.run(run_pipeline(paths, args))
+    finally:
+        server.should_exit = True
+
+    run = {
+        "label": args.label,
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "config": {key: getattr(args, key) for key in CONFIG_KEYS},
+        "elapsed_s": round(result["elapsed"], 2),
+        "docs_per_sec": round(args.docs / result["elapsed"], 2),
+        "failed": result["failed"],
+        "stages": {stage: summarize(values) for stage, values in result["samples"].items()},
+        # ru_maxrss is in KB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_child_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        "llm_requests": stub.state.stats.requests,
+        "llm_injected_errors": stub.state.stats.errors,
+    }
+    print_run(run)
+
+    previous = None
+    if args.output.exists():
+        runs = [json.loads(line) for line in args.output.read_text().splitlines() if line.strip()]
+        previous = next((r for r in reversed(runs) if r["config"] == run["config"]), None)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("a") as f:
+        f.write(json.dumps(run) + "\n")
+
+    regressions = compare(run, previous, args.tolerance) if previous else []
+    if regressions and args.fail_on_regression:
+        sys.exit(f"Regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    os.chdir(BACKEND_DIR)
+    main()
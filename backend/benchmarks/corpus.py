@@ -0,0 +1,127 @@
+# Synthetic contract corpus for offline benchmarks
+# Generates MSA-style PDFs and text files with billing clauses, boilerplate
+# filler and optional ruled pricing tables, deterministically from a seed.
+
+import random
+import re
+from pathlib import Path
+from typing import Optional
+
+import fitz
+
+BOILERPLATE = [
+    "Each party shall indemnify, defend and hold harmless the other party from any third-party claims arising out of its gross negligence or wilful misconduct.",
+    "All intellectual property rights in the Services remain with Vendor. Customer retains all rights in Customer Data.",
+    "Neither party shall be liable for any indirect, incidental, special or consequential damages, including lost profits.",
+    "This Agreement shall be governed by and construed in accordance with the laws of the State of Delaware.",
+    "Each party shall protect the other party's Confidential Information using at least the same degree of care it uses for its own.",
+    "Neither party may assign this Agreement without the prior written consent of the other party, except in connection with a merger.",
+    "Any notice under this Agreement shall be in writing and delivered by courier or certified mail to the addresses set out above.",
+    "Vendor shall maintain commercially reasonable administrative, physical and technical safeguards for Customer Data.",
+]
+
+BILLING_CLAUSES = [
+    "Customer shall pay Vendor a total annual fee of ${value:,.2f} USD for the Services.",
+    "Fees shall be invoiced {frequency} in advance.",
+    "All invoices are due and payable within {due_days} days of the invoice date (Net {due_days}).",
+    "Late payments bear interest at {late_fee}% per month until paid in full.",
+    "The initial term commences on {start} and continues through {end}.",
+    "This Agreement automatically renews for successive one-year periods unless either party gives {notice} days written notice.",
+]
+
+# Matches any rendered BILLING_CLAUSES sentence, used as ground truth by the evaluations
+BILLING_CLAUSE_RE = re.compile("|".join(
+    re.sub(r"\\\{\w+(?::[^}]*)?\\\}", ".+?", re.escape(clause)) for clause in BILLING_CLAUSES
+))
+
+TIERS = [
+    ("Starter", "1-10 seats", "$500/seat/month"),
+    ("Growth", "11-50 seats", "$450/seat/month"),
+    ("Scale", "51-200 seats", "$400/seat/month"),
+    ("Enterprise", "200+ seats", "Custom pricing"),
+]
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN = 54
+
+
+def contract_terms(rng: random.Random) -> dict:
+    start_year = rng.randint(2022, 2026)
+    return {
+        "value": rng.choice([24000, 60000, 120000, 250000, 480000]),
+        "frequency": rng.choice(["monthly", "quarterly", "annually"]),
+        "due_days": rng.choice([15, 30, 45, 60, 90]),
+        "late_fee": rng.choice([1, 1.5, 2]),
+        "start": f"{start_year}-0{rng.randint(1, 9)}-01",
+        "end": f"{start_year + 1}-0{rng.randint(1, 9)}-28",
+        "notice": rng.choice([30, 60, 90]),
+    }
+
+
+def page_paragraphs(rng: random.Random, page_index: int, terms: dict, paragraphs: int = 6) -> list[str]:
+    lines = [f"{page_index + 1}. SECTION {page_index + 1}"]
+    for i in range(paragraphs):
+        if i == 2 and page_index % 3 == 1:
+            lines.append(rng.choice(BILLING_CLAUSES).format(**terms))
+        else:
+            lines.append(rng.choice(BOILERPLATE))
+    return lines
+
+
+def _draw_table(page, top: float) -> float:
+    col_width = (PAGE_WIDTH - 2 * MARGIN) / 3
+    row_height = 18
+    rows = [("Tier", "Units", "Price")] + TIERS[:3]
+    for r, row in enumerate(rows):
+        y = top + r * row_height
+        for c, cell in enumerate(row):
+            page.insert_text((MARGIN + c * col_width + 4, y + 13), cell, fontsize=9)
+    bottom = top + len(rows) * row_height
+    for r in range(len(rows) + 1):
+        y = top + r * row_height
+        page.draw_line((MARGIN, y), (PAGE_WIDTH - MARGIN, y))
+    for c in range(4):
+        x = MARGIN + c * col_width
+        page.draw_line((x, top), (x, bottom))
+    return bottom
+
+
+# Write a PDF contract with the given number of pages; table_density is the
+# fraction of pages that carry a ruled pricing table
+def make_pdf(path: Path, pages: int, table_density: float = 0.1, seed: int = 0,
+             paragraphs_per_page: int = 6) -> Path:
+    rng = random.Random(seed)
+    terms = contract_terms(rng)
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        text = "\n\n".join(page_paragraphs(rng, i, terms, paragraphs_per_page))
+        rect = fitz.Rect(MARGIN, MARGIN, PAGE_WIDTH - MARGIN, PAGE_HEIGHT - 260)
+        page.insert_textbox(rect, text, fontsize=10)
+        if rng.random() < table_density:
+            _draw_table(page, PAGE_HEIGHT - 220)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+# Write a plain-text contract of roughly `pages` pages
+def make_text(path: Path, pages: int, seed: int = 0, paragraphs_per_page: int = 6) -> Path:
+    rng = random.Random(seed)
+    terms = contract_terms(rng)
+    sections = ["\n\n".join(page_paragraphs(rng, i, terms, paragraphs_per_page)) for i in range(pages)]
+    path.write_text("MASTER SERVICES AGREEMENT\n\n" + "\n\n".join(sections))
+    return path
+
+
+def make_corpus(directory: Path, count: int, pages: int, table_density: float = 0.1,
+                text_ratio: float = 0.0, seed: Optional[int] = 0) -> list[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        if rng.random() < text_ratio:
+            paths.append(make_text(directory / f"contract_{i:04d}.txt", pages, seed=rng.randint(0, 10**9)))
+        else:
+            paths.append(make_pdf(directory / f"contract_{i:04d}.pdf", pages, table_density, seed=rng.randint(0, 10**9)))
+    return paths
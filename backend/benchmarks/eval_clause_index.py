@@ -0,0 +1,97 @@
+# Offline evaluation of the billing-clause relevance index
+#
+#   cd backend && python -m benchmarks.eval_clause_index --budgets 250 500 1000 2000
+#   cd backend && python -m benchmarks.eval_clause_index --labels labels.jsonl
+#
+# For each token budget, reports how much of the prompt text the index removes
+# and how many gold billing quotes survive selection (recall). Gold quotes come
+# from sample_contract.txt, the synthetic corpus, and optionally a JSONL file of
+# {"text_path": ..., "quotes": [...]} or {"text_path": ..., "billing_config": {...}}
+# lines, where every source_text in billing_config is treated as a gold quote.
+
+import argparse
+import json
+import re
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import BILLING_CLAUSE_RE, make_text
+from services.clause_index import select_relevant_clauses
+
+SAMPLE_CONTRACT = Path(__file__).resolve().parents[2] / "sample_contract.txt"
+SAMPLE_QUOTES = [
+    "Acme Software Corp., a Delaware corporation (\"Vendor\"), and BetaCo Inc.",
+    "commence on February 1, 2024 and continue through January 31, 2025",
+    "automatically renew for successive one-year periods",
+    "total annual fee of $120,000.00 USD",
+    "Fees shall be invoiced monthly at $10,000.00 per month.",
+    "due and payable within thirty (30) days of the invoice date (Net 30)",
+    "bear interest at a rate of 1.5% per month",
+    "A grace period of 5 days applies",
+    "Tier 1 (Starter):     1-10 seats",
+    "$0.002 per additional API call",
+    "no later than sixty (60) days before the end",
+    "15% discount on list pricing for the first",
+    "One-time implementation fee of $5,000",
+]
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    return WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+def _source_texts(config) -> list[str]:
+    if isinstance(config, dict):
+        quotes = [config["source_text"]] if isinstance(config.get("source_text"), str) else []
+        return quotes + [q for k, v in config.items() if k != "source_text" for q in _source_texts(v)]
+    return []
+
+
+def load_cases(labels: Path | None, synthetic: int, pages: int, tmp: Path) -> list[tuple[str, str, list[str]]]:
+    cases = [("sample_contract.txt", SAMPLE_CONTRACT.read_text(), SAMPLE_QUOTES)]
+    for i in range(synthetic):
+        text = make_text(tmp / f"synthetic_{i}.txt", pages, seed=i).read_text()
+        cases.append((f"synthetic_{i}", text, sorted(set(BILLING_CLAUSE_RE.findall(text)))))
+    if labels:
+        for line in labels.read_text().splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            quotes = row.get("quotes") or _source_texts(row.get("billing_config", {}))
+            cases.append((row["text_path"], Path(row["text_path"]).read_text(), quotes))
+    return cases
+
+
+def evaluate(cases, budgets: list[int]):
+    print(f"{'budget':>7} {'docs':>5} {'mean_reduction':>15} {'mean_recall':>12} {'min_recall':>11} {'ms/doc':>7}")
+    for budget in budgets:
+        reductions, recalls, elapsed = [], [], 0.0
+        for name, text, quotes in cases:
+            started = time.perf_counter()
+            selection = select_relevant_clauses(text, budget)
+            elapsed += time.perf_counter() - started
+            kept = _normalize(selection.text)
+            found = sum(1 for q in quotes if _normalize(q) in kept)
+            reductions.append(selection.reduction)
+            recalls.append(found / len(quotes) if quotes else 1.0)
+        print(f"{budget:>7} {len(cases):>5} {statistics.mean(reductions):>14.1%} "
+              f"{statistics.mean(recalls):>11.1%} {min(recalls):>10.1%} {1000 * elapsed / len(cases):>7.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the billing-clause relevance index")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--labels", type=Path, help="JSONL file of labelled contracts")
+    parser.add_argument("--synthetic", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        evaluate(load_cases(args.labels, args.synthetic, args.pages, Path(tmp)), args.budgets)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# Offline accuracy and latency evaluation of the rule-based pre-extractor
+#
+#   cd backend && python -m benchmarks.eval_rule_extractor
+#   cd backend && python -m benchmarks.eval_rule_extractor --synthetic 200 --pages 60 --threshold 0.93
+#   cd backend && python -m benchmarks.eval_rule_extractor --labels labels.jsonl
+#
+# Gold answers come from sample_contract.txt (the stub server's canned config
+# is its reference extraction), the synthetic corpus (the terms each contract
+# was generated from, for the clauses that made it into the text), and
+# optionally a JSONL file of {"text_path": ..., "billing_config": {...}} lines.
+# Reports per-field precision and recall, the precision of the fields that
+# RULE_ACCEPT_CONFIDENCE would let skip the LLM, accuracy per confidence band
+# (calibration) and time per document.
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import BILLING_CLAUSES, contract_terms, make_text
+from benchmarks.stub_llm_server import CANNED_BILLING_CONFIG
+from services.llm_service import RULE_ACCEPT_CONFIDENCE
+from services.rule_extractor import extract_rule_fields
+
+SAMPLE_CONTRACT = Path(__file__).resolve().parents[2] / "sample_contract.txt"
+FIELDS = ["contract_value", "billing_frequency", "payment_schedule", "late_fee",
+          "start_date", "end_date", "renewal_clause"]
+# Fields each corpus.BILLING_CLAUSES sentence states, in the same order
+CLAUSE_FIELDS = [
+    ["contract_value"], ["billing_frequency"], ["payment_schedule"], ["late_fee"],
+    ["start_date", "end_date"], ["renewal_clause"],
+]
+CONFIDENCE_BANDS = [(0.0, 0.8), (0.8, 0.9), (0.9, 0.95), (0.95, 1.01)]
+
+
+# The part of a field that is scored: what a reviewer would check first
+def answer(name: str, field):
+    if not isinstance(field, dict):
+        return None
+    if name == "payment_schedule":
+        return field.get("due_days")
+    if name == "late_fee":
+        rate = field.get("rate_percent")
+        return float(rate) if rate is not None else None
+    if name == "contract_value":
+        value = field.get("value")
+        return float(value) if isinstance(value, (int, float)) else None
+    if name == "renewal_clause":
+        if field.get("auto_renews") is None:
+            return None
+        return field.get("auto_renews"), field.get("cancellation_notice_days")
+    return field.get("value")
+
+
+def gold_answers(billing_config: dict) -> dict:
+    answers = {name: answer(name, billing_config.get(name)) for name in FIELDS}
+    return {name: value for name, value in answers.items() if value is not None}
+
+
+def synthetic_gold(text: str, seed: int) -> dict:
+    terms = contract_terms(random.Random(seed))
+    gold = {}
+    for clause, fields in zip(BILLING_CLAUSES, CLAUSE_FIELDS):
+        if clause.format(**terms) not in text:
+            continue
+        for name in fields:
+            gold[name] = {
+                "contract_value": float(terms["value"]),
+                "billing_frequency": terms["frequency"],
+                "payment_schedule": terms["due_days"],
+                "late_fee": float(terms["late_fee"]),
+                "start_date": terms["start"],
+                "end_date": terms["end"],
+                "renewal_clause": (True, terms["notice"]),
+            }[name]
+    return gold
+
+
+def load_cases(labels: Path | None, synthetic: int, pages: int, tmp: Path) -> list[tuple[str, str, dict]]:
+    cases = [("sample_contract.txt", SAMPLE_CONTRACT.read_text(), gold_answers(CANNED_BILLING_CONFIG))]
+    for i in range(synthetic):
+        text = make_text(tmp / f"synthetic_{i}.txt", pages, seed=i).read_text()
+        cases.append((f"synthetic_{i}", text, synthetic_gold(text, i)))
+    if labels:
+        for line in labels.read_text().splitlines():
+            if line.strip():
+                row = json.loads(line)
+                cases.append((row["text_path"], Path(row["text_path"]).read_text(),
+                              gold_answers(row["billing_config"])))
+    return cases
+
+
+def evaluate(cases, threshold: float):
+    counts = {name: {"gold": 0, "found": 0, "correct": 0, "accepted": 0, "accepted_correct": 0} for name in FIELDS}
+    bands = {band: [] for band in CONFIDENCE_BANDS}
+    timings = []
+    wrong = []
+
+    for case_name, text, gold in cases:
+        started = time.perf_counter()
+        extraction = extract_rule_fields(text)
+        timings.append(time.perf_counter() - started)
+
+        for name in FIELDS:
+            field = extraction.fields.get(name)
+            c = counts[name]
+            c["gold"] += name in gold
+            if field is None:
+                continue
+            correct = name in gold and answer(name, field) == gold[name]
+            c["found"] += 1
+            c["correct"] += correct
+            if field["confidence"] >= threshold:
+                c["accepted"] += 1
+                c["accepted_correct"] += correct
+            for low, high in CONFIDENCE_BANDS:
+                if low <= field["confidence"] < high:
+                    bands[(low, high)].append(correct)
+            if not correct:
+                wrong.append((case_name, name, answer(name, field), gold.get(name)))
+
+    print(f"{len(cases)} documents, accept threshold {threshold}\n")
+    print(f"{'field':<18} {'gold':>5} {'found':>6} {'precision':>10} {'recall':>7} {'accepted':>9} {'acc_precision':>14}")
+    for name, c in counts.items():
+        print(f"{name:<18} {c['gold']:>5} {c['found']:>6} {_ratio(c['correct'], c['found']):>10} "
+              f"{_ratio(c['correct'], c['gold']):>7} {c['accepted']:>9} {_ratio(c['accepted_correct'], c['accepted']):>14}")
+
+    print(f"\n{'confidence':<12} {'fields':>7} {'accuracy':>9}")
+    for (low, high), outcomes in bands.items():
+        print(f"{low:.2f}-{min(high, 1.0):.2f}   {len(outcomes):>7} {_ratio(sum(outcomes), len(outcomes)):>9}")
+
+    timings.sort()
+    print(f"\nms/doc: mean {1000 * statistics.mean(timings):.2f}  "
+          f"p95 {1000 * timings[int(0.95 * (len(timings) - 1))]:.2f}  max {1000 * timings[-1]:.2f}")
+    for case_name, name, got, expected in wrong[:10]:
+        print(f"wrong: {case_name} {name}: got {got!r}, expected {expected!r}")
+
+
+def _ratio(numerator: int, denominator: int) -> str:
+    return f"{numerator / denominator:.1%}" if denominator else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the rule-based pre-extractor")
+    parser.add_argument("--labels", type=Path, help="JSONL file of labelled contracts")
+    parser.add_argument("--synthetic", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--threshold", type=float, default=RULE_ACCEPT_CONFIDENCE,
+                        help="confidence at which fields skip the LLM")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        evaluate(load_cases(args.labels, args.synthetic, args.pages, Path(tmp)), args.threshold)
+
+
+if __name__ == "__main__":
+    main()
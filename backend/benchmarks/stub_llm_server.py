@@ -0,0 +1,332 @@
+# Local stand-in for the OpenAI and Anthropic APIs, for load tests and benchmarks
+#
+#   cd backend && python -m benchmarks.stub_llm_server --port 8900 --latency-ms 800 --error-rate 0.05
+#   OPENAI_BASE_URL=http://127.0.0.1:8900/v1 ANTHROPIC_BASE_URL=http://127.0.0.1:8900 \
+#   OPENAI_API_KEY=stub ANTHROPIC_API_KEY=stub python worker.py
+#
+# Serves POST /v1/chat/completions and POST /v1/messages with a canned billing
+# config after a configurable latency, failing a fraction of requests with
+# 429 (with Retry-After) or 500. Requests with "stream": true get the config
+# as Server-Sent Events in small chunks, with the latency spread over them, and
+# a share of streams can be cut off before the object is complete. Usage
+# fields include prompt-cache reads and writes, simulated per provider (see
+# cache_usage below). GET /stats reports request counts, the highest number of
+# requests in flight at once and input tokens by cache outcome.
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Matches sample_contract.txt
+CANNED_BILLING_CONFIG = {
+    "contract_parties": {
+        "vendor": {"value": "Acme Software Corp.", "confidence": 1.0,
+                   "source_text": "Acme Software Corp., a Delaware corporation (\"Vendor\")"},
+        "client": {"value": "BetaCo Inc.", "confidence": 1.0,
+                   "source_text": "BetaCo Inc., a California corporation (\"Customer\")"},
+    },
+    "contract_value": {"value": 120000, "currency": "USD", "confidence": 1.0,
+                       "source_text": "total annual fee of $120,000.00 USD"},
+    "billing_frequency": {"value": "monthly", "custom_description": None, "confidence": 1.0,
+                          "source_text": "Fees shall be invoiced monthly at $10,000.00 per month."},
+    "payment_schedule": {"value": "Net 30", "due_days": 30, "confidence": 1.0,
+                         "source_text": "due and payable within thirty (30) days of the invoice date (Net 30)"},
+    "usage_tiers": {
+        "value": [
+            {"tier_name": "Starter", "min_units": 1, "max_units": 10, "price_per_unit": None,
+             "flat_fee": None, "unit_type": "seats"},
+        ],
+        "confidence": 0.7,
+        "source_text": "Tier 1 (Starter):     1-10 seats",
+    },
+    "renewal_clause": {"auto_renews": True, "renewal_period_months": 12, "cancellation_notice_days": 60,
+                       "confidence": 0.95, "source_text": "automatically renew for successive one-year periods"},
+    "late_fee": {"applies": True, "rate_percent": 1.5, "grace_period_days": 5, "flat_amount": None,
+                 "confidence": 1.0, "source_text": "bear interest at a rate of 1.5% per month"},
+    "start_date": {"value": "2024-02-01", "confidence": 1.0,
+                   "source_text": "commence on February 1, 2024 and continue through January 31, 2025"},
+    "end_date": {"value": "2025-01-31", "confidence": 1.0,
+                 "source_text": "commence on February 1, 2024 and continue through January 31, 2025"},
+    "special_terms": {"value": ["15% discount for the first year", "One-time implementation fee of $5,000"],
+                      "confidence": 0.9, "source_text": "15% discount on list pricing for the first"},
+    "extraction_notes": "Stub response.",
+}
+
+
+@dataclass
+class StubSettings:
+    latency_ms: float = 500.0
+    jitter_ms: float = 200.0
+    error_rate: float = 0.0
+    # Share of injected errors that are 429s; the rest are 500s
+    rate_limit_share: float = 0.7
+    retry_after_seconds: float = 1.0
+    # Streaming: characters per chunk, share of the latency before the first chunk,
+    # and share of streams that stop halfway (finish_reason "length" / stop_reason "max_tokens")
+    stream_chunk_chars: int = 40
+    first_chunk_share: float = 0.2
+    cutoff_rate: float = 0.0
+    # Shortest prefix the simulated prompt caches will store (the providers' minimum)
+    prompt_cache_min_tokens: int = 1024
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    errors: int = 0
+    cut_off: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    by_path: dict = field(default_factory=dict)
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+def _estimate_tokens(payload: dict) -> int:
+    return len(json.dumps(payload)) // 4
+
+
+def create_app(settings: StubSettings) -> FastAPI:
+    app = FastAPI(title="Stub LLM API")
+    stats = StubStats()
+    app.state.settings = settings
+    app.state.stats = stats
+
+    cached_prefixes: set[str] = set()
+
+    # Tokens of a prompt prefix served from the simulated cache, and tokens written to it
+    def cache_usage(provider: str, prefix: list) -> tuple[int, int]:
+        tokens = _estimate_tokens(prefix) if prefix else 0
+        if tokens < settings.prompt_cache_min_tokens:
+            return 0, 0
+        key = provider + hashlib.sha256(json.dumps(prefix, sort_keys=True).encode()).hexdigest()
+        if key in cached_prefixes:
+            return tokens, 0
+        cached_prefixes.add(key)
+        return 0, tokens
+
+    # OpenAI caches the leading system message automatically, in 128-token steps, and
+    # counts cached tokens inside prompt_tokens; writes are free and not reported
+    def openai_usage(payload: dict, completion_tokens: int) -> dict:
+        messages = payload.get("messages", [])
+        prompt_tokens = _estimate_tokens(messages)
+        cached, _ = cache_usage("openai", [m for m in messages[:1] if m.get("role") == "system"])
+        cached = cached // 128 * 128
+        stats.input_tokens += prompt_tokens
+        stats.cached_input_tokens += cached
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached},
+        }
+
+    # Anthropic caches system blocks up to the last cache_control breakpoint and
+    # reports reads and writes separately from input_tokens
+    def anthropic_usage(payload: dict, output_tokens: int = 0) -> dict:
+        system = payload.get("system")
+        total = _estimate_tokens([system, payload.get("messages", [])])
+        read = write = 0
+        if isinstance(system, list):
+            marked = [i for i, block in enumerate(system) if block.get("cache_control")]
+            if marked:
+                read, write = cache_usage("anthropic", system[:marked[-1] + 1])
+        stats.input_tokens += total
+        stats.cached_input_tokens += read
+        stats.cache_write_tokens += write
+        return {
+            "input_tokens": total - read - write,
+            "cache_read_input_tokens": read,
+            "cache_creation_input_tokens": write,
+            "output_tokens": output_tokens,
+        }
+
+    def _latency_seconds() -> float:
+        return max(0.0, settings.latency_ms + random.uniform(-settings.jitter_ms, settings.jitter_ms)) / 1000
+
+    # Waits out the latency (or, for streams, the share before the first chunk) and
+    # returns an injected error response, or None
+    async def simulate(path: str, latency_share: float = 1.0):
+        stats.requests += 1
+        stats.by_path[path] = stats.by_path.get(path, 0) + 1
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            await asyncio.sleep(latency_share * _latency_seconds())
+        finally:
+            stats.in_flight -= 1
+
+        if random.random() < settings.error_rate:
+            stats.errors += 1
+            if random.random() < settings.rate_limit_share:
+                return JSONResponse(
+                    {"error": {"type": "rate_limit_error", "message": "Stub rate limit"}},
+                    status_code=429,
+                    headers={"retry-after": str(settings.retry_after_seconds)},
+                )
+            return JSONResponse({"error": {"type": "api_error", "message": "Stub server error"}}, status_code=500)
+        return None
+
+    # The response text in chunks, the rest of the latency spread over them;
+    # cut-off streams end halfway. Yields (chunk, cut_off) pairs.
+    async def generate(content: str):
+        chunks = [content[i:i + settings.stream_chunk_chars]
+                  for i in range(0, len(content), settings.stream_chunk_chars)]
+        cut_off = random.random() < settings.cutoff_rate
+        if cut_off:
+            stats.cut_off += 1
+            chunks = chunks[:len(chunks) // 2]
+        pause = (1 - settings.first_chunk_share) * _latency_seconds() / max(1, len(chunks))
+        for chunk in chunks:
+            yield chunk, cut_off
+            await asyncio.sleep(pause)
+
+    def sse(data: dict, event: str = "") -> str:
+        return (f"event: {event}\n" if event else "") + f"data: {json.dumps(data)}\n\n"
+
+    async def openai_stream(payload: dict, content: str):
+        completion_id, created = f"chatcmpl-{uuid.uuid4().hex}", int(time.time())
+        model = payload.get("model", "stub")
+        finish_reason, output = "stop", ""
+
+        def chunk(delta: dict, finish_reason=None) -> str:
+            return sse({"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                        "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]})
+
+        yield chunk({"role": "assistant", "content": ""})
+        async for text, cut_off in generate(content):
+            output += text
+            finish_reason = "length" if cut_off else "stop"
+            yield chunk({"content": text})
+        yield chunk({}, finish_reason)
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            yield sse({"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                       "choices": [], "usage": openai_usage(payload, len(output) // 4)})
+        yield "data: [DONE]\n\n"
+
+    async def anthropic_stream(payload: dict, content: str):
+        message = {
+            "id": f"msg_{uuid.uuid4().hex}", "type": "message", "role": "assistant",
+            "model": payload.get("model", "stub"), "content": [], "stop_reason": None, "stop_sequence": None,
+            "usage": anthropic_usage(payload),
+        }
+        stop_reason, output = "end_turn", ""
+        yield sse({"type": "message_start", "message": message}, "message_start")
+        yield sse({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+                  "content_block_start")
+        async for text, cut_off in generate(content):
+            output += text
+            stop_reason = "max_tokens" if cut_off else "end_turn"
+            yield sse({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}},
+                      "content_block_delta")
+        yield sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+        yield sse({"type": "message_delta", "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+                   "usage": {"output_tokens": len(output) // 4}}, "message_delta")
+        yield sse({"type": "message_stop"}, "message_stop")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        streaming = bool(payload.get("stream"))
+        error = await simulate("openai", settings.first_chunk_share if streaming else 1.0)
+        if error:
+            return error
+        content = json.dumps(CANNED_BILLING_CONFIG)
+        if streaming:
+            return StreamingResponse(openai_stream(payload, content), media_type="text/event-stream")
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": openai_usage(payload, len(content) // 4),
+        }
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        payload = await request.json()
+        streaming = bool(payload.get("stream"))
+        error = await simulate("anthropic", settings.first_chunk_share if streaming else 1.0)
+        if error:
+            return error
+        content = json.dumps(CANNED_BILLING_CONFIG)
+        if streaming:
+            return StreamingResponse(anthropic_stream(payload, content), media_type="text/event-stream")
+        return {
+            "id": f"msg_{uuid.uuid4().hex}",
+            "type": "message",
+            "role": "assistant",
+            "model": payload.get("model", "stub"),
+            "content": [{"type": "text", "text": content}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": anthropic_usage(payload, len(content) // 4),
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return {
+            "requests": stats.requests,
+            "errors": stats.errors,
+            "cut_off": stats.cut_off,
+            "in_flight": stats.in_flight,
+            "max_in_flight": stats.max_in_flight,
+            "by_path": stats.by_path,
+            "input_tokens": stats.input_tokens,
+            "cached_input_tokens": stats.cached_input_tokens,
+            "cache_write_tokens": stats.cache_write_tokens,
+        }
+
+    return app
+
+
+# Start the stub on a background thread; returns once it accepts connections
+def run_in_thread(settings: StubSettings, port: int = 8900) -> tuple[uvicorn.Server, FastAPI]:
+    app = create_app(settings)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stub OpenAI/Anthropic API")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--jitter-ms", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--cutoff-rate", type=float, default=0.0, help="share of streams that stop halfway")
+    parser.add_argument("--prompt-cache-min-tokens", type=int, default=1024)
+    args = parser.parse_args()
+
+    settings = StubSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        retry_after_seconds=args.retry_after,
+        cutoff_rate=args.cutoff_rate,
+        prompt_cache_min_tokens=args.prompt_cache_min_tokens,
+    )
+    uvicorn.run(create_app(settings), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
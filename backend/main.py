@@ -5,12 +5,21 @@ import logging
 import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from dotenv import load_dotenv
 
-from database import engine, Base
-from routers import contracts_router
+from database import engine, async_engine, Base, SessionLocal, get_async_db
+from routers import contracts_router, audit_router, stats_router, billing_facts_router, search_router
+from routers.contracts import MAX_UPLOAD_REQUEST_SIZE
+from services.events import contract_events
+from services.job_queue import count_open_jobs
+from services.metrics import METRICS_CONTENT_TYPE, record_queue_depth, render_metrics
+from services.billing_facts import backfill_billing_facts
+from services.search_service import backfill_search_index, ensure_search_index
+from services.stats_service import reconcile_contract_counts
 
 load_dotenv()
 
@@ -26,8 +35,29 @@ async def lifespan(app: FastAPI):
     """Create tables on startup (use Alembic for production migrations)."""
     logger.info("Starting Contract Parser API...")
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        ensure_search_index(conn)
+    # Seed contract_counts and repair drift from writes that bypassed the ORM
+    _startup_task("reconcile contract counts", reconcile_contract_counts)
+    # Fill derived tables for contracts processed before they existed
+    _startup_task("backfill billing facts", backfill_billing_facts)
+    _startup_task("backfill the search index", backfill_search_index)
+    await contract_events.start()
     yield
     logger.info("Shutting down...")
+    await contract_events.stop()
+    await async_engine.dispose()
+
+
+# Run a maintenance function with its own session; failures are logged, not fatal
+def _startup_task(description: str, fn):
+    db = SessionLocal()
+    try:
+        fn(db)
+    except Exception as e:
+        logger.error(f"Could not {description}: {e}")
+    finally:
+        db.close()
 
 
 app = FastAPI(
@@ -47,8 +77,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject uploads whose declared size is over the limit before the multipart body is read
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    if request.method == "POST" and request.url.path.endswith("/upload"):
+        length = request.headers.get("content-length", "")
+        if length.isdigit() and int(length) > MAX_UPLOAD_REQUEST_SIZE:
+            return JSONResponse({"detail": "File too large. Maximum size is 10MB."}, status_code=413)
+    return await call_next(request)
+
+
 # Routers
 app.include_router(contracts_router)
+app.include_router(audit_router)
+app.include_router(stats_router)
+app.include_router(billing_facts_router)
+app.include_router(search_router)
 
 
 @app.get("/health")
@@ -56,6 +100,18 @@ def health():
     return {"status": "ok", "service": "contract-parser-api"}
 
 
+# Prometheus metrics for this process (or every process sharing PROMETHEUS_MULTIPROC_DIR),
+# plus the queue depth read from the database.
+# Pipeline and LLM metrics are recorded by the worker and served on its status port.
+@app.get("/metrics")
+async def metrics(db: AsyncSession = Depends(get_async_db)):
+    try:
+        record_queue_depth(await db.run_sync(count_open_jobs))
+    except Exception as e:
+        logger.error(f"Could not read the queue depth: {e}")
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/")
 def root():
     return {
@@ -1 +1,5 @@
-from models.contract import Contract, AuditLog, ContractStatus
\ No newline at end of file
+from models.contract import Contract, AuditLog, ContractStatus
+from models.job import ProcessingJob, JobStatus
+from models.extraction_cache import ExtractionCacheEntry
+from models.stats import ContractStatusCount, ContractStatsHourly, bump_hourly_stats
+from models.billing_facts import BillingFacts, BillingFactUsageTier
@@ -0,0 +1,59 @@
+# Typed, indexed copy of the key billing terms in Contract.billing_config
+# One billing_facts row per extracted contract plus one row per usage tier, so
+# questions like "annual contracts over $100k ending in Q3 on Net 60" are index
+# range scans instead of a full scan that parses JSON. Rebuilt from the JSON by
+# services/billing_facts.py in the same transaction as every write to it.
+
+from datetime import datetime
+from sqlalchemy import (
+    Column, String, DateTime, Date, Integer, Boolean, Numeric,
+    ForeignKey, Index
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from database import Base
+
+
+class BillingFacts(Base):
+    __tablename__ = "billing_facts"
+
+    contract_id = Column(UUID(as_uuid=True), ForeignKey("contracts.id", ondelete="CASCADE"), primary_key=True)
+    vendor = Column(String(255), nullable=True)
+    client = Column(String(255), nullable=True)
+    contract_value = Column(Numeric(18, 2), nullable=True)
+    currency = Column(String(3), nullable=True)
+    billing_frequency = Column(String(20), nullable=True)
+    due_days = Column(Integer, nullable=True)
+    auto_renews = Column(Boolean, nullable=True)
+    start_date = Column(Date, nullable=True)
+    end_date = Column(Date, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    usage_tiers = relationship("BillingFactUsageTier", order_by="BillingFactUsageTier.position",
+                               passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_billing_facts_frequency_value", "billing_frequency", "contract_value"),
+        Index("ix_billing_facts_value", "contract_value"),
+        Index("ix_billing_facts_end_date", "end_date"),
+        Index("ix_billing_facts_start_date", "start_date"),
+        Index("ix_billing_facts_due_days", "due_days"),
+    )
+
+
+class BillingFactUsageTier(Base):
+    __tablename__ = "billing_fact_usage_tiers"
+
+    contract_id = Column(UUID(as_uuid=True), ForeignKey("billing_facts.contract_id", ondelete="CASCADE"),
+                         primary_key=True)
+    position = Column(Integer, primary_key=True)  # order within usage_tiers.value
+    tier_name = Column(String(255), nullable=True)
+    unit_type = Column(String(100), nullable=True)
+    min_units = Column(Numeric(18, 2), nullable=True)
+    max_units = Column(Numeric(18, 2), nullable=True)
+    price_per_unit = Column(Numeric(18, 6), nullable=True)
+    flat_fee = Column(Numeric(18, 2), nullable=True)
+
+    __table_args__ = (
+        Index("ix_billing_fact_usage_tiers_unit_type", "unit_type"),
+    )
@@ -2,11 +2,11 @@
 
 from datetime import datetime
 from sqlalchemy import (
-    Column, String, Text, DateTime, Float, JSON, 
-    ForeignKey, Enum as SAEnum
+    Column, String, Text, DateTime, Float, Integer, JSON, 
+    ForeignKey, Index, Enum as SAEnum
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from database import Base
 import uuid
 import enum
@@ -26,16 +26,28 @@ class Contract(Base):
     filename = Column(String(255), nullable=False)
     original_filename = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
-    raw_text = Column(Text, nullable=True)
+    file_sha256 = Column(String(64), nullable=True, index=True)
+    # Can be hundreds of KB; only loaded when accessed or explicitly undeferred
+    raw_text = deferred(Column(Text, nullable=True))
     status = Column(SAEnum(ContractStatus), default=ContractStatus.PENDING)
     billing_config = Column(JSON, nullable=True)
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped by every ORM update, which also checks it in the WHERE clause and
+    # raises StaleDataError if another writer got there first. Clients send the
+    # version they read with edits to have stale ones rejected.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     audit_logs = relationship("AuditLog", back_populates="contract", 
                                order_by="AuditLog.created_at.desc()")
 
+    __table_args__ = (
+        # list_contracts pages newest first by (created_at, id); scanned backwards
+        Index("ix_contracts_created_id", "created_at", "id"),
+    )
+    __mapper_args__ = {"version_id_col": version}
+
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
@@ -49,4 +61,13 @@ class AuditLog(Base):
     action = Column(String(50), nullable=False)  # "extracted", "edited", "exported"
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    contract = relationship("Contract", back_populates="audit_logs")
\ No newline at end of file
+    contract = relationship("Contract", back_populates="audit_logs")
+
+    __table_args__ = (
+        # Every audit listing is newest first by (created_at, id): per contract,
+        # across all contracts, and filtered by action or field
+        Index("ix_audit_logs_contract_created", "contract_id", "created_at", "id"),
+        Index("ix_audit_logs_created", "created_at", "id"),
+        Index("ix_audit_logs_action_created", "action", "created_at", "id"),
+        Index("ix_audit_logs_field_created", "field_name", "created_at", "id"),
+    )
\ No newline at end of file
@@ -0,0 +1,24 @@
+# SQLAlchemy model for cached LLM extractions, keyed by normalized contract text
+
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer, JSON, Index
+from database import Base
+
+
+class ExtractionCacheEntry(Base):
+    __tablename__ = "extraction_cache"
+
+    # sha256 of prompt version + model + normalized contract text
+    cache_key = Column(String(64), primary_key=True)
+    prompt_version = Column(String(32), nullable=False)
+    model = Column(String(200), nullable=False)
+    billing_config = Column(JSON, nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_extraction_cache_expires_at", "expires_at"),
+        Index("ix_extraction_cache_last_accessed_at", "last_accessed_at"),
+    )
@@ -0,0 +1,42 @@
+# SQLAlchemy model for the durable contract processing queue
+
+from datetime import datetime
+from sqlalchemy import (
+    Column, String, Text, DateTime, Integer,
+    ForeignKey, Index, Enum as SAEnum
+)
+from sqlalchemy.dialects.postgresql import UUID
+from database import Base
+import uuid
+import enum
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ProcessingJob(Base):
+    __tablename__ = "processing_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    contract_id = Column(UUID(as_uuid=True), ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False)
+    status = Column(SAEnum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String(255), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Workers claim by (status, run_after); the reaper scans running leases
+        Index("ix_processing_jobs_claim", "status", "run_after"),
+        Index("ix_processing_jobs_lease", "status", "lease_expires_at"),
+        Index("ix_processing_jobs_contract_id", "contract_id"),
+    )
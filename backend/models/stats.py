@@ -0,0 +1,102 @@
+# Incrementally maintained contract statistics
+# contract_counts holds one row per ContractStatus. Mapper events adjust it in
+# the same transaction as every ORM insert, status change and delete of a
+# Contract, so totals are a primary-key lookup instead of a count(*) over
+# contracts. Bulk query.update()/delete() on contracts bypass these events;
+# reconcile_contract_counts (run at API startup) repairs any drift.
+#
+# contract_stats_hourly accumulates per-hour throughput, processing latency and
+# confidence totals, so windowed dashboard stats read at most one row per hour.
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, String, event, inspect, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from database import Base
+from models.contract import Contract, ContractStatus
+
+
+class ContractStatusCount(Base):
+    __tablename__ = "contract_counts"
+
+    status = Column(String(20), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+
+
+class ContractStatsHourly(Base):
+    __tablename__ = "contract_stats_hourly"
+
+    hour = Column(DateTime, primary_key=True)  # UTC, truncated to the hour
+    uploaded = Column(BigInteger, nullable=False, default=0)
+    completed = Column(BigInteger, nullable=False, default=0)
+    failed = Column(BigInteger, nullable=False, default=0)
+    processing_seconds = Column(Float, nullable=False, default=0.0)
+    processing_samples = Column(BigInteger, nullable=False, default=0)
+    fields_total = Column(BigInteger, nullable=False, default=0)
+    fields_low_confidence = Column(BigInteger, nullable=False, default=0)
+
+
+HOURLY_COUNTERS = (
+    "uploaded", "completed", "failed", "processing_seconds", "processing_samples",
+    "fields_total", "fields_low_confidence",
+)
+
+
+# Add deltas to the current hour's row, creating it if needed, on the caller's
+# connection so the stats commit (or roll back) with the change they describe
+def bump_hourly_stats(connection, **deltas):
+    table = ContractStatsHourly.__table__
+    hour = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    values = {name: deltas.get(name, 0) for name in HOURLY_COUNTERS}
+
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(table).values(hour=hour, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.hour],
+        set_={name: table.c[name] + stmt.excluded[name] for name in deltas},
+    )
+    connection.execute(stmt)
+
+
+def _status_value(status) -> str:
+    if isinstance(status, ContractStatus):
+        return status.value
+    return status or ContractStatus.PENDING.value
+
+
+def _adjust(connection, status, delta: int):
+    table = ContractStatusCount.__table__
+    connection.execute(
+        update(table).where(table.c.status == _status_value(status)).values(count=table.c.count + delta)
+    )
+
+
+@event.listens_for(Contract, "after_insert")
+def _count_insert(mapper, connection, target):
+    _adjust(connection, target.status, 1)
+    bump_hourly_stats(connection, uploaded=1)
+
+
+# Makes assignments to an expired status load the previous value first, so
+# after_update always knows which counter to decrement
+@event.listens_for(Contract.status, "set", active_history=True)
+def _load_previous_status(target, value, oldvalue, initiator):
+    pass
+
+
+@event.listens_for(Contract, "after_update")
+def _count_status_change(mapper, connection, target):
+    history = inspect(target).attrs.status.history
+    if not history.has_changes():
+        return
+    for old in history.deleted:
+        _adjust(connection, old, -1)
+    for new in history.added:
+        _adjust(connection, new, 1)
+
+
+@event.listens_for(Contract, "before_delete")
+def _count_delete(mapper, connection, target):
+    _adjust(connection, target.status, -1)
@@ -1 +1,5 @@
-from routers.contracts import router as contracts_router
\ No newline at end of file
+from routers.contracts import router as contracts_router
+from routers.audit import router as audit_router
+from routers.stats import router as stats_router
+from routers.billing_facts import router as billing_facts_router
+from routers.search import router as search_router
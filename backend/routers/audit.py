@@ -0,0 +1,68 @@
+# Audit feed API router: audit entries across all contracts
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db
+from models import Contract, AuditLog
+from services.pagination import InvalidCursor, apply_keyset, fetch_page
+
+router = APIRouter(prefix="/api/audit", tags=["audit"])
+
+AUDIT_FEED_PAGE_SIZE = 50
+MAX_AUDIT_FEED_PAGE_SIZE = 200
+
+
+# Newest-first audit entries with each contract's filename, keyset-paginated on
+# (created_at, id). One page is one query on the audit_logs indexes.
+@router.get("")
+async def audit_feed(
+    action: Optional[str] = Query(None),
+    field: Optional[str] = Query(None),
+    contract_id: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(AUDIT_FEED_PAGE_SIZE, ge=1, le=MAX_AUDIT_FEED_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = select(AuditLog, Contract.original_filename).join(Contract, Contract.id == AuditLog.contract_id)
+    if action:
+        stmt = stmt.where(AuditLog.action == action)
+    if field:
+        stmt = stmt.where(AuditLog.field_name == field)
+    if contract_id:
+        stmt = stmt.where(AuditLog.contract_id == contract_id)
+    if since:
+        stmt = stmt.where(AuditLog.created_at >= since)
+    if until:
+        stmt = stmt.where(AuditLog.created_at < until)
+
+    try:
+        stmt = apply_keyset(stmt, AuditLog.created_at, AuditLog.id, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(400, str(e))
+    rows, next_cursor = await fetch_page(db, stmt, limit,
+                                         sort_key=lambda row: (row.AuditLog.created_at, row.AuditLog.id))
+
+    return {
+        "entries": [
+            {
+                "id": str(log.id),
+                "contract_id": str(log.contract_id),
+                "contract_filename": filename,
+                "field_name": log.field_name,
+                "old_value": log.old_value,
+                "new_value": log.new_value,
+                "reason": log.reason,
+                "action": log.action,
+                "created_at": log.created_at,
+            }
+            for log, filename in rows
+        ],
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,121 @@
+# Billing facts API router: filter contracts by their typed billing terms
+
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from database import get_async_db
+from models import BillingFacts, BillingFactUsageTier, Contract
+from services.pagination import InvalidCursor, apply_keyset, fetch_page
+
+router = APIRouter(prefix="/api/billing-facts", tags=["billing-facts"])
+
+BILLING_FACTS_PAGE_SIZE = 50
+MAX_BILLING_FACTS_PAGE_SIZE = 200
+
+
+# Contracts matching every given filter, newest first, keyset-paginated on the
+# contract's (created_at, id). Date ranges are inclusive; vendor and client
+# match case-insensitively anywhere in the name.
+# e.g. ?billing_frequency=annually&min_value=100000&end_from=2025-07-01&end_to=2025-09-30&due_days=60
+@router.get("")
+async def query_billing_facts(
+    vendor: Optional[str] = Query(None),
+    client: Optional[str] = Query(None),
+    currency: Optional[str] = Query(None, min_length=3, max_length=3),
+    billing_frequency: Optional[str] = Query(None),
+    min_value: Optional[Decimal] = Query(None),
+    max_value: Optional[Decimal] = Query(None),
+    due_days: Optional[int] = Query(None, ge=0),
+    max_due_days: Optional[int] = Query(None, ge=0),
+    auto_renews: Optional[bool] = Query(None),
+    start_from: Optional[date] = Query(None),
+    start_to: Optional[date] = Query(None),
+    end_from: Optional[date] = Query(None),
+    end_to: Optional[date] = Query(None),
+    unit_type: Optional[str] = Query(None, description="contracts with a usage tier priced in this unit"),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(BILLING_FACTS_PAGE_SIZE, ge=1, le=MAX_BILLING_FACTS_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = (
+        select(BillingFacts, Contract.original_filename, Contract.created_at)
+        .join(Contract, Contract.id == BillingFacts.contract_id)
+        .options(selectinload(BillingFacts.usage_tiers))
+    )
+    if vendor:
+        stmt = stmt.where(BillingFacts.vendor.ilike(f"%{vendor}%"))
+    if client:
+        stmt = stmt.where(BillingFacts.client.ilike(f"%{client}%"))
+    if currency:
+        stmt = stmt.where(BillingFacts.currency == currency.upper())
+    if billing_frequency:
+        stmt = stmt.where(BillingFacts.billing_frequency == billing_frequency.lower())
+    if min_value is not None:
+        stmt = stmt.where(BillingFacts.contract_value >= min_value)
+    if max_value is not None:
+        stmt = stmt.where(BillingFacts.contract_value <= max_value)
+    if due_days is not None:
+        stmt = stmt.where(BillingFacts.due_days == due_days)
+    if max_due_days is not None:
+        stmt = stmt.where(BillingFacts.due_days <= max_due_days)
+    if auto_renews is not None:
+        stmt = stmt.where(BillingFacts.auto_renews == auto_renews)
+    if start_from:
+        stmt = stmt.where(BillingFacts.start_date >= start_from)
+    if start_to:
+        stmt = stmt.where(BillingFacts.start_date <= start_to)
+    if end_from:
+        stmt = stmt.where(BillingFacts.end_date >= end_from)
+    if end_to:
+        stmt = stmt.where(BillingFacts.end_date <= end_to)
+    if unit_type:
+        stmt = stmt.where(exists().where(
+            BillingFactUsageTier.contract_id == BillingFacts.contract_id,
+            BillingFactUsageTier.unit_type == unit_type.lower(),
+        ))
+
+    try:
+        stmt = apply_keyset(stmt, Contract.created_at, Contract.id, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(400, str(e))
+    rows, next_cursor = await fetch_page(db, stmt, limit,
+                                         sort_key=lambda row: (row.created_at, row.BillingFacts.contract_id))
+
+    return {
+        "contracts": [_facts_entry(facts, filename, created_at) for facts, filename, created_at in rows],
+        "next_cursor": next_cursor,
+    }
+
+
+def _facts_entry(facts: BillingFacts, filename: str, created_at) -> dict:
+    return {
+        "contract_id": str(facts.contract_id),
+        "filename": filename,
+        "created_at": created_at,
+        "vendor": facts.vendor,
+        "client": facts.client,
+        "contract_value": facts.contract_value,
+        "currency": facts.currency,
+        "billing_frequency": facts.billing_frequency,
+        "due_days": facts.due_days,
+        "auto_renews": facts.auto_renews,
+        "start_date": facts.start_date,
+        "end_date": facts.end_date,
+        "usage_tiers": [
+            {
+                "tier_name": tier.tier_name,
+                "unit_type": tier.unit_type,
+                "min_units": tier.min_units,
+                "max_units": tier.max_units,
+                "price_per_unit": tier.price_per_unit,
+                "flat_fee": tier.flat_fee,
+            }
+            for tier in facts.usage_tiers
+        ],
+    }
@@ -2,19 +2,36 @@
 
 import os
 import uuid
+import json
+import hashlib
+import asyncio
+import copy
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks, Query
-from fastapi.responses import Response
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-
-from database import get_db
+import aiofiles.os
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.orm.exc import StaleDataError
+
+from database import get_async_db, AsyncSessionLocal
 from models import Contract, AuditLog, ContractStatus
-from services import extract_text_from_file, extract_billing_config, export_as_json, export_as_csv
+from services import (
+    export_as_json, export_as_csv, export_ndjson_line, export_csv_lines, bulk_csv_header,
+    enqueue_contract, save_upload, UploadTooLarge,
+)
+from services.billing_facts import sync_billing_facts
+from services.events import contract_events, TERMINAL_EVENTS
+from services.field_edits import FieldPathError, apply_field_edit
+from services.pagination import InvalidCursor, apply_keyset, fetch_page
+from services.stats_service import get_contract_total
 
 router = APIRouter(prefix="/api/contracts", tags=["contracts"])
 logger = logging.getLogger(__name__)
@@ -22,6 +39,41 @@ logger = logging.getLogger(__name__)
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+# Allowance for the multipart boundaries and headers around the file itself
+MAX_UPLOAD_REQUEST_SIZE = MAX_FILE_SIZE + 64 * 1024
+# Columns list_contracts needs; raw_text and billing_config are never loaded for lists
+SUMMARY_COLUMNS = (
+    Contract.id, Contract.original_filename, Contract.status, Contract.created_at, Contract.updated_at,
+)
+
+# Edits accepted by one batch field update
+MAX_BATCH_EDITS = 200
+
+# Rows fetched from the server-side cursor (and audited) per step of a bulk export
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+AUDIT_PAGE_SIZE = 50
+MAX_AUDIT_PAGE_SIZE = 200
+
+# Fields get_contract can return; "id" is always included
+CONTRACT_FIELDS = (
+    "filename", "status", "raw_text", "billing_config", "error_message",
+    "created_at", "updated_at", "version", "audit_log",
+)
+FIELD_COLUMNS = {
+    "filename": Contract.original_filename,
+    "status": Contract.status,
+    "raw_text": Contract.raw_text,
+    "billing_config": Contract.billing_config,
+    "error_message": Contract.error_message,
+    "created_at": Contract.created_at,
+    "updated_at": Contract.updated_at,
+    "version": Contract.version,
+}
+
+# Idle event streams send a keepalive and re-check the contract status this often,
+# which also covers events missed while a listener was reconnecting
+EVENT_STREAM_RECHECK_SECONDS = float(os.getenv("EVENT_STREAM_RECHECK_SECONDS", "15"))
 
 
 # Pydantic schemas
@@ -30,6 +82,21 @@ class FieldUpdate(BaseModel):
     field: str
     value: object
     reason: Optional[str] = None
+    # Contract version the edit was based on; rejected with 409 if stale
+    version: Optional[int] = None
+
+
+class FieldEdit(BaseModel):
+    field: str
+    value: object
+    reason: Optional[str] = None
+
+
+class BatchFieldUpdate(BaseModel):
+    version: int
+    edits: list[FieldEdit] = Field(..., min_length=1, max_length=MAX_BATCH_EDITS)
+    # Applies to edits without a reason of their own
+    reason: Optional[str] = None
 
 
 class ContractSummary(BaseModel):
@@ -40,67 +107,13 @@ class ContractSummary(BaseModel):
     updated_at: datetime
 
 
-# Background task
-
-# Background task: extract text → run LLM → save results
-async def process_contract(contract_id: str, file_path: str, db: Session):
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
-    if not contract:
-        return
-
-    try:
-        # Update status to processing
-        contract.status = ContractStatus.PROCESSING
-        db.commit()
-
-        # Extract text from PDF/txt
-        logger.info(f"Extracting text from {file_path}")
-        raw_text = extract_text_from_file(file_path)
-        
-        if not raw_text or len(raw_text.strip()) < 50:
-            raise ValueError("Could not extract meaningful text from the file")
-
-        contract.raw_text = raw_text
-        db.commit()
-
-        # Run LLM extraction
-        logger.info(f"Running LLM extraction for contract {contract_id}")
-        billing_config = await extract_billing_config(raw_text)
-
-        # Save results
-        contract.billing_config = billing_config
-        contract.status = ContractStatus.COMPLETED
-        db.commit()
-
-        # Write initial extraction audit log
-        audit = AuditLog(
-            contract_id=contract_id,
-            field_name="billing_config",
-            old_value=None,
-            new_value={"extracted": True, "fields": list(billing_config.keys())},
-            action="extracted",
-            reason="Automatic LLM extraction completed",
-        )
-        db.add(audit)
-        db.commit()
-
-        logger.info(f"Contract {contract_id} processed successfully")
-
-    except Exception as e:
-        logger.error(f"Failed to process contract {contract_id}: {e}")
-        contract.status = ContractStatus.FAILED
-        contract.error_message = str(e)
-        db.commit()
-
-
 # Endpoints
 
 # Upload a contract PDF or text file for parsing
 @router.post("/upload")
 async def upload_contract(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # Validate file type
     allowed_types = {"application/pdf", "text/plain"}
@@ -110,18 +123,15 @@ async def upload_contract(
     if file_ext not in allowed_extensions:
         raise HTTPException(400, f"File type not supported. Use PDF or plain text.")
 
-    # Read file with size limit
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(400, f"File too large. Maximum size is 10MB.")
-
-    # Save to disk
+    # Stream to disk in chunks, hashing as we go and stopping as soon as the limit is passed
     file_id = str(uuid.uuid4())
     saved_filename = f"{file_id}{file_ext}"
     file_path = UPLOAD_DIR / saved_filename
-    
-    with open(file_path, "wb") as f:
-        f.write(content)
+
+    try:
+        saved = await save_upload(file, file_path, MAX_FILE_SIZE)
+    except UploadTooLarge:
+        raise HTTPException(413, f"File too large. Maximum size is 10MB.")
 
     # Create DB record
     contract = Contract(
@@ -129,28 +139,38 @@ async def upload_contract(
         filename=saved_filename,
         original_filename=file.filename,
         file_path=str(file_path),
+        file_sha256=saved.sha256,
         status=ContractStatus.PENDING,
     )
     db.add(contract)
-    db.commit()
-    db.refresh(contract)
+    await db.flush()
 
-    # Queue background processing
-    background_tasks.add_task(process_contract, file_id, str(file_path), db)
+    # Queue processing in the same transaction so a committed contract always has a job
+    enqueue_contract(db, file_id)
+    await db.commit()
 
     return {"contract_id": file_id, "status": "processing"}
 
 
-# List all contracts with pagination
+# List contracts newest first, keyset-paginated on (created_at, id).
+# total comes from the maintained status counters unless exact=true.
 @router.get("")
-def list_contracts(
-    skip: int = Query(0, ge=0),
+async def list_contracts(
+    cursor: Optional[str] = Query(None),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    status: Optional[ContractStatus] = Query(None),
+    exact: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    contracts = db.query(Contract).order_by(Contract.created_at.desc()).offset(skip).limit(limit).all()
-    total = db.query(Contract).count()
-    
+    stmt = select(Contract).options(load_only(*SUMMARY_COLUMNS))
+    if status:
+        stmt = stmt.where(Contract.status == status)
+    try:
+        stmt = apply_keyset(stmt, Contract.created_at, Contract.id, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(400, str(e))
+    contracts, next_cursor = await fetch_page(db, stmt, limit)
+
     return {
         "contracts": [
             {
@@ -162,115 +182,347 @@ def list_contracts(
             }
             for c in contracts
         ],
-        "total": total,
-        "skip": skip,
+        "total": await get_contract_total(db, status, exact=exact),
+        "total_exact": exact,
+        "next_cursor": next_cursor,
         "limit": limit,
     }
 
 
-# Get a contract with its billing config and audit log
+# Stream the billing configs of every extracted contract matching the filters,
+# oldest first, as NDJSON (one export record per line) or as one CSV with
+# contract_id and filename columns. Declared before /{contract_id} so "export"
+# is not taken for an id. Only completed contracts by default: a contract still
+# processing may hold a partial config saved field by field, exported only
+# when asked for with status=processing.
+@router.get("/export")
+async def export_contracts(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    status: ContractStatus = Query(ContractStatus.COMPLETED),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+):
+    stmt = select(Contract.id, Contract.original_filename, Contract.billing_config).where(
+        Contract.billing_config.isnot(None), Contract.status == status,
+    )
+    if since:
+        stmt = stmt.where(Contract.created_at >= since)
+    if until:
+        stmt = stmt.where(Contract.created_at < until)
+    stmt = stmt.order_by(Contract.created_at, Contract.id)
+
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    return StreamingResponse(
+        _export_stream(stmt, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=contracts_{stamp}_billing.{format}"},
+    )
+
+
+# Reads through a server-side cursor on its own session (the request's session
+# is closed before the body streams), holding one batch of rows at a time.
+# Each batch's audit rows are bulk-inserted in the same transaction, which
+# commits once the last row is sent; an export cut off mid-stream is not audited.
+async def _export_stream(stmt, format: str):
+    if format == "csv":
+        yield bulk_csv_header()
+    exported = 0
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for batch in result.partitions():
+            lines, audit_rows = [], []
+            for contract_id, filename, billing_config in batch:
+                if format == "ndjson":
+                    lines.append(export_ndjson_line(billing_config, str(contract_id), filename))
+                else:
+                    lines.append(export_csv_lines(billing_config, str(contract_id), filename))
+                audit_rows.append({
+                    "contract_id": contract_id,
+                    "field_name": "billing_config",
+                    "old_value": None,
+                    "new_value": {"exported_format": format, "bulk": True},
+                    "action": "exported",
+                })
+            await db.execute(insert(AuditLog), audit_rows)
+            exported += len(audit_rows)
+            yield "".join(lines)
+        await db.commit()
+    logger.info(f"Bulk export streamed {exported} contracts as {format}")
+
+
+# Get a contract with its billing config and audit log.
+# ?fields= limits the response (and the columns loaded) to a comma-separated subset
+# of CONTRACT_FIELDS; the audit log is paginated with audit_cursor/audit_limit.
 @router.get("/{contract_id}")
-def get_contract(contract_id: str, db: Session = Depends(get_db)):
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+async def get_contract(
+    contract_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None),
+    audit_cursor: Optional[str] = Query(None),
+    audit_limit: int = Query(AUDIT_PAGE_SIZE, ge=1, le=MAX_AUDIT_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    requested = _parse_fields(fields)
+
+    # Answer conditional requests from the version columns alone
+    version = (await db.execute(
+        select(Contract.updated_at, Contract.status, Contract.version).where(Contract.id == contract_id)
+    )).first()
+    if not version:
+        raise HTTPException(404, "Contract not found")
+    latest_audit = None
+    if "audit_log" in requested:
+        latest_audit = await db.scalar(
+            select(func.max(AuditLog.created_at)).where(AuditLog.contract_id == contract_id)
+        )
+    etag = _etag(contract_id, version.version, version.updated_at, version.status.value, latest_audit,
+                 ",".join(requested), audit_cursor, audit_limit)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    columns = [FIELD_COLUMNS[f] for f in requested if f in FIELD_COLUMNS]
+    contract = await db.scalar(
+        select(Contract).options(load_only(Contract.id, *columns)).where(Contract.id == contract_id)
+    )
     if not contract:
         raise HTTPException(404, "Contract not found")
 
-    audit_logs = db.query(AuditLog).filter(
-        AuditLog.contract_id == contract_id
-    ).order_by(AuditLog.created_at.desc()).all()
+    result = {"id": str(contract.id)}
+    for field in requested:
+        if field == "audit_log":
+            result["audit_log"], result["audit_next_cursor"] = await _audit_page(
+                db, contract_id, audit_cursor, audit_limit
+            )
+        else:
+            value = getattr(contract, FIELD_COLUMNS[field].key)
+            result[field] = value.value if field == "status" else value
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return result
+
 
+# Page through a contract's audit log, newest first
+@router.get("/{contract_id}/audit")
+async def get_contract_audit(
+    contract_id: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(AUDIT_PAGE_SIZE, ge=1, le=MAX_AUDIT_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if not await db.scalar(select(Contract.id).where(Contract.id == contract_id)):
+        raise HTTPException(404, "Contract not found")
+    entries, next_cursor = await _audit_page(db, contract_id, cursor, limit)
+    return {"audit_log": entries, "next_cursor": next_cursor}
+
+
+def _parse_fields(fields: Optional[str]) -> list[str]:
+    if not fields:
+        return list(CONTRACT_FIELDS)
+    requested = [f.strip() for f in fields.split(",") if f.strip() and f.strip() != "id"]
+    unknown = [f for f in requested if f not in CONTRACT_FIELDS]
+    if unknown:
+        raise HTTPException(400, f"Unknown fields: {', '.join(unknown)}. Choose from: {', '.join(CONTRACT_FIELDS)}")
+    return list(dict.fromkeys(requested))
+
+
+async def _audit_page(db: AsyncSession, contract_id: str, cursor: Optional[str],
+                      limit: int) -> tuple[list[dict], Optional[str]]:
+    stmt = select(AuditLog).where(AuditLog.contract_id == contract_id)
+    try:
+        logs, next_cursor = await fetch_page(db, apply_keyset(stmt, AuditLog.created_at, AuditLog.id, cursor), limit)
+    except InvalidCursor as e:
+        raise HTTPException(400, str(e))
+    return [_audit_entry(log) for log in logs], next_cursor
+
+
+def _audit_entry(log: AuditLog) -> dict:
     return {
-        "id": str(contract.id),
-        "filename": contract.original_filename,
-        "status": contract.status.value,
-        "raw_text": contract.raw_text,
-        "billing_config": contract.billing_config,
-        "error_message": contract.error_message,
-        "created_at": contract.created_at,
-        "updated_at": contract.updated_at,
-        "audit_log": [
-            {
-                "id": str(log.id),
-                "field_name": log.field_name,
-                "old_value": log.old_value,
-                "new_value": log.new_value,
-                "reason": log.reason,
-                "action": log.action,
-                "created_at": log.created_at,
-            }
-            for log in audit_logs
-        ],
+        "id": str(log.id),
+        "field_name": log.field_name,
+        "old_value": log.old_value,
+        "new_value": log.new_value,
+        "reason": log.reason,
+        "action": log.action,
+        "created_at": log.created_at,
     }
 
 
+# Exports add audit rows without touching the contract, so the latest audit
+# timestamp is part of the version alongside updated_at
+def _etag(*parts) -> str:
+    digest = hashlib.sha1("|".join("" if p is None else str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+# Stream processing progress as Server-Sent Events until the contract completes or fails
+@router.get("/{contract_id}/events")
+async def contract_events_stream(contract_id: str):
+    if await _load_status(contract_id) is None:
+        raise HTTPException(404, "Contract not found")
+    return StreamingResponse(
+        _event_stream(contract_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# The stream outlives the request's dependencies, so it opens short sessions of its own
+async def _event_stream(contract_id: str):
+    with contract_events.subscribe(contract_id) as queue:
+        # Subscribe before reading the status so no transition can slip in between
+        status = await _load_status(contract_id)
+        if status is None:
+            return
+        if status["status"] in TERMINAL_EVENTS:
+            yield await _final_event(contract_id, status["status"])
+            return
+        yield _sse("status", {"contract_id": contract_id, "event": "status", **status})
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=EVENT_STREAM_RECHECK_SECONDS)
+            except asyncio.TimeoutError:
+                status = await _load_status(contract_id)
+                if status is None:
+                    return
+                if status["status"] in TERMINAL_EVENTS:
+                    yield await _final_event(contract_id, status["status"])
+                    return
+                yield ": keepalive\n\n"
+                continue
+
+            if event["event"] in TERMINAL_EVENTS:
+                yield await _final_event(contract_id, event["event"], event)
+                return
+            # field_extracted events arrive with the billing config saved so far
+            yield _sse(event["event"], event)
+
+
+async def _load_status(contract_id: str) -> Optional[dict]:
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(
+            select(Contract.status, Contract.error_message).where(Contract.id == contract_id)
+        )).first()
+    return {"status": row.status.value, "error_message": row.error_message} if row else None
+
+
+# Terminal events carry the result, so clients never need to poll for it. Events
+# from the bus already hold it; it is only read here for a status found by polling.
+async def _final_event(contract_id: str, status: str, event: Optional[dict] = None) -> str:
+    payload = {**(event or {}), "contract_id": contract_id, "event": status, "status": status}
+    if "billing_config" not in payload:
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(
+                select(Contract.billing_config, Contract.error_message).where(Contract.id == contract_id)
+            )).first()
+        if row:
+            payload["billing_config"] = row.billing_config
+            payload["error_message"] = row.error_message
+    return _sse(status, payload)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 # Update a single extracted field and log the change
 @router.patch("/{contract_id}/fields")
-def update_field(
+async def update_field(
     contract_id: str,
     update: FieldUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+):
+    version = await _apply_field_edits(db, contract_id, [update], update.version)
+    return {"success": True, "field": update.field, "new_value": update.value, "version": version}
+
+
+# Update several fields at once, all or nothing. Paths may be any depth
+# (e.g. "usage_tiers.value.0.price_per_unit"); the whole batch is rejected
+# with 409 if the contract changed since the client read `version`.
+@router.patch("/{contract_id}/fields/batch")
+async def update_fields(
+    contract_id: str,
+    batch: BatchFieldUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    edits = [
+        FieldEdit(field=edit.field, value=edit.value, reason=edit.reason or batch.reason)
+        for edit in batch.edits
+    ]
+    version = await _apply_field_edits(db, contract_id, edits, batch.version)
+    return {"success": True, "fields": [edit.field for edit in edits], "version": version}
+
+
+# Apply edits to the billing config and audit them in one transaction: a single
+# version-checked UPDATE of the contract, one bulk audit insert and one commit.
+# Returns the contract's new version.
+async def _apply_field_edits(
+    db: AsyncSession,
+    contract_id: str,
+    edits: list,
+    expected_version: Optional[int],
+) -> int:
+    contract = await db.scalar(select(Contract).where(Contract.id == contract_id))
     if not contract:
         raise HTTPException(404, "Contract not found")
-    
+
     if contract.status != ContractStatus.COMPLETED:
         raise HTTPException(400, "Contract must be fully processed before editing")
 
-    billing_config = contract.billing_config or {}
-    
-    # Get old value for audit log
-    old_value = billing_config.get(update.field)
-    
-    # Navigate nested field path (e.g. "payment_schedule.value")
-    parts = update.field.split(".")
-    if len(parts) == 1:
-        if update.field not in billing_config:
-            raise HTTPException(400, f"Field '{update.field}' not found")
-        billing_config[update.field] = update.value
-    elif len(parts) == 2:
-        parent, child = parts
-        if parent not in billing_config:
-            raise HTTPException(400, f"Field '{parent}' not found")
-        billing_config[parent][child] = update.value
-    else:
-        raise HTTPException(400, "Nested field depth > 2 not supported")
-
-    # Mark manually reviewed
-    if len(parts) == 2 and parts[1] == "value" and parts[0] in billing_config:
-        billing_config[parts[0]]["manually_reviewed"] = True
+    if expected_version is not None and contract.version != expected_version:
+        raise HTTPException(409, f"Contract has changed since version {expected_version} "
+                                 f"(now version {contract.version}); reload and retry")
+
+    # Edit a copy so a rejected batch leaves the loaded config untouched
+    billing_config = copy.deepcopy(contract.billing_config or {})
+    audit_rows = []
+    for edit in edits:
+        try:
+            old_value = apply_field_edit(billing_config, edit.field, edit.value)
+        except FieldPathError as e:
+            raise HTTPException(400, str(e))
+        audit_rows.append({
+            "contract_id": contract.id,
+            "field_name": edit.field,
+            "old_value": old_value,
+            "new_value": edit.value,
+            "reason": edit.reason,
+            "action": "edited",
+        })
 
     contract.billing_config = billing_config
     contract.updated_at = datetime.utcnow()
-    
     # Force SQLAlchemy to detect JSON mutation
-    from sqlalchemy.orm.attributes import flag_modified
     flag_modified(contract, "billing_config")
-    db.commit()
-
-    # Audit log
-    audit = AuditLog(
-        contract_id=contract_id,
-        field_name=update.field,
-        old_value=old_value,
-        new_value=update.value,
-        reason=update.reason,
-        action="edited",
-    )
-    db.add(audit)
-    db.commit()
+    await db.run_sync(sync_billing_facts, contract.id, billing_config)
+    await db.execute(insert(AuditLog), audit_rows)
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(409, "Contract was modified by another request; reload and retry")
 
-    return {"success": True, "field": update.field, "new_value": update.value}
+    return contract.version
 
 
 # Export the billing config as JSON or CSV
 @router.get("/{contract_id}/export")
-def export_contract(
+async def export_contract(
     contract_id: str,
     format: str = Query("json", regex="^(json|csv)$"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    contract = await db.scalar(select(Contract).where(Contract.id == contract_id))
     if not contract:
         raise HTTPException(404, "Contract not found")
     
@@ -286,7 +538,7 @@ def export_contract(
         action="exported",
     )
     db.add(audit)
-    db.commit()
+    await db.commit()
 
     if format == "json":
         content = export_as_json(contract.billing_config, contract_id)
@@ -306,18 +558,21 @@ def export_contract(
  
 # Delete a contract and its associated data
 @router.delete("/{contract_id}")
-def delete_contract(contract_id: str, db: Session = Depends(get_db)):
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+async def delete_contract(contract_id: str, db: AsyncSession = Depends(get_async_db)):
+    contract = await db.scalar(select(Contract).where(Contract.id == contract_id))
     if not contract:
         raise HTTPException(404, "Contract not found")
     
     # Delete file from disk
-    if contract.file_path and os.path.exists(contract.file_path):
-        os.remove(contract.file_path)
+    if contract.file_path:
+        try:
+            await aiofiles.os.remove(contract.file_path)
+        except FileNotFoundError:
+            pass
     
     # Cascade deletes audit logs via ORM
-    db.query(AuditLog).filter(AuditLog.contract_id == contract_id).delete()
-    db.delete(contract)
-    db.commit()
+    await db.execute(delete(AuditLog).where(AuditLog.contract_id == contract_id))
+    await db.delete(contract)
+    await db.commit()
     
     return {"success": True}
\ No newline at end of file
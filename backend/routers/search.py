@@ -0,0 +1,30 @@
+# Full-text search API router
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db
+from models import ContractStatus
+from services.search_service import search_contracts
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 100
+
+
+# Contracts whose text matches q, most relevant first. Each result carries
+# highlighted snippets (<mark>…</mark>) prefixed with the [Page N] they come from.
+# On Postgres q accepts web search syntax: "exact phrase", or, -excluded.
+@router.get("")
+async def search(
+    q: str = Query(..., min_length=1, max_length=500),
+    status: Optional[ContractStatus] = Query(None),
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=MAX_SEARCH_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    results = await search_contracts(db, q, limit, offset, status.name if status else None)
+    return {"query": q, "results": results, "limit": limit, "offset": offset}
@@ -0,0 +1,16 @@
+# Dashboard stats API router
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db
+from services.stats_service import get_dashboard_stats
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+
+# Status counts, throughput, average processing time and low-confidence share,
+# read from maintained aggregates rather than the contracts table
+@router.get("")
+async def dashboard_stats(db: AsyncSession = Depends(get_async_db)):
+    return await get_dashboard_stats(db)
@@ -1,3 +1,7 @@
 from services.pdf_service import extract_text_from_file
 from services.llm_service import extract_billing_config
-from services.export_service import export_as_json, export_as_csv
\ No newline at end of file
+from services.export_service import (
+    export_as_json, export_as_csv, export_ndjson_line, export_csv_lines, bulk_csv_header
+)
+from services.job_queue import enqueue_contract
+from services.upload_service import save_upload, UploadTooLarge
@@ -0,0 +1,166 @@
+# Keeps the billing_facts tables (models/billing_facts.py) in step with
+# Contract.billing_config. Values are coerced leniently: anything that does not
+# parse as the column's type is stored as NULL rather than failing the write,
+# since the JSON stays the source of truth.
+
+import logging
+import re
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Optional
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from models import BillingFactUsageTier, BillingFacts, Contract
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 500
+# Largest magnitudes the columns can store; anything larger is an extraction error.
+# Numeric(18, 2) holds 16 integer digits, Numeric(18, 6) 12 and Integer 32 bits.
+MAX_AMOUNT = Decimal(10) ** 16
+MAX_UNIT_PRICE = Decimal(10) ** 12
+MAX_INT = Decimal(2) ** 31
+
+NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+NET_DAYS_RE = re.compile(r"\bnet\s*(\d+)\b", re.I)
+CURRENCY_CODE_RE = re.compile(r"[A-Za-z]{3}")
+
+
+def _section(billing_config: dict[str, Any], name: str) -> dict[str, Any]:
+    value = billing_config.get(name)
+    return value if isinstance(value, dict) else {}
+
+
+def _text(value: Any, max_length: int) -> Optional[str]:
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    text = str(value).strip()
+    return text[:max_length] or None
+
+
+def _decimal(value: Any, limit: Decimal = MAX_AMOUNT) -> Optional[Decimal]:
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        match = NUMBER_RE.search(value.replace(",", ""))
+        if not match:
+            return None
+        value = match.group()
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+    return number if number.is_finite() and abs(number) < limit else None
+
+
+# An ISO 4217-style three-letter code, upper-cased; anything else ("US Dollars", "$") is not a code
+def _currency(value: Any) -> Optional[str]:
+    text = _text(value, 10)
+    return text.upper() if text and CURRENCY_CODE_RE.fullmatch(text) else None
+
+
+def _int(value: Any) -> Optional[int]:
+    number = _decimal(value, MAX_INT)
+    return int(number) if number is not None else None
+
+
+def _bool(value: Any) -> Optional[bool]:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "yes"):
+        return True
+    if isinstance(value, str) and value.strip().lower() in ("false", "no"):
+        return False
+    return None
+
+
+def _date(value: Any) -> Optional[date]:
+    try:
+        return date.fromisoformat(str(value).strip()[:10]) if value else None
+    except ValueError:
+        return None
+
+
+# "Net 45" → 45, "Due on receipt" → 0, when due_days itself is missing
+def _due_days(schedule: dict[str, Any]) -> Optional[int]:
+    due_days = _int(schedule.get("due_days"))
+    if due_days is not None:
+        return due_days
+    terms = str(schedule.get("value") or "")
+    match = NET_DAYS_RE.search(terms)
+    if match:
+        return _int(match.group(1))
+    return 0 if "receipt" in terms.lower() else None
+
+
+# Typed column values for one contract, plus its usage tier rows
+def billing_facts_from_config(billing_config: dict[str, Any]) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    parties = _section(billing_config, "contract_parties")
+    value = _section(billing_config, "contract_value")
+    frequency = _text(_section(billing_config, "billing_frequency").get("value"), 20)
+
+    facts = {
+        "vendor": _text(_section(parties, "vendor").get("value"), 255),
+        "client": _text(_section(parties, "client").get("value"), 255),
+        "contract_value": _decimal(value.get("value")),
+        "currency": _currency(value.get("currency")),
+        "billing_frequency": frequency.lower() if frequency else None,
+        "due_days": _due_days(_section(billing_config, "payment_schedule")),
+        "auto_renews": _bool(_section(billing_config, "renewal_clause").get("auto_renews")),
+        "start_date": _date(_section(billing_config, "start_date").get("value")),
+        "end_date": _date(_section(billing_config, "end_date").get("value")),
+    }
+
+    tiers = []
+    for tier in _section(billing_config, "usage_tiers").get("value") or []:
+        if not isinstance(tier, dict):
+            continue
+        unit_type = _text(tier.get("unit_type"), 100)
+        tiers.append({
+            "position": len(tiers),
+            "tier_name": _text(tier.get("tier_name"), 255),
+            "unit_type": unit_type.lower() if unit_type else None,
+            "min_units": _decimal(tier.get("min_units")),
+            "max_units": _decimal(tier.get("max_units")),
+            "price_per_unit": _decimal(tier.get("price_per_unit"), MAX_UNIT_PRICE),
+            "flat_fee": _decimal(tier.get("flat_fee")),
+        })
+    return facts, tiers
+
+
+# Replace a contract's facts with those in billing_config. Runs in the caller's
+# transaction, so the facts commit together with the JSON they came from.
+# Async callers use AsyncSession.run_sync.
+def sync_billing_facts(db: Session, contract_id: Any, billing_config: Optional[dict[str, Any]]) -> None:
+    facts, tiers = billing_facts_from_config(billing_config or {})
+    db.execute(delete(BillingFactUsageTier).where(BillingFactUsageTier.contract_id == contract_id))
+    db.execute(delete(BillingFacts).where(BillingFacts.contract_id == contract_id))
+    db.execute(insert(BillingFacts).values(contract_id=contract_id, **facts))
+    if tiers:
+        db.execute(insert(BillingFactUsageTier), [{"contract_id": contract_id, **tier} for tier in tiers])
+
+
+# Build facts for extracted contracts that have none yet (contracts extracted
+# before the table existed). Returns the number of contracts filled in.
+def backfill_billing_facts(db: Session, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    filled = 0
+    while True:
+        rows = (
+            db.query(Contract.id, Contract.billing_config)
+            .outerjoin(BillingFacts, BillingFacts.contract_id == Contract.id)
+            .filter(Contract.billing_config.isnot(None), BillingFacts.contract_id.is_(None))
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        for row in rows:
+            sync_billing_facts(db, row.id, row.billing_config)
+        db.commit()
+        filled += len(rows)
+
+    if filled:
+        logger.info(f"Backfilled billing facts for {filled} contracts")
+    return filled
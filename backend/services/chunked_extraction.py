@@ -0,0 +1,147 @@
+# Map-reduce helpers for extracting long contracts
+# split_contract_text cuts a contract into prompt-sized chunks at page and
+# section boundaries; merge_extractions reconciles the per-chunk billing configs
+# into one, preferring confident answers whose source_text really is in the contract.
+
+import re
+from typing import Any, Optional
+
+PAGE_BREAK_RE = re.compile(r"\n+(?=\[Page \d+\])")
+SECTION_BREAK_RE = re.compile(
+    r"\n+(?=[ \t]*(?:\d+(?:\.\d+)*\.?[ \t]+[A-Z]|ARTICLE\b|SECTION\b|EXHIBIT\b|SCHEDULE\b|APPENDIX\b))"
+)
+PARAGRAPH_BREAK_RE = re.compile(r"\n[ \t]*\n")
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Fields whose list values are unioned across chunks instead of picked from one chunk
+LIST_FIELDS = {"usage_tiers", "special_terms"}
+# Keys that describe a field rather than carry its answer
+META_KEYS = {"confidence", "source_text", "manually_reviewed", "custom_description", "currency"}
+
+
+# Split text into chunks of at most max_chars, breaking at the coarsest boundary
+# that fits: pages, then numbered sections, then paragraphs, then a hard cut
+def split_contract_text(text: str, max_chars: int) -> list[str]:
+    units = _split_units(text, max_chars, [PAGE_BREAK_RE, SECTION_BREAK_RE, PARAGRAPH_BREAK_RE])
+
+    chunks, current = [], ""
+    for unit in units:
+        if current and len(current) + len(unit) + 2 > max_chars:
+            chunks.append(current)
+            current = unit
+        else:
+            current = f"{current}\n\n{unit}" if current else unit
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_units(text: str, max_chars: int, separators: list[re.Pattern]) -> list[str]:
+    text = text.strip()
+    if not text:
+        return []
+    if len(text) <= max_chars:
+        return [text]
+    if not separators:
+        return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+    units = []
+    for part in separators[0].split(text):
+        units.extend(_split_units(part, max_chars, separators[1:]))
+    return units
+
+
+# Combine per-chunk extractions (in document order) into a single billing config
+def merge_extractions(results: list[dict[str, Any]], contract_text: str) -> dict[str, Any]:
+    haystack = _normalize(contract_text)
+    merged: dict[str, Any] = {}
+
+    keys = []
+    for result in results:
+        keys.extend(k for k in result if k not in keys)
+
+    for key in keys:
+        candidates = [r[key] for r in results if r.get(key) is not None]
+        if key == "extraction_notes":
+            notes = [n for n in dict.fromkeys(candidates) if isinstance(n, str) and n.strip()]
+            merged[key] = " ".join(notes + [f"Merged from {len(results)} contract chunks."])
+        elif key == "contract_parties":
+            merged[key] = _merge_nested(candidates, haystack)
+        elif key in LIST_FIELDS:
+            merged[key] = _merge_list_field(candidates, haystack)
+        else:
+            merged[key] = _pick_best(candidates, haystack)
+    return merged
+
+
+def _merge_nested(candidates: list[Any], haystack: str) -> Optional[dict[str, Any]]:
+    dicts = [c for c in candidates if isinstance(c, dict)]
+    if not dicts:
+        return candidates[0] if candidates else None
+    subkeys = []
+    for d in dicts:
+        subkeys.extend(k for k in d if k not in subkeys)
+    return {k: _pick_best([d[k] for d in dicts if d.get(k) is not None], haystack) for k in subkeys}
+
+
+# The best candidate actually answers the field, quotes text that exists in the
+# contract, and is the most confident; earlier chunks win exact ties
+def _pick_best(candidates: list[Any], haystack: str) -> Any:
+    if not candidates:
+        return None
+    if not all(isinstance(c, dict) for c in candidates):
+        return candidates[0]
+    return max(
+        enumerate(candidates),
+        key=lambda ic: (
+            _has_answer(ic[1]),
+            _source_found(ic[1], haystack),
+            _confidence(ic[1]),
+            -ic[0],
+        ),
+    )[1]
+
+
+def _merge_list_field(candidates: list[Any], haystack: str) -> Optional[dict[str, Any]]:
+    fields = [c for c in candidates if isinstance(c, dict) and isinstance(c.get("value"), list)]
+    if not fields:
+        return _pick_best(candidates, haystack)
+
+    seen, values = set(), []
+    for field in fields:
+        for item in field["value"]:
+            fingerprint = repr(sorted(item.items())) if isinstance(item, dict) else repr(item)
+            if fingerprint not in seen:
+                seen.add(fingerprint)
+                values.append(item)
+
+    contributing = [f for f in fields if f["value"]] or fields
+    best = _pick_best(contributing, haystack)
+    sources = [f.get("source_text") for f in contributing if f.get("source_text")]
+    return {
+        **best,
+        "value": values,
+        "confidence": min(_confidence(f) for f in contributing),
+        "source_text": " ... ".join(dict.fromkeys(sources)) or None,
+    }
+
+
+def _has_answer(field: dict[str, Any]) -> bool:
+    answers = [v for k, v in field.items() if k not in META_KEYS]
+    return any(v not in (None, [], "") for v in answers)
+
+
+def _source_found(field: dict[str, Any], haystack: str) -> bool:
+    source = field.get("source_text")
+    return bool(source) and _normalize(source) in haystack
+
+
+def _confidence(field: dict[str, Any]) -> float:
+    try:
+        return float(field.get("confidence") or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _normalize(text: str) -> str:
+    return WHITESPACE_RE.sub(" ", text).strip().lower()
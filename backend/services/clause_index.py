@@ -0,0 +1,185 @@
+# Billing-clause relevance index
+# A local pre-pass that splits a contract into clauses, scores each clause with
+# BM25 against a lexicon built from the extraction schema, and keeps only the
+# best-scoring clauses that fit a token budget. Indemnification, IP and
+# governing-law boilerplate never reaches the LLM.
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+PAGE_MARKER_RE = re.compile(r"^\[Page (\d+)\]\s*$")
+CLAUSE_BREAK_RE = re.compile(
+    r"\n[ \t]*\n|\n(?=[ \t]*(?:\d+(?:\.\d+)*\.?[ \t]+[A-Z]|ARTICLE\b|SECTION\b|EXHIBIT\b|SCHEDULE\b))"
+)
+TOKEN_RE = re.compile(r"[a-z]+|\d+(?:\.\d+)?%?|\$")
+MONEY_RE = re.compile(r"\$\s?\d|\b\d[\d,]*(?:\.\d+)?\s?(?:USD|EUR|GBP)\b")
+PERCENT_RE = re.compile(r"\d(?:\.\d+)?\s?%|\bper ?cent\b", re.I)
+DATE_RE = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}\b|\b(?:January|February|March|April|May|June|July|August|September|"
+    r"October|November|December)\s+\d{1,2},?\s+\d{4}\b"
+)
+
+# Terms that signal each field of EXTRACTION_SYSTEM_PROMPT. They are stemmed
+# the same way as clause tokens when QUERY_TERMS is built below.
+BILLING_LEXICON = {
+    "contract_parties": ["vendor", "customer", "client", "provider", "supplier", "between", "corporation", "inc", "llc"],
+    "contract_value": ["fee", "fees", "total", "price", "amount", "usd", "$", "value", "subscription", "charges"],
+    "billing_frequency": ["invoiced", "billed", "billing", "monthly", "quarterly", "annually", "yearly", "advance", "arrears"],
+    "payment_schedule": ["payment", "payable", "due", "net", "days", "receipt", "pay", "wire", "ach"],
+    "usage_tiers": ["tier", "seats", "units", "usage", "volume", "per", "calls", "api", "overage", "users", "licenses"],
+    "renewal_clause": ["renew", "renewal", "automatically", "successive", "cancellation", "notice", "non-renewal", "term", "termination"],
+    "late_fee": ["late", "interest", "overdue", "penalty", "grace", "accrue", "rate"],
+    "start_date": ["effective", "commence", "start", "begin", "date"],
+    "end_date": ["expires", "end", "through", "until", "initial"],
+    "special_terms": ["discount", "credit", "lock", "increase", "implementation", "setup", "one-time", "minimum", "commitment"],
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Clauses with money amounts, percentages or dates are almost always billing terms
+PATTERN_BONUS = 2.0
+# Leading clauses up to this many characters (title, parties, effective date) are always kept
+PREAMBLE_CHARS = 600
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class Clause:
+    index: int
+    page: Optional[int]
+    text: str
+    score: float = 0.0
+
+
+@dataclass
+class ClauseSelection:
+    text: str
+    clauses_total: int
+    clauses_kept: int
+    original_tokens: int
+    selected_tokens: int
+
+    @property
+    def reduction(self) -> float:
+        if not self.original_tokens:
+            return 0.0
+        return 1 - self.selected_tokens / self.original_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+# Split contract text into clauses (paragraphs and numbered sections),
+# remembering which page each clause starts on (None for text without page markers)
+def segment_clauses(text: str) -> list[Clause]:
+    clauses = []
+    page = None
+    for block in CLAUSE_BREAK_RE.split(text):
+        lines = []
+        for line in block.strip().splitlines():
+            marker = PAGE_MARKER_RE.match(line.strip())
+            if marker:
+                page = int(marker.group(1))
+            else:
+                lines.append(line)
+        body = "\n".join(lines).strip()
+        if body:
+            clauses.append(Clause(index=len(clauses), page=page, text=body))
+    return clauses
+
+
+# Score every clause with BM25 against the billing lexicon
+def score_clauses(clauses: list[Clause]) -> list[Clause]:
+    if not clauses:
+        return clauses
+    docs = [[_stem(t) for t in TOKEN_RE.findall(c.text.lower())] for c in clauses]
+    avg_len = sum(len(d) for d in docs) / len(docs) or 1.0
+    doc_freq = Counter(term for doc in docs for term in set(doc))
+
+    for clause, doc in zip(clauses, docs):
+        counts = Counter(doc)
+        score = 0.0
+        for term, weight in QUERY_TERMS.items():
+            tf = counts.get(term)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(docs) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            score += weight * idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * len(doc) / avg_len))
+        for pattern in (MONEY_RE, PERCENT_RE, DATE_RE):
+            if pattern.search(clause.text):
+                score += PATTERN_BONUS
+        clause.score = score
+    return clauses
+
+
+# Keep the highest-scoring clauses that fit token_budget and return them in
+# document order with their page markers. The preamble (parties and effective
+# date) is always kept.
+def select_relevant_clauses(text: str, token_budget: int) -> ClauseSelection:
+    clauses = score_clauses(segment_clauses(text))
+    original_tokens = estimate_tokens(text)
+
+    preamble, preamble_chars = [], 0
+    for clause in clauses:
+        if preamble_chars >= PREAMBLE_CHARS:
+            break
+        preamble.append(clause)
+        preamble_chars += len(clause.text)
+
+    ranked = sorted(clauses[len(preamble):], key=lambda c: (-c.score, c.index))
+    kept, used = [], 0
+    for clause in preamble + ranked:
+        cost = estimate_tokens(clause.text) + 4
+        if clause.index >= len(preamble) and clause.score <= 0:
+            break
+        if used + cost > token_budget:
+            continue
+        kept.append(clause)
+        used += cost
+
+    parts, last_page, last_index = [], None, None
+    for clause in sorted(kept, key=lambda c: c.index):
+        if last_index is not None and clause.index != last_index + 1:
+            parts.append("[...]")
+        if clause.page is not None and clause.page != last_page:
+            parts.append(f"[Page {clause.page}]")
+            last_page = clause.page
+        parts.append(clause.text)
+        last_index = clause.index
+    selected = "\n\n".join(parts)
+
+    return ClauseSelection(
+        text=selected,
+        clauses_total=len(clauses),
+        clauses_kept=len(kept),
+        original_tokens=original_tokens,
+        selected_tokens=estimate_tokens(selected),
+    )
+
+
+def _query_terms() -> Counter:
+    terms = Counter()
+    for words in BILLING_LEXICON.values():
+        for word in words:
+            terms.update(_stem(t) for t in TOKEN_RE.findall(word))
+    return terms
+
+
+# Minimal suffix stripper, enough to match "invoiced"/"invoices"/"invoice" and
+# "renews"/"renewal" to the lexicon stems above
+def _stem(token: str) -> str:
+    for suffix in ("ations", "ation", "ingly", "ing", "ally", "ed", "es", "al", "s", "e"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[: -len(suffix)]
+            break
+    if token.endswith("y") and len(token) > 4:
+        token = token[:-1] + "i"
+    return token
+
+
+QUERY_TERMS = _query_terms()
@@ -0,0 +1,164 @@
+# Contract progress events
+# process_contract publishes a small event at every stage. On Postgres the event
+# is sent with NOTIFY, so API processes (which LISTEN) see events from the
+# separate worker process; otherwise events only reach subscribers in the same
+# process. ContractEventBus fans each event out to every open SSE stream for
+# that contract, so one database notification serves any number of tabs.
+# Events that carry the billing config (streamed fields and terminal events)
+# are too big for a NOTIFY payload, so the bus reads the config once per event,
+# before fanning out, rather than once per subscriber.
+
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from sqlalchemy import select, text
+
+from database import async_engine, engine
+from models import Contract
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "contract_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_ERROR_CHARS = 500
+SUBSCRIBER_QUEUE_SIZE = 100
+LISTEN_RECONNECT_SECONDS = 5.0
+
+TERMINAL_EVENTS = {"completed", "failed"}
+# Events delivered with the contract's billing_config and error_message as saved so far
+RESULT_EVENTS = TERMINAL_EVENTS | {"field_extracted"}
+
+
+def _uses_postgres() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+class ContractEventBus:
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def subscribe(self, contract_id: str):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[contract_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[contract_id].discard(queue)
+            if not self._subscribers[contract_id]:
+                del self._subscribers[contract_id]
+
+    # Attach the saved result to events that carry it, once, then fan out
+    async def deliver(self, event: dict[str, Any]):
+        contract_id = event.get("contract_id")
+        if not self._subscribers.get(contract_id):
+            return
+        if event.get("event") in RESULT_EVENTS:
+            try:
+                async with async_engine.connect() as conn:
+                    row = (await conn.execute(
+                        select(Contract.billing_config, Contract.error_message)
+                        .where(Contract.id == uuid.UUID(contract_id))
+                    )).first()
+            except Exception as e:
+                logger.warning(f"Failed to load the result of contract {contract_id} for its event: {e}")
+                row = None
+            if row:
+                event = {**event, "billing_config": row.billing_config, "error_message": row.error_message}
+        self.dispatch(event)
+
+    def dispatch(self, event: dict[str, Any]):
+        for queue in list(self._subscribers.get(event.get("contract_id"), ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client only loses intermediate progress; streams re-check status on their own
+                logger.warning(f"Dropping event for slow subscriber of contract {event.get('contract_id')}")
+
+    async def publish(self, contract_id: str, event: str, **data: Any):
+        payload = {"contract_id": str(contract_id), "event": event, **data}
+        if "error" in payload and payload["error"]:
+            payload["error"] = str(payload["error"])[:MAX_ERROR_CHARS]
+
+        if not _uses_postgres():
+            await self.deliver(payload)
+            return
+        try:
+            async with async_engine.connect() as conn:
+                await conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": EVENTS_CHANNEL, "payload": json.dumps(payload, default=str)},
+                )
+                await conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to publish {event} event for contract {contract_id}: {e}")
+
+    # LISTEN on the events channel and dispatch notifications to local subscribers
+    async def start(self):
+        if _uses_postgres() and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    async def _listen(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            raw = None
+            try:
+                # Connecting blocks, so it happens off the event loop
+                raw = await asyncio.to_thread(_listen_connection)
+                dbapi_conn = raw.driver_connection
+                logger.info(f"Listening for contract events on '{EVENTS_CHANNEL}'")
+
+                readable = asyncio.Event()
+                loop.add_reader(dbapi_conn.fileno(), readable.set)
+                try:
+                    while True:
+                        await readable.wait()
+                        readable.clear()
+                        dbapi_conn.poll()
+                        while dbapi_conn.notifies:
+                            notify = dbapi_conn.notifies.pop(0)
+                            try:
+                                event = json.loads(notify.payload)
+                            except ValueError:
+                                logger.warning(f"Ignoring malformed contract event: {notify.payload[:200]}")
+                                continue
+                            await self.deliver(event)
+                finally:
+                    loop.remove_reader(dbapi_conn.fileno())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Contract event listener failed: {e}; reconnecting in {LISTEN_RECONNECT_SECONDS}s")
+                await asyncio.sleep(LISTEN_RECONNECT_SECONDS)
+            finally:
+                if raw is not None:
+                    raw.invalidate()
+
+
+# A pooled psycopg2 connection in autocommit mode, LISTENing on the events channel
+def _listen_connection():
+    raw = engine.raw_connection()
+    try:
+        dbapi_conn = raw.driver_connection
+        dbapi_conn.set_session(autocommit=True)
+        with dbapi_conn.cursor() as cur:
+            cur.execute(f"LISTEN {EVENTS_CHANNEL}")
+    except Exception:
+        raw.invalidate()
+        raise
+    return raw
+
+
+contract_events = ContractEventBus()
@@ -1,12 +1,27 @@
 # Export service to convert billing config to JSON or CSV
+# Each format is built from per-contract records/rows, so the bulk export can
+# stream contracts one at a time instead of building the payload in memory.
 
 import csv
 import io
 import json
-from typing import Any
+from typing import Any, Iterator
 
-#Return a clean JSON export (values only)
-def export_as_json(billing_config: dict[str, Any], contract_id: str) -> str:
+CSV_EXPORT_HEADER = ["field", "value", "confidence", "source_text"]
+BULK_CSV_EXPORT_HEADER = ["contract_id", "filename", *CSV_EXPORT_HEADER]
+
+
+# csv.writer target that hands back each formatted line instead of buffering it
+class _LineEcho:
+    def write(self, line: str) -> str:
+        return line
+
+
+_csv_line = csv.writer(_LineEcho()).writerow
+
+
+#Clean export record for one contract (values only)
+def export_record(billing_config: dict[str, Any], contract_id: str) -> dict[str, Any]:
     clean = {"contract_id": contract_id, "billing_configuration": {}}
 
     for field, data in billing_config.items():
@@ -22,37 +37,60 @@ def export_as_json(billing_config: dict[str, Any], contract_id: str) -> str:
         else:
             clean["billing_configuration"][field] = data
 
-    return json.dumps(clean, indent=2, default=str)
+    return clean
 
 
-#Return CSV with field, values and confidence columns
-def export_as_csv(billing_config: dict[str, Any], contract_id: str) -> str:
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["field", "value", "confidence", "source_text"])
-
-    def flatten(prefix: str, data: Any):
+#CSV rows (field, value, confidence, source_text) for one billing config
+def export_csv_rows(billing_config: dict[str, Any]) -> Iterator[list[Any]]:
+    def flatten(prefix: str, data: Any) -> Iterator[list[Any]]:
         if isinstance(data, dict):
             if "value" in data or "confidence" in data:
                 value = data.get("value")
                 #Serialize nested values
                 if isinstance(value, (list, dict)):
                     value = json.dumps(value)
-                writer.writerow([
+                yield [
                     prefix,
                     value,
                     data.get("confidence", ""),
                     data.get("source_text", "")
-                ])
+                ]
             else:
                 for key, val in data.items():
-                    flatten(f"{prefix}.{key}", val)
+                    yield from flatten(f"{prefix}.{key}", val)
         elif isinstance(data, list):
-            writer.writerow([prefix, json.dumps(data), "", ""])
+            yield [prefix, json.dumps(data), "", ""]
         else:
-           writer.writerow([prefix, data, "", ""])
+            yield [prefix, data, "", ""]
 
     for field, value in billing_config.items():
-        flatten(field, value)
+        yield from flatten(field, value)
+
 
+#Return a clean JSON export (values only)
+def export_as_json(billing_config: dict[str, Any], contract_id: str) -> str:
+    return json.dumps(export_record(billing_config, contract_id), indent=2, default=str)
+
+
+#Return CSV with field, values and confidence columns
+def export_as_csv(billing_config: dict[str, Any], contract_id: str) -> str:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(CSV_EXPORT_HEADER)
+    writer.writerows(export_csv_rows(billing_config))
     return output.getvalue() 
+
+
+#One NDJSON line for a contract in a bulk export
+def export_ndjson_line(billing_config: dict[str, Any], contract_id: str, filename: str) -> str:
+    record = {**export_record(billing_config, contract_id), "filename": filename}
+    return json.dumps(record, default=str) + "\n"
+
+
+#Bulk CSV lines for a contract: its rows prefixed with contract_id and filename
+def export_csv_lines(billing_config: dict[str, Any], contract_id: str, filename: str) -> str:
+    return "".join(_csv_line([contract_id, filename, *row]) for row in export_csv_rows(billing_config))
+
+
+def bulk_csv_header() -> str:
+    return _csv_line(BULK_CSV_EXPORT_HEADER)
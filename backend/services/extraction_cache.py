@@ -0,0 +1,163 @@
+# Content-addressed cache for LLM extractions
+# Re-uploads and countersigned copies of the same contract produce the same
+# normalized text, so their billing config is served from the database instead
+# of paying for another extract_billing_config round trip.
+
+import copy
+import hashlib
+import logging
+import os
+import re
+import time
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models import ExtractionCacheEntry
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+EXTRACTION_CACHE_TTL_DAYS = int(os.getenv("EXTRACTION_CACHE_TTL_DAYS", "30"))
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "10000"))
+EXTRACTION_CACHE_EVICT_INTERVAL_SECONDS = float(os.getenv("EXTRACTION_CACHE_EVICT_INTERVAL_SECONDS", "300"))
+
+PAGE_MARKER_RE = re.compile(r"^\[Page \d+\]$", re.M)
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+# Normalize text so layout-only differences (page breaks, spacing, unicode
+# compatibility forms) between copies of the same contract hash identically
+def normalize_contract_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text)
+    text = PAGE_MARKER_RE.sub(" ", text)
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def hash_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(text: str, prompt_version: str, model: str) -> str:
+    digest = hashlib.sha256()
+    for part in (prompt_version, model, normalize_contract_text(text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+# Return a copy of the cached billing config, or None on a miss or expired entry.
+# A hit refreshes last_accessed_at, which drives LRU eviction.
+def get_cached_extraction(db: Session, key: str) -> Optional[dict[str, Any]]:
+    now = datetime.utcnow()
+    entry = db.query(ExtractionCacheEntry).filter(
+        ExtractionCacheEntry.cache_key == key,
+        ExtractionCacheEntry.expires_at > now,
+    ).first()
+    if not entry:
+        return None
+
+    entry.last_accessed_at = now
+    entry.hit_count += 1
+    billing_config = copy.deepcopy(entry.billing_config)
+    db.commit()
+    return billing_config
+
+
+# Best effort: the upsert runs in a savepoint, so a failed cache write is logged
+# and rolled back on its own and never fails the contract being processed.
+# Concurrent stores of the same text resolve through ON CONFLICT instead of
+# racing a SELECT-then-INSERT. The caller commits.
+def store_extraction(db: Session, key: str, prompt_version: str, model: str,
+                     billing_config: dict[str, Any]) -> bool:
+    table = ExtractionCacheEntry.__table__
+    now = datetime.utcnow()
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(table).values(
+        cache_key=key,
+        prompt_version=prompt_version,
+        model=model,
+        billing_config=billing_config,
+        hit_count=0,
+        created_at=now,
+        last_accessed_at=now,
+        expires_at=now + timedelta(days=EXTRACTION_CACHE_TTL_DAYS),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.cache_key],
+        set_={name: stmt.excluded[name] for name in (
+            "prompt_version", "model", "billing_config", "last_accessed_at", "expires_at",
+        )},
+    )
+    try:
+        with db.begin_nested():
+            db.execute(stmt)
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not store extraction cache entry {key[:12]}: {e}")
+        return False
+
+    _maybe_evict(db)
+    return True
+
+
+_last_eviction = 0.0
+
+
+# Evict at most once per EXTRACTION_CACHE_EVICT_INTERVAL_SECONDS per process, not after every store
+def _maybe_evict(db: Session):
+    global _last_eviction
+    if time.monotonic() - _last_eviction < EXTRACTION_CACHE_EVICT_INTERVAL_SECONDS:
+        return
+    _last_eviction = time.monotonic()
+    try:
+        with db.begin_nested():
+            evict_extraction_cache(db, commit=False)
+    except SQLAlchemyError as e:
+        logger.warning(f"Extraction cache eviction failed: {e}")
+
+
+# Entry count; on Postgres the planner's estimate, which is close enough for a size cap
+def _approximate_entry_count(db: Session) -> int:
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = db.execute(text(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"
+        ), {"table": ExtractionCacheEntry.__tablename__}).scalar()
+        # -1 (or NULL) until the table has been vacuumed or analyzed once
+        if estimate is not None and estimate >= 0:
+            return estimate
+    return db.query(ExtractionCacheEntry).count()
+
+
+# Drop expired entries, then the least recently used ones beyond the size cap
+def evict_extraction_cache(db: Session, max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES, commit: bool = True) -> int:
+    removed = db.query(ExtractionCacheEntry).filter(
+        ExtractionCacheEntry.expires_at <= datetime.utcnow()
+    ).delete(synchronize_session=False)
+
+    overflow = _approximate_entry_count(db) - max_entries
+    if overflow > 0:
+        stale_keys = (
+            db.query(ExtractionCacheEntry.cache_key)
+            .order_by(ExtractionCacheEntry.last_accessed_at)
+            .limit(overflow)
+            .scalar_subquery()
+        )
+        removed += db.query(ExtractionCacheEntry).filter(
+            ExtractionCacheEntry.cache_key.in_(stale_keys)
+        ).delete(synchronize_session=False)
+
+    if commit:
+        db.commit()
+    if removed:
+        logger.info(f"Evicted {removed} extraction cache entries")
+    return removed
@@ -0,0 +1,133 @@
+# Process pool for CPU-heavy text extraction
+# pdfplumber parses are synchronous and can take tens of seconds, so they run in
+# a bounded ProcessPoolExecutor instead of on the event loop. A parse that runs
+# past its timeout has its worker processes killed and the pool is rebuilt.
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from services.pdf_service import (
+    PARALLEL_PAGE_THRESHOLD, extract_text_from_file, extract_pdf_page_range, count_pdf_pages,
+    plan_page_ranges, merge_page_ranges, needs_fallback, is_pdf, extract_pdf_fallback_text,
+    extract_pdf_fallback_range, PageRangeError,
+)
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_POOL_SIZE = int(os.getenv("EXTRACTION_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "120"))
+# Recycle worker processes periodically so leaks in the PDF libraries stay bounded
+EXTRACTION_MAX_TASKS_PER_CHILD = int(os.getenv("EXTRACTION_MAX_TASKS_PER_CHILD", "50"))
+
+
+class ExtractionTimeout(Exception):
+    pass
+
+
+class ExtractionExecutor:
+    def __init__(
+        self,
+        max_workers: int = EXTRACTION_POOL_SIZE,
+        timeout: float = EXTRACTION_TIMEOUT_SECONDS,
+        max_tasks_per_child: int = EXTRACTION_MAX_TASKS_PER_CHILD,
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Bumped every time the pool is killed, so jobs caught in the blast
+        # radius of someone else's timeout know to retry on the fresh pool
+        self._generation = 0
+        # Only as many jobs as there are processes may be submitted at once:
+        # the rest wait here, so the per-job timeout measures parse time, not queueing
+        self._slots = asyncio.Semaphore(max_workers)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+        return self._pool
+
+    def _kill_pool(self):
+        pool, self._pool = self._pool, None
+        self._generation += 1
+        if pool is None:
+            return
+        for process in list((pool._processes or {}).values()):
+            if process.is_alive():
+                process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    # Run fn(*args) in the pool with a timeout, retrying once if the pool was
+    # torn down underneath us because another job timed out
+    async def run(self, fn, *args, timeout: Optional[float] = None):
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+
+        async with self._slots:
+            for attempt in range(2):
+                generation = self._generation
+                future = loop.run_in_executor(self._get_pool(), fn, *args)
+                try:
+                    return await asyncio.wait_for(future, timeout)
+                except asyncio.TimeoutError:
+                    logger.error(f"{fn.__name__}{args} exceeded {timeout}s, killing extraction workers")
+                    self._kill_pool()
+                    raise ExtractionTimeout(f"Text extraction timed out after {timeout:.0f}s")
+                except BrokenProcessPool:
+                    if generation != self._generation and attempt == 0:
+                        logger.info(f"Extraction pool was restarted, retrying {fn.__name__}{args}")
+                        continue
+                    self._kill_pool()
+                    raise
+
+    # Large PDFs are split into page ranges parsed in parallel across the pool;
+    # everything else is a single task. Output matches extract_text_from_file.
+    async def extract_text(self, file_path: str, timeout: Optional[float] = None) -> str:
+        if not is_pdf(file_path):
+            return await self.run(extract_text_from_file, file_path, timeout=timeout)
+
+        page_count = await asyncio.to_thread(count_pdf_pages, file_path)
+        if page_count < PARALLEL_PAGE_THRESHOLD or self.max_workers < 2:
+            return await self.run(extract_text_from_file, file_path, timeout=timeout)
+
+        ranges = plan_page_ranges(page_count)
+        logger.info(f"Extracting {page_count} pages of {file_path} as {len(ranges)} parallel ranges")
+        parts = await asyncio.gather(*(
+            self._extract_range(file_path, start, end, timeout) for start, end in ranges
+        ))
+        text = merge_page_ranges(parts)
+
+        if needs_fallback(text):
+            text = await self.run(extract_pdf_fallback_text, file_path, timeout=timeout)
+        return text
+
+    # One page range. A range the primary engine fails on is retried once and then
+    # read with the fallback engine, so one bad range never silently drops its pages.
+    async def _extract_range(self, file_path: str, start: int, end: int, timeout: Optional[float]) -> str:
+        for attempt in range(2):
+            try:
+                return await self.run(extract_pdf_page_range, file_path, start, end, timeout=timeout)
+            except PageRangeError as e:
+                logger.warning(f"Page range extraction failed (attempt {attempt + 1} of 2): {e}")
+
+        text = await self.run(extract_pdf_fallback_range, file_path, start, end, timeout=timeout)
+        if not text.strip():
+            logger.error(f"Lost pages {start + 1}-{end} of {file_path}: no engine could extract them")
+        return text
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+extraction_executor = ExtractionExecutor()
@@ -0,0 +1,60 @@
+# Applies reviewer edits to a billing config by dotted path
+# Paths address dict keys and list indexes at any depth, e.g.
+# "payment_schedule.value", "contract_parties.vendor.value" or
+# "usage_tiers.value.0.price_per_unit". Top-level fields must already exist;
+# below that a missing dict key is created, so an edit can add an attribute
+# (e.g. "late_fee.flat_amount") the extraction left out.
+
+from typing import Any
+
+
+class FieldPathError(ValueError):
+    pass
+
+
+def _child(node: Any, part: str, path: str) -> Any:
+    if isinstance(node, dict):
+        if part not in node:
+            raise FieldPathError(f"Field '{path}' not found")
+        return node[part]
+    if isinstance(node, list):
+        try:
+            return node[int(part)]
+        except (ValueError, IndexError):
+            raise FieldPathError(f"Field '{path}' not found: '{part}' is not an index of the list")
+    raise FieldPathError(f"Field '{path}' not found: cannot descend into a {type(node).__name__}")
+
+
+# Set the value at path in billing_config (in place) and return the old value.
+# Editing a field's "value", or anything inside it, marks that field as
+# manually reviewed.
+def apply_field_edit(billing_config: dict[str, Any], path: str, value: Any) -> Any:
+    parts = path.split(".")
+    if not all(parts):
+        raise FieldPathError(f"Invalid field path '{path}'")
+
+    node: Any = billing_config
+    reviewed = None
+    for part in parts[:-1]:
+        if isinstance(node, dict) and part == "value":
+            reviewed = node
+        node = _child(node, part, path)
+
+    last = parts[-1]
+    if isinstance(node, dict):
+        if len(parts) == 1 and last not in node:
+            raise FieldPathError(f"Field '{path}' not found")
+        if last == "value":
+            reviewed = node
+        old_value = node.get(last)
+        node[last] = value
+    elif isinstance(node, list):
+        _child(node, last, path)
+        old_value = node[int(last)]
+        node[int(last)] = value
+    else:
+        raise FieldPathError(f"Field '{path}' not found: cannot descend into a {type(node).__name__}")
+
+    if reviewed is not None:
+        reviewed["manually_reviewed"] = True
+    return old_value
@@ -0,0 +1,88 @@
+# Incremental parser for a streamed JSON object
+# Fed the model's output chunk by chunk, it reports each top-level field of the
+# object as soon as that field's value is complete, without waiting for (or
+# needing) the closing brace. Anything before the first "{" (such as a markdown
+# fence) is skipped. A member that does not parse is not reported; its key is
+# listed in `dropped`, so the caller knows the streamed fields are incomplete.
+
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class TopLevelFieldParser:
+    def __init__(self):
+        self.fields: dict[str, Any] = {}
+        # True once the object's closing brace has been seen
+        self.complete = False
+        # Keys (as written by the model) of members whose text was not valid JSON
+        self.dropped: list[str] = []
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._object_start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        # Offsets into _buffer of the current top-level member (key start) and of its value
+        self._member_start = None
+        self._value_start = None
+
+    # The object's text seen so far, from its opening brace
+    def object_text(self) -> str:
+        return self._buffer[self._object_start:self._pos] if self._started else ""
+
+    # Add a chunk of output; returns the (name, value) fields it completed, in order
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+        while self._pos < len(buffer) and not self.complete:
+            char = buffer[self._pos]
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._object_start = self._pos
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_member(self._pos, completed)
+                    self.complete = True
+            elif char == ":" and self._depth == 1 and self._value_start is None:
+                self._value_start = self._pos + 1
+            elif char == "," and self._depth == 1:
+                self._finish_member(self._pos, completed)
+                self._member_start = self._pos + 1
+            self._pos += 1
+        return completed
+
+    def _finish_member(self, end: int, completed: list[tuple[str, Any]]):
+        if self._value_start is None:
+            return
+        key_text = self._buffer[self._member_start:self._value_start - 1]
+        value_text = self._buffer[self._value_start:end]
+        self._value_start = None
+        try:
+            name = json.loads(key_text)
+            value = json.loads(value_text)
+        except ValueError:
+            logger.warning(f"Skipping a streamed field that is not valid JSON: {key_text.strip()[:40]}")
+            self.dropped.append(key_text.strip()[:40])
+            return
+        self.fields[name] = value
+        completed.append((name, value))
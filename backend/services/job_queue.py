@@ -0,0 +1,177 @@
+# Durable job queue backed by the processing_jobs table
+# Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED so any number of
+# worker processes can poll the same table without handing out a job twice.
+
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import Contract, ContractStatus, ProcessingJob, JobStatus
+from services.stats_service import record_contract_outcome
+
+logger = logging.getLogger(__name__)
+
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "120"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BACKOFF_SECONDS = int(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "30"))
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: str
+    contract_id: str
+    attempts: int
+
+
+# Add a processing job for a contract. The caller commits, so the contract row
+# and its job land in the same transaction.
+def enqueue_contract(db: Session, contract_id: str) -> ProcessingJob:
+    job = ProcessingJob(
+        contract_id=contract_id,
+        status=JobStatus.QUEUED,
+        max_attempts=JOB_MAX_ATTEMPTS,
+    )
+    db.add(job)
+    return job
+
+
+# Claim the oldest runnable job and take a lease on it.
+# Returns None when the queue is empty.
+def claim_job(db: Session, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> Optional[ClaimedJob]:
+    now = datetime.utcnow()
+    job = (
+        db.query(ProcessingJob)
+        .filter(ProcessingJob.status == JobStatus.QUEUED, ProcessingJob.run_after <= now)
+        .order_by(ProcessingJob.run_after)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if not job:
+        db.rollback()
+        return None
+
+    job.status = JobStatus.RUNNING
+    job.attempts += 1
+    job.locked_by = worker_id
+    job.heartbeat_at = now
+    job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+    db.commit()
+
+    return ClaimedJob(id=str(job.id), contract_id=str(job.contract_id), attempts=job.attempts)
+
+
+# Extend the lease on a running job. Returns False if the worker no longer owns it
+# (the lease expired and the reaper handed the job to someone else).
+def heartbeat_job(db: Session, job_id: str, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> bool:
+    now = datetime.utcnow()
+    updated = (
+        db.query(ProcessingJob)
+        .filter(
+            ProcessingJob.id == job_id,
+            ProcessingJob.locked_by == worker_id,
+            ProcessingJob.status == JobStatus.RUNNING,
+        )
+        .update(
+            {
+                ProcessingJob.heartbeat_at: now,
+                ProcessingJob.lease_expires_at: now + timedelta(seconds=lease_seconds),
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return updated == 1
+
+
+# Mark a job as finished. Contract-level failures are recorded on the contract
+# by process_contract itself, so the job only tracks whether it ran to the end.
+# Like fail_job, a no-op unless the job is still running under this worker's lease.
+def complete_job(db: Session, job_id: str, worker_id: str) -> None:
+    db.query(ProcessingJob).filter(
+        ProcessingJob.id == job_id,
+        ProcessingJob.locked_by == worker_id,
+        ProcessingJob.status == JobStatus.RUNNING,
+    ).update(
+        {
+            ProcessingJob.status: JobStatus.SUCCEEDED,
+            ProcessingJob.lease_expires_at: None,
+            ProcessingJob.updated_at: datetime.utcnow(),
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+# Record a crashed attempt. The job is retried with a linear backoff until
+# max_attempts is reached, after which the job and its contract are failed.
+def fail_job(db: Session, job_id: str, worker_id: str, error: str) -> None:
+    job = (
+        db.query(ProcessingJob)
+        .filter(
+            ProcessingJob.id == job_id,
+            ProcessingJob.locked_by == worker_id,
+            ProcessingJob.status == JobStatus.RUNNING,
+        )
+        .with_for_update()
+        .first()
+    )
+    if not job:
+        db.rollback()
+        return
+    _retry_or_fail(db, job, error)
+    db.commit()
+
+
+# Requeue running jobs whose lease has expired (worker crashed, pod restarted,
+# or the event loop hung). Returns the number of jobs recovered.
+def requeue_expired_jobs(db: Session) -> int:
+    now = datetime.utcnow()
+    jobs = (
+        db.query(ProcessingJob)
+        .filter(ProcessingJob.status == JobStatus.RUNNING, ProcessingJob.lease_expires_at < now)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for job in jobs:
+        logger.warning(f"Job {job.id} lease held by {job.locked_by} expired, recovering")
+        _retry_or_fail(db, job, "Lease expired before the job finished")
+    db.commit()
+    return len(jobs)
+
+
+# Queued and running jobs (the queue depth), served from the claim index.
+# Finished jobs are left out: their history grows without bound.
+def count_open_jobs(db: Session) -> dict[JobStatus, int]:
+    rows = (
+        db.query(ProcessingJob.status, func.count())
+        .filter(ProcessingJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]))
+        .group_by(ProcessingJob.status)
+        .all()
+    )
+    counts = {JobStatus.QUEUED: 0, JobStatus.RUNNING: 0}
+    counts.update(dict(rows))
+    return counts
+
+
+def _retry_or_fail(db: Session, job: ProcessingJob, error: str) -> None:
+    job.last_error = error
+    job.locked_by = None
+    job.lease_expires_at = None
+
+    if job.attempts < job.max_attempts:
+        job.status = JobStatus.QUEUED
+        job.run_after = datetime.utcnow() + timedelta(seconds=JOB_RETRY_BACKOFF_SECONDS * job.attempts)
+        return
+
+    job.status = JobStatus.FAILED
+    contract = db.query(Contract).filter(Contract.id == job.contract_id).first()
+    if contract and contract.status != ContractStatus.COMPLETED:
+        if contract.status != ContractStatus.FAILED:
+            record_contract_outcome(db, ContractStatus.FAILED)
+        contract.status = ContractStatus.FAILED
+        contract.error_message = f"Processing gave up after {job.attempts} attempts: {error}"
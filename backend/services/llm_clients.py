@@ -0,0 +1,228 @@
+# Shared LLM provider clients with per-provider rate limiting and retries
+# One AsyncOpenAI / AsyncAnthropic client per provider per process, each on a
+# tuned httpx connection pool, so calls reuse warm TLS connections. Every call
+# goes through a ProviderGate (concurrency semaphore + request and token
+# buckets) and is retried with jittered exponential backoff on 429/5xx.
+#
+# Limits are per process: with N workers, set them to the provider limit / N.
+
+import asyncio
+import logging
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+import anthropic
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "10"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    requests_per_minute: int
+    tokens_per_minute: int
+    max_concurrency: int
+
+    @classmethod
+    def from_env(cls, prefix: str, rpm: int, tpm: int, concurrency: int) -> "ProviderLimits":
+        return cls(
+            requests_per_minute=int(os.getenv(f"{prefix}_RPM", str(rpm))),
+            tokens_per_minute=int(os.getenv(f"{prefix}_TPM", str(tpm))),
+            max_concurrency=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", str(concurrency))),
+        )
+
+
+PROVIDER_LIMITS = {
+    "openai": ProviderLimits.from_env("OPENAI", rpm=500, tpm=300_000, concurrency=16),
+    "anthropic": ProviderLimits.from_env("ANTHROPIC", rpm=50, tpm=80_000, concurrency=8),
+}
+
+
+# Continuously refilling bucket; acquire() waits until enough capacity is available
+class TokenBucket:
+    def __init__(self, capacity_per_minute: int):
+        self.capacity = float(capacity_per_minute)
+        self.rate = capacity_per_minute / 60.0
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._available = min(self.capacity, self._available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        # A single request larger than the whole bucket would wait forever
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._available >= amount:
+                    self._available -= amount
+                    return
+                await asyncio.sleep((amount - self._available) / self.rate)
+
+
+class ProviderGate:
+    def __init__(self, name: str, limits: ProviderLimits):
+        self.name = name
+        self.limits = limits
+        self._semaphore = asyncio.Semaphore(limits.max_concurrency)
+        self._requests = TokenBucket(limits.requests_per_minute)
+        self._tokens = TokenBucket(limits.tokens_per_minute)
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int):
+        async with self._semaphore:
+            await self._requests.acquire(1)
+            await self._tokens.acquire(estimated_tokens)
+            yield
+
+
+# Clients, semaphores and buckets are bound to the event loop that created
+# them, so all of it is rebuilt if it is requested from a different loop
+_gates: dict[str, ProviderGate] = {}
+_clients: dict[str, Any] = {}
+_bound_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _check_loop():
+    global _bound_loop
+    loop = asyncio.get_running_loop()
+    if loop is not _bound_loop:
+        _gates.clear()
+        _clients.clear()
+        _bound_loop = loop
+
+
+def get_gate(provider: str) -> ProviderGate:
+    _check_loop()
+    if provider not in _gates:
+        _gates[provider] = ProviderGate(provider, PROVIDER_LIMITS[provider])
+    return _gates[provider]
+
+
+def _http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS),
+    )
+
+
+def _get_client(provider: str, factory: Callable[[httpx.AsyncClient], Any]):
+    _check_loop()
+    if provider not in _clients:
+        _clients[provider] = factory(_http_client())
+    return _clients[provider]
+
+
+# Environment variable holding each provider's API key
+PROVIDER_API_KEYS = {"openai": "OPENAI_API_KEY", "anthropic": "ANTHROPIC_API_KEY"}
+
+
+# A provider has no API key. A configuration problem, not a provider outage.
+class ProviderNotConfigured(ValueError):
+    pass
+
+
+def provider_configured(name: str) -> bool:
+    return bool(os.getenv(PROVIDER_API_KEYS[name]))
+
+
+def _api_key(name: str) -> str:
+    api_key = os.getenv(PROVIDER_API_KEYS[name])
+    if not api_key:
+        raise ProviderNotConfigured(f"{PROVIDER_API_KEYS[name]} not set")
+    return api_key
+
+
+def get_openai_client() -> AsyncOpenAI:
+    api_key = _api_key("openai")
+    return _get_client("openai", lambda http_client: AsyncOpenAI(
+        api_key=api_key,
+        base_url=os.getenv("OPENAI_BASE_URL") or None,
+        max_retries=0,  # retries are handled by call_provider
+        http_client=http_client,
+    ))
+
+
+def get_anthropic_client() -> anthropic.AsyncAnthropic:
+    api_key = _api_key("anthropic")
+    return _get_client("anthropic", lambda http_client: anthropic.AsyncAnthropic(
+        api_key=api_key,
+        base_url=os.getenv("ANTHROPIC_BASE_URL") or None,
+        max_retries=0,
+        http_client=http_client,
+    ))
+
+
+async def aclose_llm_clients():
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close LLM client: {e}")
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (openai.APIConnectionError, anthropic.APIConnectionError)):
+        return True
+    if isinstance(exc, (openai.APIStatusError, anthropic.APIStatusError)):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return False
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+# Full-jitter exponential backoff, never shorter than the provider's Retry-After
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    delay = random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, LLM_BACKOFF_MAX_SECONDS))
+    return delay
+
+
+# Run one provider call inside its gate, retrying 429s, 5xx and connection errors.
+# The gate slot is released while backing off so other calls can proceed.
+async def call_provider(provider: str, estimated_tokens: int, make_call: Callable[[], Awaitable[Any]]):
+    gate = get_gate(provider)
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            async with gate.slot(estimated_tokens):
+                return await make_call()
+        except Exception as e:
+            if attempt >= LLM_MAX_RETRIES or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, _retry_after(e))
+            logger.warning(f"{provider} call failed ({e.__class__.__name__}), retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
@@ -3,16 +3,89 @@
 # Returns structured billing config with per-field confidence scores
 
 
+import asyncio
+import copy
 import json
 import logging
 import os
-from typing import Any, Optional
+import time
+from typing import Any, Awaitable, Callable, Optional
 
-from openai import AsyncOpenAI
-import anthropic
+from services.chunked_extraction import split_contract_text, merge_extractions
+from services.clause_index import estimate_tokens, select_relevant_clauses
+from services.incremental_json import TopLevelFieldParser
+from services.llm_clients import (
+    ProviderNotConfigured, call_provider, get_anthropic_client, get_openai_client, provider_configured,
+)
+from services.metrics import (
+    LLM_CALL_SECONDS, LLM_FALLBACKS, LLM_HEDGES, LLM_TIME_TO_FIRST_FIELD, record_llm_usage, span,
+)
+from services.provider_health import get_provider_health
+from services.rule_extractor import (
+    EMPTY_CONFIG, RuleExtraction, apply_rule_fields, extract_rule_fields, rules_only_config,
+)
 
 logger = logging.getLogger(__name__)
 
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-opus-4-6")
+
+# Bump whenever the prompts or the shape of the returned config change, so
+# cached extractions made with the old prompt are no longer served
+PROMPT_VERSION = "2024-06-v1"
+
+# "truncate": keep the first 12k and last 2k characters of long contracts (one call)
+# "chunked": split long contracts at page/section boundaries, extract every chunk
+#            concurrently and merge the results by confidence and source_text
+EXTRACTION_STRATEGY = os.getenv("EXTRACTION_STRATEGY", "truncate")
+MAX_SINGLE_PASS_CHARS = 14000
+LLM_CHUNK_CHARS = int(os.getenv("LLM_CHUNK_CHARS", "12000"))
+LLM_CHUNK_FAN_OUT = int(os.getenv("LLM_CHUNK_FAN_OUT", "4"))
+
+# When set, contracts estimated above this many tokens are reduced to their
+# most billing-relevant clauses before prompting (see clause_index.py); 0 disables
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "0"))
+
+MAX_OUTPUT_TOKENS = 4000
+
+# Stream completions and report each top-level field as soon as it has parsed
+# (see incremental_json.py); "false" waits for the whole response
+LLM_STREAMING = os.getenv("LLM_STREAMING", "true").lower() == "true"
+# Starts the extraction_notes of a config assembled from a cut-off response
+PARTIAL_EXTRACTION_NOTE = "The model's response was cut off"
+
+# Let the providers serve the static EXTRACTION_SYSTEM_PROMPT prefix from their prompt
+# cache: Anthropic gets a cache_control breakpoint on the system block, OpenAI a
+# stable prompt_cache_key (it caches matching prefixes automatically). Both only
+# cache prefixes of at least 1024 tokens.
+LLM_PROMPT_CACHING = os.getenv("LLM_PROMPT_CACHING", "true").lower() == "true"
+
+# Receives (field name, value) for each top-level field as it completes
+FieldCallback = Callable[[str, Any], None]
+
+
+# A provider's response ended or broke off before the JSON object was complete,
+# after these fields had parsed
+class PartialExtractionError(RuntimeError):
+    def __init__(self, provider: str, fields: dict[str, Any]):
+        super().__init__(f"{provider} response was cut off after {len(fields)} fields")
+        self.fields = fields
+
+# Rule-based pre-extraction (rule_extractor.py) for terms stated verbatim:
+# "off": LLM only
+# "hints": the rules' findings are given to the LLM as candidates to verify
+# "prefer": rule fields at or above RULE_ACCEPT_CONFIDENCE are final; the LLM is
+#           told to skip them and fills in the rest
+# "only": no LLM call; fields the rules cannot find come back empty for review
+RULE_EXTRACTION_MODE = os.getenv("RULE_EXTRACTION_MODE", "off")
+RULE_ACCEPT_CONFIDENCE = float(os.getenv("RULE_ACCEPT_CONFIDENCE", "0.9"))
+
+# "sequential": try the next provider only after the previous one failed
+# "hedged": also start the next provider once the current one runs past its
+#           observed p95 latency; the first valid result wins, the rest are cancelled
+LLM_ROUTING_MODE = os.getenv("LLM_ROUTING_MODE", "sequential")
+PROVIDER_ORDER = ("openai", "anthropic")
+
 EXTRACTION_SYSTEM_PROMPT = """You are an expert legal and financial analyst specializing in B2B SaaS contracts.
 Your job is to extract billing and payment terms from contract text with high accuracy.
 
@@ -109,79 +182,473 @@ USER_PROMPT_TEMPLATE = """Please extract all billing and payment terms from this
 
 Extract every billing-related term you can find. If the contract is truncated, note this in extraction_notes."""
 
-# Main extraction function. Tries OpenAI first, then optionally falls back to Anthropic.
-# Returns the structured billing config dict.
-async def extract_billing_config(contract_text: str) -> dict[str, Any]:
-    # Truncate very long contracts (keep first 12k + last 2k chars for context)
-    if len(contract_text) > 14000:
-        contract_text = contract_text[:12000] + "\n...[middle section omitted]...\n" + contract_text[-2000:]
+RULE_ACCEPTED_TEMPLATE = """
 
-    try:
-        result = await _extract_with_openai(contract_text)
-        if result:
-            return result
-    except Exception as e:
-        logger.warning(f"OpenAI extraction failed: {e}, trying Anthropic fallback")
+These fields were already extracted from the contract by exact pattern matching. Return null for them
+instead of extracting them again: {fields}"""
+
+RULE_HINTS_TEMPLATE = """
+
+Pattern matching found these candidate values. Verify each one against the contract text and correct it
+if the contract says otherwise:
+{hints}"""
+
+CHUNK_PROMPT_TEMPLATE = """Please extract all billing and payment terms from this excerpt of a longer contract.
+This is part {part} of {total}; other parts are processed separately and merged afterwards.
+
+---CONTRACT EXCERPT START---
+{contract_text}
+---CONTRACT EXCERPT END---
+
+Only report terms stated in this excerpt. Use null with confidence 0.0 for anything this excerpt does not mention,
+even if you expect it elsewhere in the contract."""
+
+# Main extraction function. Tries OpenAI first, then falls back to (or, in hedged mode, races) Anthropic.
+# Returns the structured billing config dict. With streaming, on_field is called
+# for every field as soon as it has parsed (single-pass extractions only: chunk
+# results are not final until merged).
+async def extract_billing_config(contract_text: str, on_field: Optional[FieldCallback] = None) -> dict[str, Any]:
+    rules, accepted = None, {}
+    if RULE_EXTRACTION_MODE != "off":
+        # Run on the full text, before clause selection or truncation drops anything
+        rules = extract_rule_fields(contract_text)
+        if RULE_EXTRACTION_MODE == "only":
+            return rules_only_config(rules)
+        if RULE_EXTRACTION_MODE == "prefer":
+            accepted = rules.confident(RULE_ACCEPT_CONFIDENCE)
+        logger.info(f"Rules found {len(rules.fields)} fields, {len(accepted)} accepted without the LLM")
+
+    if PROMPT_TOKEN_BUDGET and estimate_tokens(contract_text) > PROMPT_TOKEN_BUDGET:
+        selection = select_relevant_clauses(contract_text, PROMPT_TOKEN_BUDGET)
+        logger.info(
+            f"Clause index kept {selection.clauses_kept}/{selection.clauses_total} clauses: "
+            f"prompt text reduced from ~{selection.original_tokens} to ~{selection.selected_tokens} tokens "
+            f"({selection.reduction:.0%} smaller)"
+        )
+        contract_text = (
+            "[Only the billing-relevant clauses of this contract are included; omitted sections are marked [...]]\n\n"
+            + selection.text
+        )
+
+    if len(contract_text) > MAX_SINGLE_PASS_CHARS and EXTRACTION_STRATEGY == "chunked":
+        config = await _extract_chunked(contract_text)
+    else:
+        # Truncate very long contracts (keep first 12k + last 2k chars for context)
+        if len(contract_text) > MAX_SINGLE_PASS_CHARS:
+            contract_text = contract_text[:12000] + "\n...[middle section omitted]...\n" + contract_text[-2000:]
+        user_prompt = USER_PROMPT_TEMPLATE.format(contract_text=contract_text)
+        if rules:
+            user_prompt += _rule_prompt(rules, accepted)
 
+        # Accepted rule fields replace whatever the LLM says for them, so those are not reported
+        def report_field(name: str, value: Any):
+            if name not in accepted:
+                on_field(name, value)
+
+        config = await _extract_with_fallback(user_prompt, report_field if on_field else None)
+
+    return apply_rule_fields(config, accepted) if accepted else config
+
+
+# Prompt addendum listing accepted rule fields (to skip) and the other rule
+# findings (to verify)
+def _rule_prompt(rules: RuleExtraction, accepted: dict[str, dict[str, Any]]) -> str:
+    prompt = ""
+    if accepted:
+        prompt += RULE_ACCEPTED_TEMPLATE.format(fields=", ".join(accepted))
+    hints = {name: f for name, f in rules.fields.items() if name not in accepted}
+    if hints:
+        prompt += RULE_HINTS_TEMPLATE.format(hints="\n".join(
+            f"- {name}: {json.dumps({k: v for k, v in f.items() if k not in ('confidence', 'source_text')})} "
+            f"(from: \"{f['source_text']}\")"
+            for name, f in hints.items()
+        ))
+    return prompt
+
+
+# Map-reduce extraction for long contracts: every chunk is extracted with at most
+# LLM_CHUNK_FAN_OUT calls in flight, then the per-chunk configs are merged
+async def _extract_chunked(contract_text: str) -> dict[str, Any]:
+    chunks = split_contract_text(contract_text, LLM_CHUNK_CHARS)
+    logger.info(f"Extracting {len(contract_text)} chars as {len(chunks)} chunks")
+    fan_out = asyncio.Semaphore(LLM_CHUNK_FAN_OUT)
+
+    async def extract_chunk(index: int, chunk: str) -> dict[str, Any]:
+        async with fan_out:
+            prompt = CHUNK_PROMPT_TEMPLATE.format(part=index + 1, total=len(chunks), contract_text=chunk)
+            return await _extract_with_fallback(prompt)
+
+    outcomes = await asyncio.gather(
+        *(extract_chunk(i, chunk) for i, chunk in enumerate(chunks)),
+        return_exceptions=True,
+    )
+    results = [o for o in outcomes if isinstance(o, dict)]
+    failed = len(outcomes) - len(results)
+    if not results:
+        raise RuntimeError(f"All {len(chunks)} contract chunks failed to extract") from outcomes[0]
+
+    merged = merge_extractions(results, contract_text)
+    if failed:
+        logger.warning(f"{failed} of {len(chunks)} chunks failed; merged the rest")
+        merged["extraction_notes"] = (
+            f"{merged.get('extraction_notes') or ''} {failed} of {len(chunks)} contract chunks "
+            f"could not be extracted; terms from those sections may be missing."
+        ).strip()
+    return merged
+
+
+async def _extract_with_fallback(user_prompt: str, on_field: Optional[FieldCallback] = None) -> dict[str, Any]:
+    if not any(provider_configured(name) for name in PROVIDER_ORDER):
+        raise ProviderNotConfigured("No LLM provider API key is set")
+    if LLM_ROUTING_MODE == "hedged":
+        return await _extract_hedged(user_prompt, on_field)
+
+    last_error: Optional[Exception] = None
+    last_provider = None
+    partial: Optional[PartialExtractionError] = None
+    streams = _StreamOwner(on_field)
+    for name in PROVIDER_ORDER:
+        if not _routable(name):
+            continue
+        if last_error is not None and not isinstance(last_error, ProviderNotConfigured):
+            LLM_FALLBACKS.labels(provider=last_provider).inc()
+        try:
+            return await _call_tracked(name, user_prompt, streams.for_provider(name))
+        except Exception as e:
+            logger.warning(f"{name} extraction failed: {e}")
+            last_error, last_provider = e, name
+            partial = _most_complete(partial, e)
+    if partial:
+        return _partial_config(partial.fields)
+    raise RuntimeError("All LLM providers failed to extract contract data") from last_error
+
+
+# Race providers in order: each one gets a head start of the previous provider's
+# p95 latency (or none, if the previous one already failed)
+async def _extract_hedged(user_prompt: str, on_field: Optional[FieldCallback] = None) -> dict[str, Any]:
+    waiting = list(PROVIDER_ORDER)
+    pending: dict[asyncio.Task, str] = {}
+    newest, launched_at = None, 0.0
+    last_error: Optional[BaseException] = None
+    partial: Optional[PartialExtractionError] = None
+    streams = _StreamOwner(on_field)
+
+    def launch() -> bool:
+        nonlocal newest, launched_at
+        while waiting:
+            name = waiting.pop(0)
+            if _routable(name):
+                pending[asyncio.create_task(_call_tracked(name, user_prompt, streams.for_provider(name)))] = name
+                newest, launched_at = name, time.monotonic()
+                return True
+        return False
+
+    launch()
     try:
-        result = await _extract_with_anthropic(contract_text)
-        if result:
-            return result
-    except Exception as e:
-        logger.error(f"Anthropic fallback also failed: {e}")
-        raise RuntimeError("Both LLM providers failed to extract contract data") from e
+        while pending:
+            timeout = None
+            if waiting:
+                timeout = max(0.0, get_provider_health(newest).hedge_delay() - (time.monotonic() - launched_at))
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                logger.info(f"{newest} slower than its p95 latency, hedging with the next provider")
+                if launch():
+                    LLM_HEDGES.labels(provider=newest).inc()
+                continue
+
+            for task in done:
+                name = pending.pop(task)
+                if task.exception() is None:
+                    if pending:
+                        logger.info(f"{name} won the hedged request")
+                    return task.result()
+                logger.warning(f"{name} extraction failed: {task.exception()}")
+                last_error = task.exception()
+                partial = _most_complete(partial, last_error)
+
+            if not pending:
+                launch()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    if partial:
+        return _partial_config(partial.fields)
+    raise RuntimeError("All LLM providers failed to extract contract data") from last_error
 
-    raise RuntimeError("No LLM provider returned valid results")
+
+# Streamed fields are only reported from the first provider to stream one, so
+# fields saved before the result is final never mix two providers' answers (a
+# hedged race, or a fallback after a cut-off response). The final result replaces them.
+class _StreamOwner:
+    def __init__(self, on_field: Optional[FieldCallback]):
+        self.on_field = on_field
+        self.owner: Optional[str] = None
+
+    def for_provider(self, name: str) -> Optional[FieldCallback]:
+        if self.on_field is None:
+            return None
+
+        def report(field: str, value: Any):
+            if self.owner is None:
+                self.owner = name
+            if self.owner == name:
+                self.on_field(field, value)
+        return report
+
+
+def _most_complete(current: Optional[PartialExtractionError], error: BaseException) -> Optional[PartialExtractionError]:
+    if isinstance(error, PartialExtractionError) and (current is None or len(error.fields) > len(current.fields)):
+        return error
+    return current
+
+
+# When every provider was cut off, keep the fields that parsed cleanly; the rest
+# come back empty with confidence 0 so they are flagged for review
+def _partial_config(fields: dict[str, Any]) -> dict[str, Any]:
+    logger.warning(f"All providers were cut off; keeping {len(fields)} fields that parsed")
+    config = copy.deepcopy(EMPTY_CONFIG)
+    config.update(fields)
+    missing = [name for name in EMPTY_CONFIG if name != "extraction_notes" and name not in fields]
+    note = PARTIAL_EXTRACTION_NOTE + (
+        f"; not extracted and needing review: {', '.join(missing)}." if missing else "."
+    )
+    config["extraction_notes"] = f"{note} {fields['extraction_notes']}" if fields.get("extraction_notes") else note
+    return config
+
+
+# Whether a config was assembled from a cut-off response (and should not be cached)
+def is_partial_extraction(config: dict[str, Any]) -> bool:
+    return str(config.get("extraction_notes") or "").startswith(PARTIAL_EXTRACTION_NOTE)
+
+
+# Providers without an API key are skipped outright; providers whose circuit is
+# open are skipped until their reset period ends
+def _routable(name: str) -> bool:
+    if not provider_configured(name):
+        logger.debug(f"Skipping {name}: no API key configured")
+        return False
+    if get_provider_health(name).breaker.allow():
+        return True
+    logger.warning(f"Skipping {name}: circuit open")
+    return False
+
+
+# Call one provider and record latency and outcome for hedging and its circuit breaker
+async def _call_tracked(name: str, user_prompt: str, on_field: Optional[FieldCallback] = None) -> dict[str, Any]:
+    health = get_provider_health(name)
+    extract = _extract_with_openai if name == "openai" else _extract_with_anthropic
+    model = OPENAI_MODEL if name == "openai" else ANTHROPIC_MODEL
+    started = time.monotonic()
+    with span("llm_call", provider=name, model=model):
+        try:
+            result = await extract(user_prompt, on_field)
+            if not result:
+                raise ValueError(f"{name} returned an empty result")
+        except asyncio.CancelledError:
+            health.record_cancelled()
+            LLM_CALL_SECONDS.labels(provider=name, model=model, outcome="cancelled").observe(time.monotonic() - started)
+            raise
+        except ProviderNotConfigured:
+            # A missing key says nothing about the provider's health
+            health.breaker.record_cancelled()
+            raise
+        except Exception:
+            health.record_failure()
+            LLM_CALL_SECONDS.labels(provider=name, model=model, outcome="error").observe(time.monotonic() - started)
+            raise
+    health.record_success(time.monotonic() - started)
+    LLM_CALL_SECONDS.labels(provider=name, model=model, outcome="ok").observe(time.monotonic() - started)
+    return result
+
+
+# Identifies the provider chain, long-document strategy, prompt budget and rule
+# mode used by extract_billing_config, for cache keys
+def extraction_model_id() -> str:
+    model_id = (
+        f"openai:{OPENAI_MODEL}|anthropic:{ANTHROPIC_MODEL}"
+        f"|strategy:{EXTRACTION_STRATEGY}|budget:{PROMPT_TOKEN_BUDGET}"
+    )
+    # Left out when off so extractions cached before rule modes existed stay valid
+    if RULE_EXTRACTION_MODE == "prefer":
+        model_id += f"|rules:prefer@{RULE_ACCEPT_CONFIDENCE}"
+    elif RULE_EXTRACTION_MODE != "off":
+        model_id += f"|rules:{RULE_EXTRACTION_MODE}"
+    return model_id
+
+
+# Tokens reserved against a provider's tokens-per-minute bucket for one call
+def _estimated_call_tokens(user_prompt: str) -> int:
+    return estimate_tokens(EXTRACTION_SYSTEM_PROMPT) + estimate_tokens(user_prompt) + MAX_OUTPUT_TOKENS
+
+
+# Collects one provider call's streamed output. Fields are kept across retries of
+# the call, so a retry that breaks off earlier than the first attempt loses nothing.
+class _FieldStream:
+    def __init__(self, provider: str, model: str, on_field: Optional[FieldCallback]):
+        self.provider = provider
+        self.model = model
+        self.on_field = on_field
+        self.fields: dict[str, Any] = {}
+        self.parser = TopLevelFieldParser()
+        self._started = time.monotonic()
+        self._first_field_seen = False
+
+    # Called at the start of every attempt
+    def restart(self):
+        self.parser = TopLevelFieldParser()
+
+    def feed(self, text: str):
+        for name, value in self.parser.feed(text):
+            if not self._first_field_seen:
+                self._first_field_seen = True
+                LLM_TIME_TO_FIRST_FIELD.labels(provider=self.provider, model=self.model).observe(
+                    time.monotonic() - self._started
+                )
+            self.fields[name] = value
+            if self.on_field:
+                self.on_field(name, value)
+
+    # Await the (retried) streaming call and return the parsed object
+    async def collect(self, call: Awaitable[None]) -> dict[str, Any]:
+        try:
+            await call
+        except Exception as e:
+            if self.fields:
+                raise PartialExtractionError(self.provider, dict(self.fields)) from e
+            raise
+        if self.parser.complete and not self.parser.dropped:
+            return self.parser.fields
+        if self.parser.complete:
+            # A member did not parse on its own; the whole object may still parse
+            try:
+                return json.loads(self.parser.object_text())
+            except ValueError:
+                logger.warning(f"{self.provider} response has unparseable fields: {', '.join(self.parser.dropped)}")
+        if self.fields:
+            raise PartialExtractionError(self.provider, dict(self.fields))
+        raise ValueError(f"{self.provider} response contained no JSON object")
+
+
+# Read a nested usage field; providers leave out the details they have nothing to report for
+def _usage_value(usage: Any, *path: str) -> int:
+    for name in path:
+        if usage is None:
+            return 0
+        usage = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return usage or 0
+
+
+# prompt_tokens includes the cached tokens
+def _record_openai_usage(usage: Any):
+    cached = _usage_value(usage, "prompt_tokens_details", "cached_tokens")
+    record_llm_usage("openai", OPENAI_MODEL, usage.prompt_tokens - cached, usage.completion_tokens, cached)
+
+
+# input_tokens excludes tokens read from or written to the cache
+def _record_anthropic_usage(input_usage: Any, output_tokens: int):
+    record_llm_usage(
+        "anthropic", ANTHROPIC_MODEL, _usage_value(input_usage, "input_tokens"), output_tokens,
+        _usage_value(input_usage, "cache_read_input_tokens"), _usage_value(input_usage, "cache_creation_input_tokens"),
+    )
 
 
 # Use OpenAI
-async def _extract_with_openai(contract_text: str) -> Optional[dict]:
-    
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not set")
-    
-    client = AsyncOpenAI(api_key=api_key)
-    
-    response = await client.chat.completions.create(
-        model="gpt-4o",
+async def _extract_with_openai(user_prompt: str, on_field: Optional[FieldCallback] = None) -> Optional[dict]:
+    client = get_openai_client()
+    request = dict(
+        model=OPENAI_MODEL,
         temperature=0,  # Deterministic extraction
         response_format={"type": "json_object"},
         messages=[
             {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
-            {"role": "user", "content": USER_PROMPT_TEMPLATE.format(contract_text=contract_text)}
+            {"role": "user", "content": user_prompt}
         ],
-        max_tokens=4000,
+        max_tokens=MAX_OUTPUT_TOKENS,
     )
-    
-    content = response.choices[0].message.content
-    return json.loads(content)
+    if LLM_PROMPT_CACHING:
+        # Routes requests with the same prefix to the same cache
+        request["prompt_cache_key"] = f"contract-extraction-{PROMPT_VERSION}"
+    estimated_tokens = _estimated_call_tokens(user_prompt)
+
+    if not LLM_STREAMING:
+        response = await call_provider("openai", estimated_tokens, lambda: client.chat.completions.create(**request))
+        if response.usage:
+            _record_openai_usage(response.usage)
+        return json.loads(response.choices[0].message.content)
+
+    stream = _FieldStream("openai", OPENAI_MODEL, on_field)
+
+    async def consume():
+        stream.restart()
+        chunks = await client.chat.completions.create(**request, stream=True, stream_options={"include_usage": True})
+        try:
+            async for chunk in chunks:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    stream.feed(chunk.choices[0].delta.content)
+                if chunk.usage:
+                    _record_openai_usage(chunk.usage)
+        finally:
+            await chunks.close()
+
+    return await stream.collect(call_provider("openai", estimated_tokens, consume))
+
+
+# The system prompt as a block ending in a cache breakpoint, so everything up to
+# and including it is served from the prompt cache
+def _anthropic_system() -> Any:
+    if not LLM_PROMPT_CACHING:
+        return EXTRACTION_SYSTEM_PROMPT
+    return [{"type": "text", "text": EXTRACTION_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
 
 
 # Use Anthropic
-async def _extract_with_anthropic(contract_text: str) -> Optional[dict]:
-    
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY not set")
-    
-    client = anthropic.AsyncAnthropic(api_key=api_key)
-    
-    message = await client.messages.create(
-        model="claude-opus-4-6",
-        max_tokens=4000,
-        system=EXTRACTION_SYSTEM_PROMPT,
+async def _extract_with_anthropic(user_prompt: str, on_field: Optional[FieldCallback] = None) -> Optional[dict]:
+    client = get_anthropic_client()
+    request = dict(
+        model=ANTHROPIC_MODEL,
+        max_tokens=MAX_OUTPUT_TOKENS,
+        system=_anthropic_system(),
         messages=[
-            {"role": "user", "content": USER_PROMPT_TEMPLATE.format(contract_text=contract_text)}
+            {"role": "user", "content": user_prompt}
         ]
     )
-    
-    content = message.content[0].text
-    # Strip any markdown fences if present
-    content = content.strip()
-    if content.startswith("```"):
-        content = content.split("```")[1]
-        if content.startswith("json"):
-            content = content[4:]
-    
-    return json.loads(content)
\ No newline at end of file
+    estimated_tokens = _estimated_call_tokens(user_prompt)
+
+    if not LLM_STREAMING:
+        message = await call_provider("anthropic", estimated_tokens, lambda: client.messages.create(**request))
+        if message.usage:
+            _record_anthropic_usage(message.usage, message.usage.output_tokens)
+
+        content = message.content[0].text
+        # Strip any markdown fences if present
+        content = content.strip()
+        if content.startswith("```"):
+            content = content.split("```")[1]
+            if content.startswith("json"):
+                content = content[4:]
+
+        return json.loads(content)
+
+    # The parser skips anything before the opening brace, markdown fences included
+    stream = _FieldStream("anthropic", ANTHROPIC_MODEL, on_field)
+
+    async def consume():
+        stream.restart()
+        input_usage, output_tokens = None, 0
+        events = await client.messages.create(**request, stream=True)
+        try:
+            async for event in events:
+                if event.type == "message_start":
+                    input_usage = event.message.usage
+                elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+                    stream.feed(event.delta.text)
+                elif event.type == "message_delta":
+                    output_tokens = event.usage.output_tokens
+        finally:
+            await events.close()
+            _record_anthropic_usage(input_usage, output_tokens)
+
+    return await stream.collect(call_provider("anthropic", estimated_tokens, consume))
@@ -0,0 +1,181 @@
+# Prometheus metrics (prometheus_client)
+# Rendered by GET /metrics on the API (main.py) and on the worker's status
+# server, where the pipeline and LLM calls run. By default every process keeps
+# its own values, so scrape every API and worker process and let Prometheus sum
+# them. To serve one aggregate per host instead (e.g. uvicorn --workers N, or
+# several workers behind one status port), point PROMETHEUS_MULTIPROC_DIR at an
+# empty directory shared by those processes, set before they start: each
+# process writes its values there and /metrics merges them.
+#
+# Optional trace spans: with TRACE_SPANS=true every pipeline stage is logged as
+# an OpenTelemetry-style span record on the "trace" logger, with the trace id
+# derived from the contract id so all stages (and retries) of a contract group together.
+
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+logger = logging.getLogger(__name__)
+trace_logger = logging.getLogger("trace")
+
+TRACE_SPANS = os.getenv("TRACE_SPANS", "false").lower() == "true"
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Seconds; wide enough for a multi-minute LLM call
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# USD per million input and output tokens; override or extend with LLM_PRICING as
+# JSON, e.g. {"gpt-4o": [2.5, 10.0]}. Calls to models without a price count tokens only.
+DEFAULT_LLM_PRICING = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "claude-opus-4-6": (5.00, 25.00),
+}
+LLM_PRICING = {**DEFAULT_LLM_PRICING, **{
+    model: tuple(prices) for model, prices in json.loads(os.getenv("LLM_PRICING", "{}")).items()
+}}
+# Prompt-cache reads and writes as a multiple of the input price, per provider
+CACHE_PRICE_FACTORS = {
+    "openai": {"cached_input": 0.5, "cache_write": 1.0},
+    "anthropic": {"cached_input": 0.1, "cache_write": 1.25},
+}
+
+
+STAGE_SECONDS = Histogram(
+    "contract_stage_duration_seconds", "Time spent in each contract processing stage", ("stage",),
+    buckets=DEFAULT_BUCKETS,
+)
+PROCESSING_SECONDS = Histogram(
+    "contract_processing_duration_seconds", "End-to-end contract processing time by outcome", ("status",),
+    buckets=DEFAULT_BUCKETS,
+)
+PROCESSING_FAILURES = Counter(
+    "contract_processing_failures_total", "Failed contract processing runs by stage and exception type",
+    ("stage", "reason"),
+)
+CACHE_LOOKUPS = Counter(
+    "extraction_cache_lookups_total", "Extraction cache lookups by result (hit or miss)", ("result",),
+)
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_duration_seconds", "LLM provider call latency, including retries", ("provider", "model", "outcome"),
+    buckets=DEFAULT_BUCKETS,
+)
+LLM_TIME_TO_FIRST_FIELD = Histogram(
+    "llm_time_to_first_field_seconds", "Time from starting a streamed LLM call until its first field parsed",
+    ("provider", "model"), buckets=DEFAULT_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported by the LLM providers: uncached input, cached_input (served from the prompt cache), "
+    "cache_write (input written to the prompt cache) and output",
+    ("provider", "model", "direction"),
+)
+LLM_COST = Counter(
+    "llm_estimated_cost_usd_total", "Estimated LLM spend from token usage and LLM_PRICING", ("provider", "model"),
+)
+LLM_FALLBACKS = Counter(
+    "llm_fallbacks_total", "Provider failures that moved the extraction on to the next provider", ("provider",),
+)
+LLM_HEDGES = Counter(
+    "llm_hedges_total", "Hedged requests started because a provider ran past its p95 latency", ("provider",),
+)
+QUEUE_JOBS = Gauge(
+    "processing_jobs", "Processing jobs by status, read from the queue table at scrape time", ("status",),
+    multiprocess_mode="mostrecent",
+)
+
+
+# Token usage of one call. input_tokens excludes tokens read from or written to the prompt cache.
+def record_llm_usage(provider: str, model: str, input_tokens: Optional[int], output_tokens: Optional[int],
+                     cached_input_tokens: Optional[int] = 0, cache_write_tokens: Optional[int] = 0):
+    tokens = {
+        "input": input_tokens or 0,
+        "cached_input": cached_input_tokens or 0,
+        "cache_write": cache_write_tokens or 0,
+        "output": output_tokens or 0,
+    }
+    for direction, count in tokens.items():
+        LLM_TOKENS.labels(provider=provider, model=model, direction=direction).inc(count)
+    logger.info(
+        f"{provider} {model}: {tokens['input'] + tokens['cached_input'] + tokens['cache_write']} input tokens "
+        f"({tokens['cached_input']} cached, {tokens['cache_write']} written to cache), {tokens['output']} output"
+    )
+
+    prices = LLM_PRICING.get(model)
+    if prices:
+        factors = CACHE_PRICE_FACTORS.get(provider, {})
+        input_cost = prices[0] * (
+            tokens["input"]
+            + tokens["cached_input"] * factors.get("cached_input", 1.0)
+            + tokens["cache_write"] * factors.get("cache_write", 1.0)
+        )
+        LLM_COST.labels(provider=provider, model=model).inc((input_cost + tokens["output"] * prices[1]) / 1_000_000)
+
+
+def record_queue_depth(counts: dict[Any, int]):
+    for status, count in counts.items():
+        QUEUE_JOBS.labels(status=getattr(status, "value", status)).set(count)
+
+
+# This process's metrics, or in multiprocess mode those of every process sharing the directory
+def render_metrics() -> bytes:
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, PROMETHEUS_MULTIPROC_DIR)
+    return generate_latest(registry)
+
+
+# Trace spans
+
+_current_span: ContextVar[Optional[dict]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def span(name: str, contract_id: Optional[str] = None, **attributes):
+    if not TRACE_SPANS:
+        yield
+        return
+
+    parent = _current_span.get()
+    if contract_id is not None:
+        trace_id = uuid.UUID(str(contract_id)).hex
+    else:
+        trace_id = parent["trace_id"] if parent else uuid.uuid4().hex
+    record = {
+        "trace_id": trace_id,
+        "span_id": uuid.uuid4().hex[:16],
+        "parent_span_id": parent["span_id"] if parent else None,
+        "name": name,
+        "attributes": {"contract_id": str(contract_id), **attributes} if contract_id else attributes,
+    }
+    token = _current_span.set(record)
+    started_at, started = time.time(), time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException as e:
+        status = f"error: {e.__class__.__name__}"
+        raise
+    finally:
+        _current_span.reset(token)
+        record.update(start_time=started_at, duration_ms=round(1000 * (time.perf_counter() - started), 2),
+                      status=status)
+        trace_logger.info(json.dumps(record, default=str))
+
+
+# Time a pipeline stage into STAGE_SECONDS, as a span of the contract's trace
+@contextmanager
+def track_stage(stage: str, contract_id: str):
+    with span(stage, contract_id), STAGE_SECONDS.labels(stage=stage).time():
+        yield
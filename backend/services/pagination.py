@@ -0,0 +1,54 @@
+# Keyset (cursor) pagination helpers
+# Lists ordered newest first by (created_at, id) page with an opaque cursor
+# holding the last row's sort key, so every page is an index range scan no
+# matter how deep the client pages, unlike OFFSET.
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+# Order newest first and keep only rows strictly after the cursor
+def apply_keyset(stmt: Select, created_col, id_col, cursor: Optional[str]) -> Select:
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    return stmt.order_by(created_col.desc(), id_col.desc())
+
+
+# Fetch one page (limit + 1 rows to learn whether there is another page) and
+# return the rows with the cursor for the next page, or None on the last page.
+# Single-entity selects return entities; sort_key returns a row's (created_at, id)
+# when rows are not plain entities.
+async def fetch_page(db: AsyncSession, stmt: Select, limit: int,
+                     sort_key: Callable[[Any], tuple[datetime, Any]] = lambda row: (row.created_at, row.id),
+                     ) -> tuple[list, Optional[str]]:
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = list(result.scalars() if len(stmt.column_descriptions) == 1 else result.all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*sort_key(rows[-1]))
@@ -2,6 +2,8 @@
 
 import io
 import logging
+import math
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -10,68 +12,218 @@ import fitz
 
 logger = logging.getLogger(__name__)
 
+# "pdfplumber": pdfplumber text and tables on every page, PyMuPDF fallback (legacy)
+# "adaptive": PyMuPDF text on every page, pdfplumber tables only on pages whose
+#             vector drawings look like a ruled table
+PDF_EXTRACTION_MODE = os.getenv("PDF_EXTRACTION_MODE", "pdfplumber")
+EXTRACTION_MODES = ("pdfplumber", "adaptive")
+
+# Documents with at least this many pages are split into page ranges that are
+# parsed in parallel (see ExtractionExecutor.extract_text)
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PARALLEL_PAGE_THRESHOLD", "24"))
+PAGES_PER_RANGE = int(os.getenv("PAGES_PER_RANGE", "12"))
+MIN_TEXT_CHARS = 100
+
+
+# A page range could not be parsed. Raised instead of returning "" so a failed
+# range is never mistaken for pages without text.
+class PageRangeError(Exception):
+    pass
+
 #Extract text from a PDF or plain text file
-#Uses pdfplumber first, then falls back to PyMuPDF for scanned/complex PDFs
-def extract_text_from_file(file_path: str) -> str:
+#In pdfplumber mode uses pdfplumber first, then falls back to PyMuPDF for scanned/complex PDFs;
+#in adaptive mode the order is reversed and pdfplumber only runs where tables are detected
+def extract_text_from_file(file_path: str, mode: Optional[str] = None) -> str:
     path = Path(file_path)
 
     if path.suffix.lower() == ".pdf":
-        text = _extract_with_pdfplumber(file_path)
-        if not text or len(text.strip()) < 100:
-            logger.info("pdfplumber returned insufficient text, trying PyMuPDF")
-            text = _extract_with_pymupdf(file_path)
+        try:
+            text = extract_pdf_page_range(file_path, 0, None, mode)
+        except PageRangeError as e:
+            logger.error(f"extraction failed: {e}")
+            text = ""
+        if needs_fallback(text):
+            text = extract_pdf_fallback_text(file_path, mode)
         return text
-    
+
     else:
         #Plain text or .txt file
         with open(file_path, "r", encoding="utf-8", errors="replace") as f:
             return f.read()
-        
 
-#Extract text using pdfplumber
-def _extract_with_pdfplumber(file_path: str) -> str:
+
+def is_pdf(file_path: str) -> bool:
+    return Path(file_path).suffix.lower() == ".pdf"
+
+
+def needs_fallback(text: Optional[str]) -> bool:
+    return not text or len(text.strip()) < MIN_TEXT_CHARS
+
+
+#Count pages without parsing them (PyMuPDF only reads the xref table)
+def count_pdf_pages(file_path: str) -> int:
     try:
-        full_text = []
-        with pdfplumber.open(file_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                text = page.extract_text()
-                if text:
-                    full_text.append(f"[Page {page_num}]\n{text}")
-
-                # try to extract tables as structured text
-                tables = page.extract_tables()
-                for table in tables:
-                    if table:
-                        table_text = _table_to_text(table)
-                        if table_text:
-                            full_text.append(f"[Table on Page {page_num}\n{table_text}]")
+        with fitz.open(file_path) as doc:
+            return doc.page_count
+    except Exception as e:
+        logger.error(f"could not count pages in {file_path}: {e}")
+        return 0
 
-        return "\n\n".join(full_text)
-    
+
+#Split [0, page_count) into contiguous, evenly sized ranges of roughly pages_per_range pages
+def plan_page_ranges(page_count: int, pages_per_range: int = PAGES_PER_RANGE) -> list[tuple[int, int]]:
+    if page_count <= 0:
+        return []
+    range_count = math.ceil(page_count / max(1, pages_per_range))
+    base, extra = divmod(page_count, range_count)
+
+    ranges = []
+    start = 0
+    for i in range(range_count):
+        end = start + base + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _range_pages(start: int, end: Optional[int]) -> Optional[list[int]]:
+    return list(range(start + 1, end + 1)) if end is not None else None
+
+
+#Extract one page range with the configured engine. Pages are 0-based, end is
+#exclusive (None means to the end). Runs inside the extraction process pool, one call per range.
+#Raises PageRangeError if the engine fails.
+def extract_pdf_page_range(file_path: str, start: int, end: Optional[int], mode: Optional[str] = None) -> str:
+    pages = _range_pages(start, end)
+    try:
+        if (mode or PDF_EXTRACTION_MODE) == "adaptive":
+            return _adaptive_text(file_path, pages=pages)
+        return _pdfplumber_text(file_path, pages=pages)
+    except Exception as e:
+        raise PageRangeError(f"pages {start + 1}-{end or 'end'} of {file_path}: {e}") from None
+
+
+#Second engine used when the primary one finds too little text (scanned/complex PDFs)
+def extract_pdf_fallback_text(file_path: str, mode: Optional[str] = None) -> str:
+    return extract_pdf_fallback_range(file_path, 0, None, mode)
+
+
+#The second engine on one page range, for a range the primary engine failed on; "" if it fails too
+def extract_pdf_fallback_range(file_path: str, start: int, end: Optional[int], mode: Optional[str] = None) -> str:
+    pages = _range_pages(start, end)
+    if (mode or PDF_EXTRACTION_MODE) == "adaptive":
+        logger.info("PyMuPDF returned insufficient text, trying pdfplumber")
+        return _extract_with_pdfplumber(file_path, pages=pages)
+    logger.info("pdfplumber returned insufficient text, trying PyMuPDF")
+    return _extract_with_pymupdf(file_path, pages=pages)
+
+
+#Join per-range results in range order. Each range already carries its own
+#[Page N] markers, so concatenating in order reproduces the sequential output.
+def merge_page_ranges(parts: list[str]) -> str:
+    return "\n\n".join(part for part in parts if part)
+
+
+#Extract text using pdfplumber, optionally limited to 1-based page numbers
+def _extract_with_pdfplumber(file_path: str, pages: Optional[list[int]] = None) -> str:
+    try:
+        return _pdfplumber_text(file_path, pages)
     except Exception as e:
         logger.error(f"extraction using pdfplumber failed: {e}")
         return ""
-    
 
 
+def _pdfplumber_text(file_path: str, pages: Optional[list[int]] = None) -> str:
+    full_text = []
+    with pdfplumber.open(file_path, pages=pages) as pdf:
+        for page in pdf.pages:
+            page_num = page.page_number
+            text = page.extract_text()
+            if text:
+                full_text.append(f"[Page {page_num}]\n{text}")
+
+            # try to extract tables as structured text
+            full_text.extend(_page_tables_text(page))
+
+    return "\n\n".join(full_text)
 
-def _extract_with_pymupdf(file_path: str) -> str:
+
+#Extract text with PyMuPDF and only hand pages that look like they hold tables to pdfplumber
+def _adaptive_text(file_path: str, pages: Optional[list[int]] = None) -> str:
+    page_blocks: dict[int, list[str]] = {}
+    table_pages = []
+
+    with fitz.open(file_path) as doc:
+        page_numbers = pages or range(1, doc.page_count + 1)
+        for page_num in page_numbers:
+            page = doc[page_num - 1]
+            text = page.get_text("text")
+            page_blocks[page_num] = [f"[Page {page_num}]\n{text}"] if text.strip() else []
+            if _looks_like_table(page):
+                table_pages.append(page_num)
+
+    if table_pages:
+        with pdfplumber.open(file_path, pages=table_pages) as pdf:
+            for page in pdf.pages:
+                page_blocks[page.page_number].extend(_page_tables_text(page))
+
+    return "\n\n".join(block for page_num in page_numbers for block in page_blocks[page_num])
+
+
+#Cheap ruled-table detector: pdfplumber's default table strategy builds cells from
+#ruling lines, so a page without enough horizontal and vertical strokes has no tables it can find
+def _looks_like_table(page, min_horizontal: int = 3, min_vertical: int = 2) -> bool:
+    horizontal = vertical = 0
+    for drawing in page.get_drawings():
+        for item in drawing["items"]:
+            if item[0] == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1.y - p2.y) < 1:
+                    horizontal += 1
+                elif abs(p1.x - p2.x) < 1:
+                    vertical += 1
+            elif item[0] == "re":
+                rect = item[1]
+                # Thin filled rectangles are how many generators draw rules
+                if rect.height < 2:
+                    horizontal += 1
+                elif rect.width < 2:
+                    vertical += 1
+                else:
+                    horizontal += 2
+                    vertical += 2
+        if horizontal >= min_horizontal and vertical >= min_vertical:
+            return True
+    return False
+
+
+def _page_tables_text(page) -> list[str]:
+    blocks = []
+    for table in page.extract_tables():
+        if table:
+            table_text = _table_to_text(table)
+            if table_text:
+                blocks.append(f"[Table on Page {page.page_number}\n{table_text}]")
+    return blocks
+
+
+def _extract_with_pymupdf(file_path: str, pages: Optional[list[int]] = None) -> str:
     try:
         doc = fitz.open(file_path)
         full_text = []
 
-        for page_num, page in enumerate(doc, 1):
-            text = page.get_text("text")
+        for page_num in pages or range(1, doc.page_count + 1):
+            text = doc[page_num - 1].get_text("text")
             if text.strip():
                 full_text.append(f"[Page {page_num}]\n{text}")
 
         doc.close()
         return "\n\n".join(full_text)
-    
+
     except Exception as e:
         logger.error(f"extraction with PyMUPDF failed: {e}")
         return ""
-    
+
 
 
 #Convert a pdfplumber table to readable text
@@ -81,4 +233,4 @@ def _table_to_text(table: list) -> str:
         if row:
             cleaned = [str(cell).strip() if cell else "" for cell in row]
             rows.append(" | ".join(cleaned))
-        return "\n".join(rows)
\ No newline at end of file
+    return "\n".join(rows)
@@ -0,0 +1,197 @@
+# Contract processing pipeline: extract text → run LLM → save results
+# Runs inside the job worker (see worker.py) with one async session per job.
+# Sync-only helpers (extraction cache, hourly stats) run through
+# AsyncSession.run_sync on the same connection and transaction.
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Contract, AuditLog, ContractStatus
+from services.billing_facts import sync_billing_facts
+from services.events import contract_events
+from services.extraction_executor import extraction_executor
+from services.extraction_cache import (
+    EXTRACTION_CACHE_ENABLED, cache_key, hash_file, get_cached_extraction, store_extraction,
+)
+from services.search_service import index_contract_text
+from services.stats_service import record_contract_outcome
+from services.llm_service import (
+    PROMPT_VERSION, extract_billing_config, extraction_model_id, is_partial_extraction,
+)
+from services.metrics import CACHE_LOOKUPS, PROCESSING_FAILURES, PROCESSING_SECONDS, span, track_stage
+
+logger = logging.getLogger(__name__)
+
+
+async def process_contract(contract_id: str, db: AsyncSession):
+    contract = await db.scalar(select(Contract).where(Contract.id == contract_id))
+    if not contract:
+        return
+
+    with span("process_contract", contract_id):
+        await _process(contract_id, contract, db)
+
+
+async def _process(contract_id: str, contract: Contract, db: AsyncSession):
+    started = time.monotonic()
+    # Stage in progress, reported as the failure stage if anything raises
+    stage = "hash"
+    try:
+        # Update status to processing
+        contract.status = ContractStatus.PROCESSING
+        contract.error_message = None
+        await db.commit()
+        await contract_events.publish(contract_id, "processing", status=ContractStatus.PROCESSING.value)
+
+        # Byte-identical re-uploads reuse the text extracted from the earlier copy
+        file_path = contract.file_path
+        with track_stage(stage, contract_id):
+            if not contract.file_sha256:
+                contract.file_sha256 = await asyncio.to_thread(hash_file, file_path)
+            raw_text = await _find_extracted_text(db, contract)
+
+        # Otherwise extract text from PDF/txt in the process pool so parsing never blocks the loop
+        stage = "text_extraction"
+        if raw_text is None:
+            logger.info(f"Extracting text from {file_path}")
+            with track_stage(stage, contract_id):
+                raw_text = await extraction_executor.extract_text(file_path)
+
+        if not raw_text or len(raw_text.strip()) < 50:
+            raise ValueError("Could not extract meaningful text from the file")
+
+        stage = "save_text"
+        with track_stage(stage, contract_id):
+            contract.raw_text = raw_text
+            await db.run_sync(index_contract_text, contract_id, raw_text)
+            await db.commit()
+        await contract_events.publish(contract_id, "text_extracted", status=ContractStatus.PROCESSING.value,
+                                chars=len(raw_text))
+
+        # Run LLM extraction, unless the same text was already extracted with this prompt and model
+        stage = "cache_lookup"
+        model = extraction_model_id()
+        key = cache_key(raw_text, PROMPT_VERSION, model)
+        billing_config = None
+        if EXTRACTION_CACHE_ENABLED:
+            with track_stage(stage, contract_id):
+                billing_config = await db.run_sync(get_cached_extraction, key)
+        cache_hit = billing_config is not None
+        if EXTRACTION_CACHE_ENABLED:
+            CACHE_LOOKUPS.labels(result="hit" if cache_hit else "miss").inc()
+
+        if cache_hit:
+            logger.info(f"Extraction cache hit for contract {contract_id}")
+        else:
+            logger.info(f"Running LLM extraction for contract {contract_id}")
+            await contract_events.publish(contract_id, "llm_running", status=ContractStatus.PROCESSING.value)
+            stage = "llm"
+            streamed = _StreamedFields(db, contract, contract_id)
+            try:
+                with track_stage(stage, contract_id):
+                    billing_config = await extract_billing_config(raw_text, on_field=streamed.add)
+            finally:
+                await streamed.close()
+            # A config pieced together from cut-off responses is saved, but never served to other uploads.
+            # The store is best effort: a failed cache write is rolled back on its own.
+            if EXTRACTION_CACHE_ENABLED and not is_partial_extraction(billing_config):
+                await db.run_sync(store_extraction, key, PROMPT_VERSION, model, billing_config)
+
+        # Save results
+        stage = "save_results"
+        with track_stage(stage, contract_id):
+            contract.billing_config = billing_config
+            contract.status = ContractStatus.COMPLETED
+            await db.run_sync(sync_billing_facts, contract_id, billing_config)
+            await db.run_sync(record_contract_outcome, ContractStatus.COMPLETED, time.monotonic() - started,
+                              billing_config)
+            await db.commit()
+
+            # Write initial extraction audit log
+            audit = AuditLog(
+                contract_id=contract_id,
+                field_name="billing_config",
+                old_value=None,
+                new_value={"extracted": True, "cache_hit": cache_hit, "fields": list(billing_config.keys())},
+                action="extracted",
+                reason="Served from extraction cache" if cache_hit else "Automatic LLM extraction completed",
+            )
+            db.add(audit)
+            await db.commit()
+        PROCESSING_SECONDS.labels(status=ContractStatus.COMPLETED.value).observe(time.monotonic() - started)
+        await contract_events.publish(contract_id, "completed", status=ContractStatus.COMPLETED.value,
+                                cache_hit=cache_hit)
+
+        logger.info(f"Contract {contract_id} processed successfully")
+
+    except Exception as e:
+        logger.error(f"Failed to process contract {contract_id} during {stage}: {e}")
+        PROCESSING_FAILURES.labels(stage=stage, reason=e.__class__.__name__).inc()
+        PROCESSING_SECONDS.labels(status=ContractStatus.FAILED.value).observe(time.monotonic() - started)
+        await db.rollback()
+        # Rollback expires the contract; the status listener needs the old value
+        # loaded and the update checks the current version
+        await db.refresh(contract, ["status", "version"])
+        contract.status = ContractStatus.FAILED
+        contract.error_message = str(e)
+        await db.run_sync(record_contract_outcome, ContractStatus.FAILED, time.monotonic() - started)
+        await db.commit()
+        await contract_events.publish(contract_id, "failed", status=ContractStatus.FAILED.value, error=str(e))
+
+
+# Saves and announces fields streamed by the LLM while it is still generating.
+# Fields arrive from the LLM call (possibly from two hedged providers at once);
+# one flush task writes them, so the session is never used concurrently and a
+# cancelled provider call can never interrupt a commit. Fields that arrive
+# during a flush are coalesced into the next one.
+class _StreamedFields:
+    def __init__(self, db: AsyncSession, contract: Contract, contract_id: str):
+        self.db = db
+        self.contract = contract
+        self.contract_id = contract_id
+        self.fields: dict = {}
+        self._pending = asyncio.Event()
+        self._closed = False
+        self._task = asyncio.create_task(self._flush_loop())
+
+    def add(self, name: str, value):
+        self.fields[name] = value
+        self._pending.set()
+
+    # The final result is saved by the caller, so unflushed fields are dropped
+    async def close(self):
+        self._closed = True
+        self._pending.set()
+        await self._task
+
+    async def _flush_loop(self):
+        while True:
+            await self._pending.wait()
+            self._pending.clear()
+            if self._closed:
+                return
+            fields = dict(self.fields)
+            try:
+                self.contract.billing_config = fields
+                await self.db.commit()
+            except Exception as e:
+                # Progress updates are best effort; the final result is still saved
+                logger.warning(f"Could not save streamed fields for contract {self.contract_id}: {e}")
+                await self.db.rollback()
+                await self.db.refresh(self.contract)
+                return
+            await contract_events.publish(self.contract_id, "field_extracted",
+                                          status=ContractStatus.PROCESSING.value, fields=list(fields))
+
+
+async def _find_extracted_text(db: AsyncSession, contract: Contract) -> Optional[str]:
+    return await db.scalar(select(Contract.raw_text).where(
+        Contract.file_sha256 == contract.file_sha256,
+        Contract.id != contract.id,
+        Contract.raw_text.isnot(None),
+    ).limit(1))
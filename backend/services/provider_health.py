@@ -0,0 +1,152 @@
+# Per-provider latency statistics and circuit breakers
+# Every LLM call records its outcome here. Latency percentiles decide when a
+# hedged request starts the next provider, and a breaker that has seen
+# CIRCUIT_FAILURE_THRESHOLD consecutive failures keeps a provider out of
+# rotation for CIRCUIT_RESET_SECONDS before letting a single trial call through.
+
+import logging
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+# Until a provider has this many samples, HEDGE_DEFAULT_DELAY_SECONDS stands in for its p95
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_DEFAULT_DELAY_SECONDS = float(os.getenv("HEDGE_DEFAULT_DELAY_SECONDS", "30"))
+HEDGE_MIN_DELAY_SECONDS = float(os.getenv("HEDGE_MIN_DELAY_SECONDS", "2"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+# Rolling window of successful call latencies
+class LatencyTracker:
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    # Whether a call may be routed to this provider now. After reset_seconds an
+    # open breaker lets exactly one trial call through (half-open).
+    def allow(self) -> bool:
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        if self.state != CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(
+                    f"Circuit for {self.name} opened after {self.consecutive_failures} consecutive failures"
+                )
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    # A call that was cancelled (lost a hedged race) says nothing about provider health
+    def record_cancelled(self):
+        self._trial_in_flight = False
+
+
+class ProviderHealth:
+    def __init__(self, name: str):
+        self.name = name
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker(name)
+        self.calls = 0
+        self.failures = 0
+        self.cancelled = 0
+
+    def record_success(self, seconds: float):
+        self.calls += 1
+        self.latency.record(seconds)
+        self.breaker.record_success()
+
+    def record_failure(self):
+        self.calls += 1
+        self.failures += 1
+        self.breaker.record_failure()
+
+    def record_cancelled(self):
+        self.cancelled += 1
+        self.breaker.record_cancelled()
+
+    # How long to wait on this provider before hedging with the next one
+    def hedge_delay(self) -> float:
+        p95 = self.latency.percentile(0.95) if len(self.latency) >= HEDGE_MIN_SAMPLES else None
+        return max(HEDGE_MIN_DELAY_SECONDS, p95 if p95 is not None else HEDGE_DEFAULT_DELAY_SECONDS)
+
+    def snapshot(self) -> dict[str, Any]:
+        breaker = self.breaker
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "cancelled": self.cancelled,
+            "latency_samples": len(self.latency),
+            "latency_p50_seconds": self.latency.percentile(0.5),
+            "latency_p95_seconds": self.latency.percentile(0.95),
+            "hedge_delay_seconds": self.hedge_delay(),
+            "circuit": {
+                "state": breaker.state,
+                "consecutive_failures": breaker.consecutive_failures,
+                "open_for_seconds": (
+                    round(time.monotonic() - breaker.opened_at, 1) if breaker.state == OPEN else None
+                ),
+            },
+        }
+
+
+_providers: dict[str, ProviderHealth] = {}
+
+
+def get_provider_health(name: str) -> ProviderHealth:
+    if name not in _providers:
+        _providers[name] = ProviderHealth(name)
+    return _providers[name]
+
+
+def provider_health_snapshot() -> dict[str, dict[str, Any]]:
+    return {name: health.snapshot() for name, health in _providers.items()}
@@ -0,0 +1,346 @@
+# Rule-based pre-extractor for billing terms that contracts state verbatim
+# Compiled patterns find payment terms ("Net 30"), billing frequency ("invoiced
+# monthly"), late fees ("1.5% per month"), term dates, the total contract value
+# and auto-renewal, and fill the matching EXTRACTION_SYSTEM_PROMPT fields with a
+# source_text quote and a confidence. Confidence starts from how reliable the
+# pattern is and drops when the contract states the term more than one way;
+# benchmarks/eval_rule_extractor.py measures accuracy at each confidence.
+# Parties, usage tiers and special terms are left to the LLM.
+
+import copy
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Optional
+
+MAX_SOURCE_CHARS = 200
+
+MONTHS = {
+    name: number
+    for number, names in enumerate([
+        ("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"), ("may",),
+        ("june", "jun"), ("july", "jul"), ("august", "aug"), ("september", "sep", "sept"),
+        ("october", "oct"), ("november", "nov"), ("december", "dec"),
+    ], start=1)
+    for name in names
+}
+NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "twelve": 12}
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP"}
+
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True))
+DATE = (
+    rf"\d{{4}}-\d{{2}}-\d{{2}}"
+    rf"|(?:{_MONTH})\.?\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}}"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+(?:{_MONTH})\.?,?\s+\d{{4}}"
+)
+# "30", "(30)" or "thirty (30)"; the digits are always captured
+DAYS = r"(?:[a-z]+[ -])?\(?(\d{1,3})\)?\s+(?:calendar\s+|business\s+)?days?"
+MONEY = r"(USD|EUR|GBP|CAD|AUD)?\s?([$€£])?\s?(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{1,2}))?(?:\s?(USD|EUR|GBP|CAD|AUD))?"
+
+NET_RE = re.compile(r"\bnet[ -]?(\d{1,3})\b", re.I)
+DUE_WITHIN_RE = re.compile(rf"\b(?:due|payable|paid)\b[^.;]{{0,60}}?\bwithin\s+{DAYS}", re.I)
+DUE_ON_RECEIPT_RE = re.compile(r"\b(?:due|payable)\s+(?:up)?on\s+receipt\b", re.I)
+FREQUENCY_RE = re.compile(
+    r"\b(?:invoiced|billed|charged|payable|paid)\s+(?:in\s+(?:advance|arrears)\s+)?(?:on\s+an?\s+)?"
+    r"(monthly|quarterly|semi-annually|annually|annual|yearly|one-time)\b"
+    r"|\b(monthly|quarterly|annual|yearly)\s+(?:in\s+(?:advance|arrears)|invoic\w+|billing)\b",
+    re.I,
+)
+LATE_RATE_RE = re.compile(r"(\d{1,2}(?:\.\d{1,3})?)\s?%\s*(?:per|a|each|every)\s+(month|annum|year)\b", re.I)
+LATE_CONTEXT_RE = re.compile(r"\blate\b|\binterest\b|\boverdue\b|\bpast\s+due\b|\bnot\s+paid\b", re.I)
+GRACE_RE = re.compile(rf"\bgrace\s+period\s+of\s+{DAYS}|\(?(\d{{1,3}})\)?[ -]days?\s+grace\b", re.I)
+START_RE = re.compile(rf"\b(?:commenc\w*|start\w*|begin\w*|effective)\s+(?:on|as\s+of|from)\s+({DATE})", re.I)
+END_RE = re.compile(
+    rf"\b(?:through|until|(?:ending|expir\w*|terminat\w*|end\w*)\s+on)\s+({DATE})", re.I
+)
+VALUE_RE = re.compile(
+    rf"\btotal\s+(?:(?:annual|contract|subscription|aggregate)\s+)*(?:fees?|value|price|amount|consideration)"
+    rf"\s+(?:of|is|shall\s+be|equal\s+to)\s+{MONEY}",
+    re.I,
+)
+AUTO_RENEW_RE = re.compile(
+    r"\b(not\s+)?(?:be\s+)?automatic(?:ally)?\s+renew\w*|\bauto-renew\w*|\bshall\s+renew\s+automatically", re.I
+)
+RENEWAL_PERIOD_RE = re.compile(
+    r"\bsuccessive\s+(\w+)[ -](year|month)|\brenews?\s+(annually|monthly)\b", re.I
+)
+NOTICE_RE = re.compile(
+    rf"\bnotice\b[^.;]{{0,80}}?\b(?:at\s+least|no\s+later\s+than|not\s+less\s+than)\s+{DAYS}"
+    rf"|\b{DAYS}[’']?\s+(?:prior\s+)?(?:written\s+)?notice\b",
+    re.I,
+)
+RENEWAL_CONTEXT_RE = re.compile(r"renew|cancel|terminat", re.I)
+SENTENCE_END_RE = re.compile(r"[.;](?=\s)|\n[ \t]*\n")
+HEADING_RE = re.compile(r"\s*(?:\d+(?:\.\d+)*\.?[ \t]+)?[^.;:,\n]{0,60}")
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class RuleExtraction:
+    # EXTRACTION_SYSTEM_PROMPT fields found by the rules, keyed by field name
+    fields: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # (start, end) offsets in the contract of each field's source_text
+    spans: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    # Fields the rules are confident enough in to use without the LLM
+    def confident(self, threshold: float) -> dict[str, dict[str, Any]]:
+        return {name: f for name, f in self.fields.items() if f["confidence"] >= threshold}
+
+
+@dataclass
+class _Candidate:
+    answer: Any
+    start: int
+    end: int
+
+
+# Run every rule over the contract text
+def extract_rule_fields(text: str) -> RuleExtraction:
+    result = RuleExtraction()
+    for name, rule in RULES:
+        found = rule(text)
+        if found:
+            fields, (start, end) = found
+            for field_name, value in fields.items():
+                value["source_text"] = _source_text(text, start, end)
+                result.fields[field_name] = value
+                result.spans[field_name] = (start, end)
+    return result
+
+
+# A complete billing config from the rules alone; fields they did not find are
+# empty with confidence 0.0 so they are flagged for review
+def rules_only_config(extraction: RuleExtraction) -> dict[str, Any]:
+    config = copy.deepcopy(EMPTY_CONFIG)
+    config.update(copy.deepcopy(extraction.fields))
+    missing = [name for name in EMPTY_CONFIG if name != "extraction_notes" and name not in extraction.fields]
+    config["extraction_notes"] = (
+        "Rule-based extraction only (no LLM). Not found by the rules and needing review: "
+        + ", ".join(missing) if missing else "Rule-based extraction only (no LLM)."
+    )
+    return config
+
+
+# Replace config fields with the accepted rule fields
+def apply_rule_fields(config: dict[str, Any], accepted: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    return {**config, **copy.deepcopy(accepted)}
+
+
+def _payment_schedule(text: str):
+    candidates = [_Candidate(int(m.group(1)), m.start(), m.end()) for m in NET_RE.finditer(text)]
+    explicit = len(candidates)
+    candidates += [_Candidate(int(m.group(1)), m.start(), m.end()) for m in DUE_WITHIN_RE.finditer(text)]
+    candidates += [_Candidate(0, m.start(), m.end()) for m in DUE_ON_RECEIPT_RE.finditer(text)]
+    best = _agreed(candidates)
+    if not best:
+        return None
+
+    days = best.answer
+    if days == 0:
+        value, confidence = "Due on receipt", 0.9
+    else:
+        value = f"Net {days}" if days in (30, 60, 90) else "custom"
+        # "Net N" is unambiguous; "within N days" alone could be a dispute window
+        confidence = 0.97 if explicit and len(candidates) > explicit else 0.95 if explicit else 0.85
+    return {"payment_schedule": {"value": value, "due_days": days, "confidence": confidence}}, (best.start, best.end)
+
+
+def _billing_frequency(text: str):
+    aliases = {"annual": "annually", "yearly": "annually"}
+    candidates = []
+    for m in FREQUENCY_RE.finditer(text):
+        found = (m.group(1) or m.group(2)).lower()
+        candidates.append(_Candidate(aliases.get(found, found), m.start(), m.end()))
+    best = _agreed(candidates)
+    if not best:
+        return None
+
+    value, custom = best.answer, None
+    if value == "semi-annually":
+        value, custom = "custom", "Semi-annually"
+    confidence = 0.96 if len(candidates) > 1 else 0.92
+    return {"billing_frequency": {"value": value, "custom_description": custom, "confidence": confidence}}, \
+        (best.start, best.end)
+
+
+def _late_fee(text: str):
+    candidates = []
+    for m in LATE_RATE_RE.finditer(text):
+        start, end = _sentence_bounds(text, m.start(), m.end())
+        if LATE_CONTEXT_RE.search(text, start, end):
+            candidates.append(_Candidate((float(m.group(1)), m.group(2).lower()), m.start(), m.end()))
+    best = _agreed(candidates)
+    if not best:
+        return None
+
+    rate, period = best.answer
+    grace = GRACE_RE.search(text)
+    grace_days = int(grace.group(1) or grace.group(2)) if grace else None
+    # rate_percent is read as a monthly rate; an annual rate is only a hint
+    confidence = 0.93 if period == "month" else 0.6
+    return {"late_fee": {
+        "applies": True, "rate_percent": rate, "grace_period_days": grace_days,
+        "flat_amount": None, "confidence": confidence,
+    }}, (best.start, best.end)
+
+
+def _term_dates(text: str):
+    starts = [_Candidate(_parse_date(m.group(1)), m.start(), m.end()) for m in START_RE.finditer(text)]
+    ends = [_Candidate(_parse_date(m.group(1)), m.start(), m.end()) for m in END_RE.finditer(text)]
+    start = _agreed([c for c in starts if c.answer])
+    end = _agreed([c for c in ends if c.answer])
+    if not start and not end:
+        return None
+
+    # "commence on X and continue through Y" in one sentence is the strongest form
+    paired = start and end and _sentence_bounds(text, start.start, start.end) == _sentence_bounds(text, end.start, end.end)
+    confidence = 0.95 if paired else 0.88
+    fields, span = {}, None
+    if start:
+        fields["start_date"] = {"value": start.answer, "confidence": confidence}
+        span = (start.start, start.end)
+    if end and (not start or end.answer > start.answer):
+        fields["end_date"] = {"value": end.answer, "confidence": confidence}
+        span = (span[0], end.end) if paired else span or (end.start, end.end)
+    return fields, span
+
+
+def _contract_value(text: str):
+    candidates = []
+    for m in VALUE_RE.finditer(text):
+        code_before, symbol, whole, cents, code_after = m.groups()
+        currency = code_before or code_after or CURRENCY_SYMBOLS.get(symbol or "")
+        amount = float(whole.replace(",", "") + (f".{cents}" if cents else ""))
+        candidates.append(_Candidate((amount, currency), m.start(), m.end()))
+    best = _agreed(candidates)
+    if not best:
+        return None
+
+    amount, currency = best.answer
+    value = int(amount) if amount.is_integer() else amount
+    confidence = 0.92 if currency else 0.8
+    return {"contract_value": {"value": value, "currency": currency, "confidence": confidence}}, \
+        (best.start, best.end)
+
+
+def _renewal_clause(text: str):
+    renewals = [_Candidate(m.group(1) is None, m.start(), m.end()) for m in AUTO_RENEW_RE.finditer(text)]
+    best = _agreed(renewals)
+    if not best:
+        return None
+
+    period = None
+    periods = []
+    for m in RENEWAL_PERIOD_RE.finditer(text):
+        if m.group(3):
+            months = 12 if m.group(3).lower() == "annually" else 1
+        else:
+            count = NUMBER_WORDS.get(m.group(1).lower()) or (int(m.group(1)) if m.group(1).isdigit() else None)
+            months = count * (12 if m.group(2).lower() == "year" else 1) if count else None
+        if months:
+            periods.append(_Candidate(months, m.start(), m.end()))
+    if _agreed(periods):
+        period = _agreed(periods).answer
+
+    notices = []
+    for m in NOTICE_RE.finditer(text):
+        start, end = _sentence_bounds(text, m.start(), m.end())
+        if RENEWAL_CONTEXT_RE.search(text, start, end):
+            notices.append(_Candidate(int(m.group(1) or m.group(2)), m.start(), m.end()))
+    notice = _agreed(notices)
+
+    found = sum(x is not None for x in (period, notice))
+    confidence = 0.8 + 0.05 * found
+    return {"renewal_clause": {
+        "auto_renews": best.answer,
+        "renewal_period_months": period,
+        "cancellation_notice_days": notice.answer if notice else None,
+        "confidence": round(confidence, 2),
+    }}, (best.start, best.end)
+
+
+RULES = [
+    ("payment_schedule", _payment_schedule),
+    ("billing_frequency", _billing_frequency),
+    ("late_fee", _late_fee),
+    ("term_dates", _term_dates),
+    ("contract_value", _contract_value),
+    ("renewal_clause", _renewal_clause),
+]
+
+EMPTY_CONFIG: dict[str, Any] = {
+    "contract_parties": {
+        "vendor": {"value": None, "confidence": 0.0, "source_text": None},
+        "client": {"value": None, "confidence": 0.0, "source_text": None},
+    },
+    "contract_value": {"value": None, "currency": None, "confidence": 0.0, "source_text": None},
+    "billing_frequency": {"value": None, "custom_description": None, "confidence": 0.0, "source_text": None},
+    "payment_schedule": {"value": None, "due_days": None, "confidence": 0.0, "source_text": None},
+    "usage_tiers": {"value": [], "confidence": 0.0, "source_text": None},
+    "renewal_clause": {
+        "auto_renews": None, "renewal_period_months": None, "cancellation_notice_days": None,
+        "confidence": 0.0, "source_text": None,
+    },
+    "late_fee": {
+        "applies": None, "rate_percent": None, "grace_period_days": None, "flat_amount": None,
+        "confidence": 0.0, "source_text": None,
+    },
+    "start_date": {"value": None, "confidence": 0.0, "source_text": None},
+    "end_date": {"value": None, "confidence": 0.0, "source_text": None},
+    "special_terms": {"value": [], "confidence": 0.0, "source_text": None},
+    "extraction_notes": None,
+}
+
+
+# The first candidate if every candidate gives the same answer; a contract
+# that states a term two different ways is left to the LLM
+def _agreed(candidates: list[_Candidate]) -> Optional[_Candidate]:
+    if not candidates or len({c.answer for c in candidates}) > 1:
+        return None
+    return candidates[0]
+
+
+def _parse_date(raw: str) -> Optional[str]:
+    raw = raw.lower().replace(",", " ").replace(".", " ")
+    parts = raw.split()
+    try:
+        if len(parts) == 1:
+            return date.fromisoformat(parts[0]).isoformat()
+        if parts[0] in MONTHS:
+            month, day, year = MONTHS[parts[0]], parts[1], parts[2]
+        else:
+            day, month, year = parts[0], MONTHS[parts[1]], parts[2]
+        day = int(re.sub(r"\D", "", day))
+        return date(int(year), month, day).isoformat()
+    except (ValueError, KeyError, IndexError):
+        return None
+
+
+# The sentence (or clause, at semicolons) around a match, without any section
+# heading lines ("2.2 Payment Terms") run into its start
+def _sentence_bounds(text: str, start: int, end: int) -> tuple[int, int]:
+    left = 0
+    for m in SENTENCE_END_RE.finditer(text, max(0, start - 400), start):
+        left = m.end()
+    while True:
+        newline = text.find("\n", left, start)
+        if newline < 0 or not HEADING_RE.fullmatch(text[left:newline]):
+            break
+        left = newline + 1
+    right = SENTENCE_END_RE.search(text, end)
+    return left, right.end() if right else len(text)
+
+
+# The sentence around the match, whitespace-collapsed and cut to the schema's
+# 200 characters around the match itself
+def _source_text(text: str, start: int, end: int) -> str:
+    left, right = _sentence_bounds(text, start, end)
+    if right - left > MAX_SOURCE_CHARS:
+        slack = max(0, MAX_SOURCE_CHARS - (end - start)) // 2
+        left, right = max(left, start - slack), min(right, end + slack)
+        # Cut at word boundaries
+        while 0 < left < start and not text[left - 1].isspace():
+            left += 1
+        while end < right < len(text) and not text[right].isspace():
+            right -= 1
+    return WHITESPACE_RE.sub(" ", text[left:right]).strip()
@@ -0,0 +1,246 @@
+# Full-text search over contract text
+# process_contract splits raw_text on its [Page N] markers and stores one row
+# per page in contract_search_pages. On Postgres each row carries a tsvector
+# generated from the page text, under a GIN index; elsewhere (local SQLite runs)
+# the pages go into an FTS5 table instead. Indexing per page keeps every
+# snippet tied to its page, keeps ts_headline cheap (it re-parses the text it
+# highlights, so it only ever runs on the few pages shown) and stays clear of
+# the tsvector position limit on long contracts.
+
+import logging
+import re
+import uuid
+from typing import Any, Optional
+
+from sqlalchemy import bindparam, column, exists, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import Contract
+
+logger = logging.getLogger(__name__)
+
+# Postgres text search configuration used for both indexing and queries. The
+# stored vectors are generated with it (migration f3b7a0d52c86 spells out the
+# same value), so changing it needs a migration that regenerates search_vector.
+SEARCH_LANGUAGE = "english"
+# Snippets returned per matching contract, best pages first
+SEARCH_SNIPPETS_PER_CONTRACT = 3
+BACKFILL_BATCH_SIZE = 100
+
+PAGE_MARKER_RE = re.compile(r"^\[Page (\d+)\][ \t]*$", re.M)
+FTS_TOKEN_RE = re.compile(r"\w+", re.U)
+HIGHLIGHT_START, HIGHLIGHT_STOP = "<mark>", "</mark>"
+
+SEARCH_PAGES = table("contract_search_pages", column("contract_id"))
+
+# Bound with the contracts.id type so ids are stored exactly as contracts stores them
+DELETE_PAGES = text("DELETE FROM contract_search_pages WHERE contract_id = :contract_id").bindparams(
+    bindparam("contract_id", type_=Contract.__table__.c.id.type))
+INSERT_PAGE = text(
+    "INSERT INTO contract_search_pages (contract_id, page, body) VALUES (:contract_id, :page, :body)"
+).bindparams(bindparam("contract_id", type_=Contract.__table__.c.id.type))
+
+# Same schema as migration f3b7a0d52c86; covers deployments that rely on create_all
+POSTGRES_DDL = (
+    f"""
+    CREATE TABLE IF NOT EXISTS contract_search_pages (
+        contract_id UUID NOT NULL REFERENCES contracts (id) ON DELETE CASCADE,
+        page INTEGER NOT NULL,
+        body TEXT NOT NULL,
+        search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('{SEARCH_LANGUAGE}', body)) STORED,
+        PRIMARY KEY (contract_id, page)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_contract_search_pages_vector ON contract_search_pages USING GIN (search_vector)",
+)
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS contract_search_pages USING fts5("
+    "contract_id UNINDEXED, page UNINDEXED, body, tokenize = 'porter unicode61')",
+)
+
+
+def _is_postgres(bind) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+# Create the search table if it is missing (startup, next to create_all)
+def ensure_search_index(connection: Connection) -> None:
+    for statement in POSTGRES_DDL if _is_postgres(connection) else SQLITE_DDL:
+        connection.execute(text(statement))
+
+
+# [(page number, page text)], one entry per page number in order of first
+# appearance; text without markers is a single page 1. A marker that appears
+# more than once (a .txt upload that repeats it, or table output placed under
+# its page again) has all of its bodies joined into that one page.
+def split_pages(raw_text: str) -> list[tuple[int, str]]:
+    parts = PAGE_MARKER_RE.split(raw_text)
+    preamble, numbered = parts[0], parts[1:]
+    if not numbered:
+        return [(1, raw_text.strip())] if raw_text.strip() else []
+
+    pages: dict[int, list[str]] = {}
+    for i in range(0, len(numbered), 2):
+        body = numbered[i + 1]
+        if i == 0 and preamble.strip():
+            body = preamble + body
+        if body.strip():
+            pages.setdefault(int(numbered[i]), []).append(body.strip())
+    return [(page, "\n\n".join(bodies)) for page, bodies in pages.items()]
+
+
+# Replace a contract's indexed pages. Runs in the caller's transaction, so the
+# index commits together with raw_text. Async callers use AsyncSession.run_sync.
+def index_contract_text(db: Session, contract_id: Any, raw_text: Optional[str]) -> int:
+    contract_id = uuid.UUID(str(contract_id))
+    db.execute(DELETE_PAGES, {"contract_id": contract_id})
+    pages = split_pages(raw_text or "")
+    if pages:
+        db.execute(INSERT_PAGE, [{"contract_id": contract_id, "page": page, "body": body} for page, body in pages])
+    return len(pages)
+
+
+# Index contracts whose text was stored before search existed, in id order so
+# texts that yield no pages are not revisited. Returns the number indexed.
+def backfill_search_index(db: Session, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    indexed, last_id = 0, None
+    while True:
+        query = db.query(Contract.id, Contract.raw_text).filter(
+            Contract.raw_text.isnot(None),
+            ~exists().where(SEARCH_PAGES.c.contract_id == Contract.id),
+        )
+        if last_id is not None:
+            query = query.filter(Contract.id > last_id)
+        rows = query.order_by(Contract.id).limit(batch_size).all()
+        if not rows:
+            break
+        for row in rows:
+            index_contract_text(db, row.id, row.raw_text)
+        db.commit()
+        indexed += len(rows)
+        last_id = rows[-1].id
+
+    if indexed:
+        logger.info(f"Indexed text of {indexed} contracts for search")
+    return indexed
+
+
+# Contracts matching the query, best first, each with its best pages' snippets:
+# [{contract_id, filename, status, rank, matching_pages, snippets: ["[Page 3] ...<mark>late</mark> fee..."]}]
+async def search_contracts(db: AsyncSession, query: str, limit: int, offset: int = 0,
+                           status: Optional[str] = None) -> list[dict[str, Any]]:
+    if _is_postgres(db.bind):
+        rows = await _search_postgres(db, query, limit, offset, status)
+    else:
+        rows = await _search_sqlite(db, query, limit, offset, status)
+
+    results: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        contract_id = str(uuid.UUID(str(row.contract_id)))
+        result = results.setdefault(contract_id, {
+            "contract_id": contract_id,
+            "filename": row.original_filename,
+            "status": row.status.lower(),
+            "rank": round(float(row.contract_rank), 6),
+            "matching_pages": row.matching_pages,
+            "snippets": [],
+        })
+        result["snippets"].append(f"[Page {row.page}] {' '.join(row.snippet.split())}")
+    return list(results.values())
+
+
+# Contracts are ranked by the summed ts_rank_cd of their matching pages and
+# limited before ts_headline runs, so only the returned pages are highlighted
+async def _search_postgres(db: AsyncSession, query: str, limit: int, offset: int, status: Optional[str]):
+    status_filter = "AND c.status = CAST(:status AS contractstatus)" if status else ""
+    sql = f"""
+        WITH q AS (SELECT websearch_to_tsquery('{SEARCH_LANGUAGE}', :query) AS tsq),
+        hits AS (
+            SELECT p.contract_id, p.page, ts_rank_cd(p.search_vector, q.tsq) AS rank
+            FROM contract_search_pages p, q
+            WHERE p.search_vector @@ q.tsq
+        ),
+        top AS (
+            SELECT h.contract_id, sum(h.rank) AS contract_rank, count(*) AS matching_pages
+            FROM hits h JOIN contracts c ON c.id = h.contract_id
+            WHERE TRUE {status_filter}
+            GROUP BY h.contract_id
+            ORDER BY contract_rank DESC, h.contract_id
+            LIMIT :limit OFFSET :offset
+        ),
+        best AS (
+            SELECT h.contract_id, h.page, h.rank,
+                   row_number() OVER (PARTITION BY h.contract_id ORDER BY h.rank DESC, h.page) AS n
+            FROM hits h JOIN top USING (contract_id)
+        )
+        SELECT best.contract_id, best.page, top.contract_rank, top.matching_pages,
+               c.original_filename, c.status::text AS status,
+               ts_headline('{SEARCH_LANGUAGE}', p.body, q.tsq, :headline_options) AS snippet
+        FROM best
+        JOIN top USING (contract_id)
+        JOIN contracts c ON c.id = best.contract_id
+        JOIN contract_search_pages p ON p.contract_id = best.contract_id AND p.page = best.page
+        CROSS JOIN q
+        WHERE best.n <= :snippets
+        ORDER BY top.contract_rank DESC, best.contract_id, best.rank DESC
+    """
+    params = {
+        "query": query,
+        "limit": limit,
+        "offset": offset,
+        "snippets": SEARCH_SNIPPETS_PER_CONTRACT,
+        "headline_options": f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+                            "MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=\" … \"",
+    }
+    if status:
+        params["status"] = status.upper()
+    return (await db.execute(text(sql), params)).all()
+
+
+# FTS5 ranks with bm25 (lower is better); the query is reduced to quoted terms
+# so user input can never be a syntax error
+async def _search_sqlite(db: AsyncSession, query: str, limit: int, offset: int, status: Optional[str]):
+    terms = FTS_TOKEN_RE.findall(query)
+    if not terms:
+        return []
+    status_filter = "AND c.status = :status" if status else ""
+    sql = f"""
+        WITH hits AS (
+            SELECT contract_id, page, -bm25(contract_search_pages) AS rank,
+                   snippet(contract_search_pages, 2, :start, :stop, ' … ', 24) AS snippet
+            FROM contract_search_pages
+            WHERE contract_search_pages MATCH :match
+        ),
+        top AS (
+            SELECT h.contract_id, sum(h.rank) AS contract_rank, count(*) AS matching_pages
+            FROM hits h JOIN contracts c ON c.id = h.contract_id
+            WHERE 1 {status_filter}
+            GROUP BY h.contract_id
+            ORDER BY contract_rank DESC, h.contract_id
+            LIMIT :limit OFFSET :offset
+        ),
+        best AS (
+            SELECT h.*, row_number() OVER (PARTITION BY h.contract_id ORDER BY h.rank DESC, h.page) AS n
+            FROM hits h JOIN top USING (contract_id)
+        )
+        SELECT best.contract_id, best.page, best.snippet, top.contract_rank, top.matching_pages,
+               c.original_filename, c.status
+        FROM best
+        JOIN top USING (contract_id)
+        JOIN contracts c ON c.id = best.contract_id
+        WHERE best.n <= :snippets
+        ORDER BY top.contract_rank DESC, best.contract_id, best.rank DESC
+    """
+    params = {
+        "match": " ".join(f'"{term}"' for term in terms),
+        "start": HIGHLIGHT_START,
+        "stop": HIGHLIGHT_STOP,
+        "limit": limit,
+        "offset": offset,
+        "snippets": SEARCH_SNIPPETS_PER_CONTRACT,
+    }
+    if status:
+        params["status"] = status.upper()
+    return (await db.execute(text(sql), params)).all()
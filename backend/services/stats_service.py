@@ -0,0 +1,135 @@
+# Contract totals and dashboard stats, served from the contract_counts and
+# contract_stats_hourly tables (see models/stats.py)
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import Contract, ContractStatus, ContractStatusCount, ContractStatsHourly, bump_hourly_stats
+
+logger = logging.getLogger(__name__)
+
+# Same threshold the UI uses to flag a field for review
+LOW_CONFIDENCE_THRESHOLD = 0.7
+STATS_WINDOWS = {"1h": timedelta(hours=1), "24h": timedelta(hours=24), "7d": timedelta(days=7)}
+
+
+async def get_status_counts(db: AsyncSession) -> dict[str, int]:
+    counts = {status.value: 0 for status in ContractStatus}
+    for row in await db.scalars(select(ContractStatusCount)):
+        counts[row.status] = max(0, int(row.count))
+    return counts
+
+
+async def get_contract_total(db: AsyncSession, status: Optional[ContractStatus] = None, exact: bool = False) -> int:
+    if exact:
+        stmt = select(func.count(Contract.id))
+        if status:
+            stmt = stmt.where(Contract.status == status)
+        return await db.scalar(stmt)
+    counts = await get_status_counts(db)
+    return counts[status.value] if status else sum(counts.values())
+
+
+# Recount contracts by status and overwrite the counters. The counter rows are
+# locked first, so transactions that change a status while the recount runs
+# either finish before it or apply their delta after it.
+def reconcile_contract_counts(db: Session) -> dict[str, int]:
+    existing = {
+        row.status: row
+        for row in db.query(ContractStatusCount).with_for_update().all()
+    }
+    for status in ContractStatus:
+        if status.value not in existing:
+            existing[status.value] = ContractStatusCount(status=status.value, count=0)
+            db.add(existing[status.value])
+    db.flush()
+
+    actual = {status.value: 0 for status in ContractStatus}
+    for status, count in db.query(Contract.status, func.count(Contract.id)).group_by(Contract.status):
+        actual[status.value] = count
+
+    drifted = {s: (existing[s].count, n) for s, n in actual.items() if existing[s].count != n}
+    for status, count in actual.items():
+        existing[status].count = count
+    db.commit()
+
+    if drifted:
+        logger.info(f"Reconciled contract counts: {drifted}")
+    return actual
+
+
+# Count the fields of a billing config that carry a confidence score, and how
+# many of them fall below LOW_CONFIDENCE_THRESHOLD (nested parties included)
+def confidence_field_counts(billing_config: Optional[dict[str, Any]]) -> tuple[int, int]:
+    total = low = 0
+    for value in (billing_config or {}).values():
+        if not isinstance(value, dict):
+            continue
+        if "confidence" in value:
+            try:
+                confidence = float(value["confidence"] or 0.0)
+            except (TypeError, ValueError):
+                confidence = 0.0
+            total += 1
+            low += confidence < LOW_CONFIDENCE_THRESHOLD
+        else:
+            sub_total, sub_low = confidence_field_counts(value)
+            total += sub_total
+            low += sub_low
+    return total, low
+
+
+# Add a finished contract to the current hour's stats. Runs in the caller's
+# transaction, so it commits together with the status change. Async callers
+# use AsyncSession.run_sync.
+def record_contract_outcome(db: Session, status: ContractStatus, processing_seconds: Optional[float] = None,
+                            billing_config: Optional[dict[str, Any]] = None) -> None:
+    deltas: dict[str, Any] = {"completed" if status == ContractStatus.COMPLETED else "failed": 1}
+    if processing_seconds is not None:
+        deltas["processing_seconds"] = processing_seconds
+        deltas["processing_samples"] = 1
+    if billing_config is not None:
+        deltas["fields_total"], deltas["fields_low_confidence"] = confidence_field_counts(billing_config)
+    bump_hourly_stats(db.connection(), **deltas)
+
+
+# Status counts plus per-window throughput, latency and confidence. Reads the
+# counter rows and at most one aggregate row per hour of the longest window.
+async def get_dashboard_stats(db: AsyncSession) -> dict[str, Any]:
+    now = datetime.utcnow()
+    oldest = now - max(STATS_WINDOWS.values())
+    rows = (await db.scalars(select(ContractStatsHourly).where(
+        ContractStatsHourly.hour >= oldest.replace(minute=0, second=0, microsecond=0)
+    ))).all()
+
+    windows = {}
+    for name, span in STATS_WINDOWS.items():
+        # An hour bucket belongs to the window if any part of it does
+        start = (now - span).replace(minute=0, second=0, microsecond=0)
+        in_window = [r for r in rows if r.hour >= start]
+        samples = sum(r.processing_samples for r in in_window)
+        fields = sum(r.fields_total for r in in_window)
+        windows[name] = {
+            "uploaded": sum(r.uploaded for r in in_window),
+            "completed": sum(r.completed for r in in_window),
+            "failed": sum(r.failed for r in in_window),
+            "avg_processing_seconds": (
+                round(sum(r.processing_seconds for r in in_window) / samples, 2) if samples else None
+            ),
+            "low_confidence_field_share": (
+                round(sum(r.fields_low_confidence for r in in_window) / fields, 4) if fields else None
+            ),
+        }
+
+    counts = await get_status_counts(db)
+    return {
+        "status_counts": counts,
+        "total": sum(counts.values()),
+        "windows": windows,
+        "generated_at": now,
+    }
@@ -0,0 +1,52 @@
+# Streams uploaded files to disk in fixed-size chunks
+# Memory per upload is bounded by UPLOAD_CHUNK_SIZE, the sha256 is computed
+# while writing, and the file only appears at its final path once it is
+# complete (written to a hidden .part file, then renamed).
+
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(256 * 1024)))
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+@dataclass
+class SavedUpload:
+    path: Path
+    size: int
+    sha256: str
+
+
+async def save_upload(file: UploadFile, destination: Path, max_bytes: int) -> SavedUpload:
+    partial = destination.with_name(f".{destination.name}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(partial, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                await out.write(chunk)
+        await aiofiles.os.replace(partial, destination)
+    except BaseException:
+        try:
+            await aiofiles.os.remove(partial)
+        except FileNotFoundError:
+            pass
+        raise
+
+    return SavedUpload(path=destination, size=size, sha256=digest.hexdigest())
@@ -0,0 +1,43 @@
+# Tests run from backend/ (python -m pytest) against in-memory SQLite
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from database import Base  # noqa: E402
+import models  # noqa: E402,F401  (registers the tables)
+from services.search_service import ensure_search_index  # noqa: E402
+
+
+# One SQLite file shared by a sync and an async engine, with every table and the search index
+@pytest.fixture
+def sqlite_url(tmp_path):
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        ensure_search_index(conn)
+    engine.dispose()
+    return path
+
+
+@pytest.fixture
+def db(sqlite_url):
+    engine = create_engine(f"sqlite:///{sqlite_url}", poolclass=StaticPool)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def async_session_factory(sqlite_url):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{sqlite_url}")
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
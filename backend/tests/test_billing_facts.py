@@ -0,0 +1,56 @@
+import uuid
+
+from models import BillingFactUsageTier, BillingFacts, Contract
+from services.billing_facts import billing_facts_from_config, sync_billing_facts
+
+
+def _config(unit_price, value="1000", due_days=30):
+    return {
+        "contract_value": {"value": value, "currency": "usd"},
+        "payment_schedule": {"value": "Net 30", "due_days": due_days},
+        "usage_tiers": {"value": [{"tier_name": "Base", "unit_type": "API calls", "price_per_unit": unit_price}]},
+    }
+
+
+def test_values_beyond_a_column_are_dropped_per_column():
+    facts, tiers = billing_facts_from_config(_config("5000000000000", value="5000000000000", due_days=10 ** 12))
+
+    # 13 integer digits fit Numeric(18, 2) but not price_per_unit's Numeric(18, 6)
+    assert facts["contract_value"] == 5_000_000_000_000
+    assert tiers[0]["price_per_unit"] is None
+    # An out-of-range due_days falls back to the "Net 30" terms
+    assert facts["due_days"] == 30
+
+
+def test_unit_price_keeps_six_decimals():
+    _, tiers = billing_facts_from_config(_config("0.000125"))
+    assert str(tiers[0]["price_per_unit"]) == "0.000125"
+
+
+def test_sync_stores_large_but_valid_values(db):
+    contract = Contract(id=uuid.uuid4(), filename="c.pdf", original_filename="c.pdf", file_path="/tmp/c.pdf")
+    db.add(contract)
+    db.flush()
+
+    sync_billing_facts(db, contract.id, _config("999999999999", value="999999999999999"))
+    db.commit()
+
+    assert db.get(BillingFacts, contract.id).contract_value == 999_999_999_999_999
+    assert db.query(BillingFactUsageTier).one().price_per_unit == 999_999_999_999
+
+
+def test_amount_cap_matches_numeric_18_2():
+    assert billing_facts_from_config(_config("1", value="9999999999999999.99"))[0]["contract_value"] is not None
+    assert billing_facts_from_config(_config("1", value="10000000000000000"))[0]["contract_value"] is None
+
+
+def test_only_three_letter_currency_codes_are_stored():
+    def currency(value):
+        config = _config("1")
+        config["contract_value"]["currency"] = value
+        return billing_facts_from_config(config)[0]["currency"]
+
+    assert currency(" eur ") == "EUR"
+    assert currency("US Dollars") is None
+    assert currency("$") is None
+    assert currency("US1") is None
@@ -0,0 +1,51 @@
+import asyncio
+import uuid
+
+from sqlalchemy import event
+
+from models import Contract, ContractStatus
+from services import events
+
+
+def test_result_is_read_once_per_event_for_all_subscribers(db, async_session_factory, monkeypatch):
+    contract = Contract(
+        id=uuid.uuid4(), filename="c.pdf", original_filename="c.pdf", file_path="/tmp/c.pdf",
+        status=ContractStatus.PROCESSING, billing_config={"billing_frequency": {"value": "monthly"}},
+    )
+    db.add(contract)
+    db.commit()
+
+    async_engine = async_session_factory.kw["bind"]
+    monkeypatch.setattr(events, "async_engine", async_engine)
+    monkeypatch.setattr(events, "_uses_postgres", lambda: False)
+    queries = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    bus = events.ContractEventBus()
+    contract_id = str(contract.id)
+
+    async def run():
+        with bus.subscribe(contract_id) as first, bus.subscribe(contract_id) as second, \
+                bus.subscribe(contract_id) as third:
+            await bus.publish(contract_id, "field_extracted", fields=["billing_frequency"])
+            await bus.publish(contract_id, "llm_running")
+            return [[queue.get_nowait() for _ in range(2)] for queue in (first, second, third)]
+
+    received = asyncio.run(run())
+
+    assert len(queries) == 1
+    for field_event, progress_event in received:
+        assert field_event["billing_config"] == {"billing_frequency": {"value": "monthly"}}
+        assert "billing_config" not in progress_event
+
+
+def test_events_without_subscribers_are_not_loaded(async_session_factory, monkeypatch):
+    async_engine = async_session_factory.kw["bind"]
+    monkeypatch.setattr(events, "async_engine", async_engine)
+    monkeypatch.setattr(events, "_uses_postgres", lambda: False)
+    queries = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    asyncio.run(events.ContractEventBus().publish(str(uuid.uuid4()), "completed"))
+
+    assert queries == []
@@ -0,0 +1,53 @@
+import asyncio
+import json
+import uuid
+
+import httpx
+from fastapi import FastAPI
+
+from models import Contract, ContractStatus
+from routers import contracts
+
+
+def _add(db, status):
+    contract = Contract(
+        id=uuid.uuid4(), filename="c.pdf", original_filename=f"{status.value}.pdf", file_path="/tmp/c.pdf",
+        status=status, billing_config={"billing_frequency": {"value": "monthly", "confidence": 0.9}},
+    )
+    db.add(contract)
+    return contract
+
+
+def _export(monkeypatch, async_session_factory, query=""):
+    monkeypatch.setattr(contracts, "AsyncSessionLocal", async_session_factory)
+    app = FastAPI()
+    app.include_router(contracts.router)
+
+    async def get():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(f"/api/contracts/export?format=ndjson{query}")
+
+    response = asyncio.run(get())
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_export_skips_partial_configs_by_default(db, async_session_factory, monkeypatch):
+    completed = _add(db, ContractStatus.COMPLETED)
+    _add(db, ContractStatus.PROCESSING)
+    db.commit()
+
+    records = _export(monkeypatch, async_session_factory)
+
+    assert [record["contract_id"] for record in records] == [str(completed.id)]
+
+
+def test_export_partial_configs_on_request(db, async_session_factory, monkeypatch):
+    _add(db, ContractStatus.COMPLETED)
+    processing = _add(db, ContractStatus.PROCESSING)
+    db.commit()
+
+    records = _export(monkeypatch, async_session_factory, "&status=processing")
+
+    assert [record["contract_id"] for record in records] == [str(processing.id)]
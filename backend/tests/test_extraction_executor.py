@@ -0,0 +1,87 @@
+import asyncio
+
+import fitz
+import pytest
+
+from services import pdf_service
+from services.extraction_executor import ExtractionExecutor
+
+
+# Runs pool jobs in-process so tests can patch the PDF engines
+class InlineExecutor(ExtractionExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.calls = []
+
+    async def run(self, fn, *args, timeout=None):
+        self.calls.append((fn.__name__, args[1:3]))
+        return fn(*args)
+
+
+@pytest.fixture
+def long_pdf(tmp_path):
+    path = tmp_path / "long.pdf"
+    doc = fitz.open()
+    for number in range(1, 31):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Contract page {number} with enough words to count as text.")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _fail_range(failing_pages, original):
+    def extract(file_path, pages=None):
+        if pages and failing_pages & set(pages):
+            raise ValueError("corrupt content stream")
+        return original(file_path, pages)
+    return extract
+
+
+def _pages_in(text):
+    return [n for n in range(1, 31) if f"[Page {n}]" in text]
+
+
+def test_failed_range_falls_back_to_second_engine(monkeypatch, long_pdf):
+    monkeypatch.setattr(pdf_service, "PDF_EXTRACTION_MODE", "pdfplumber")
+    monkeypatch.setattr(pdf_service, "_pdfplumber_text", _fail_range({1}, pdf_service._pdfplumber_text))
+    executor = InlineExecutor()
+
+    text = asyncio.run(executor.extract_text(long_pdf))
+
+    assert _pages_in(text) == list(range(1, 31))
+    failed_range = [call for call in executor.calls if call[1][0] == 0]
+    assert [name for name, _ in failed_range] == [
+        "extract_pdf_page_range", "extract_pdf_page_range", "extract_pdf_fallback_range",
+    ]
+
+
+def test_transient_range_failure_is_retried(monkeypatch, long_pdf):
+    monkeypatch.setattr(pdf_service, "PDF_EXTRACTION_MODE", "pdfplumber")
+    original = pdf_service._pdfplumber_text
+    failures = []
+
+    def flaky(file_path, pages=None):
+        if pages and 1 in pages and not failures:
+            failures.append(pages)
+            raise ValueError("transient")
+        return original(file_path, pages)
+
+    monkeypatch.setattr(pdf_service, "_pdfplumber_text", flaky)
+    executor = InlineExecutor()
+
+    text = asyncio.run(executor.extract_text(long_pdf))
+
+    assert _pages_in(text) == list(range(1, 31))
+    assert not any(name == "extract_pdf_fallback_range" for name, _ in executor.calls)
+
+
+def test_range_lost_by_both_engines_is_logged(monkeypatch, long_pdf, caplog):
+    monkeypatch.setattr(pdf_service, "PDF_EXTRACTION_MODE", "pdfplumber")
+    monkeypatch.setattr(pdf_service, "_pdfplumber_text", _fail_range({1}, pdf_service._pdfplumber_text))
+    monkeypatch.setattr(pdf_service, "_extract_with_pymupdf", lambda file_path, pages=None: "")
+
+    text = asyncio.run(InlineExecutor().extract_text(long_pdf))
+
+    assert 1 not in _pages_in(text) and 30 in _pages_in(text)
+    assert "Lost pages 1-" in caplog.text
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from services.incremental_json import TopLevelFieldParser
+from services.llm_service import PartialExtractionError, _FieldStream, is_partial_extraction, _partial_config
+
+
+def test_fields_are_reported_as_they_complete():
+    parser = TopLevelFieldParser()
+
+    assert parser.feed('```json\n{"vendor": {"value": "Acme"}, "due') == [("vendor", {"value": "Acme"})]
+    assert parser.feed('_days": 30}') == [("due_days", 30)]
+    assert parser.complete and not parser.dropped
+
+
+def test_unparseable_member_is_listed_as_dropped():
+    parser = TopLevelFieldParser()
+
+    parser.feed('{"vendor": "Acme", "due_days": 30 days, "currency": "USD"}')
+
+    assert parser.fields == {"vendor": "Acme", "currency": "USD"}
+    assert parser.complete and parser.dropped == ['"due_days"']
+
+
+def _collect(text):
+    stream = _FieldStream("openai", "gpt-4o", None)
+
+    async def call():
+        stream.feed(text)
+
+    return asyncio.run(stream.collect(call()))
+
+
+def test_response_with_a_dropped_field_is_partial():
+    with pytest.raises(PartialExtractionError) as error:
+        _collect('{"vendor": "Acme", "due_days": 30 days}')
+
+    assert error.value.fields == {"vendor": "Acme"}
+    assert is_partial_extraction(_partial_config(error.value.fields))
+
+
+def test_complete_response_is_returned():
+    assert _collect('{"vendor": "Acme", "due_days": 30}') == {"vendor": "Acme", "due_days": 30}
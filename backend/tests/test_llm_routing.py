@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from services import llm_service, provider_health
+from services.llm_clients import ProviderNotConfigured
+from prometheus_client import REGISTRY
+
+
+@pytest.fixture(autouse=True)
+def fresh_health(monkeypatch):
+    monkeypatch.setattr(provider_health, "_providers", {})
+    monkeypatch.setattr(llm_service, "LLM_ROUTING_MODE", "sequential")
+
+
+def test_provider_without_key_is_skipped_without_tripping_its_breaker(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    called = []
+
+    async def anthropic_extract(user_prompt, on_field=None):
+        called.append("anthropic")
+        return {"billing_model": {"value": "flat", "confidence": 1.0}}
+
+    monkeypatch.setattr(llm_service, "_extract_with_anthropic", anthropic_extract)
+    fallbacks = REGISTRY.get_sample_value("llm_fallbacks_total", {"provider": "openai"})
+
+    for _ in range(10):
+        asyncio.run(llm_service._extract_with_fallback("prompt"))
+
+    openai = provider_health.get_provider_health("openai")
+    assert called == ["anthropic"] * 10
+    assert openai.calls == 0 and openai.breaker.state == provider_health.CLOSED
+    assert REGISTRY.get_sample_value("llm_fallbacks_total", {"provider": "openai"}) == fallbacks
+
+
+def test_no_configured_provider_is_a_configuration_error(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+
+    with pytest.raises(ProviderNotConfigured):
+        asyncio.run(llm_service._extract_with_fallback("prompt"))
+    assert provider_health.get_provider_health("openai").calls == 0
+
+
+def _streaming_provider(fields, delay=0.0, error=None):
+    async def extract(user_prompt, on_field=None):
+        for name, value in fields.items():
+            on_field(name, value)
+            await asyncio.sleep(delay)
+        if error:
+            raise error
+        return dict(fields)
+    return extract
+
+
+def test_hedged_race_streams_fields_from_one_provider_only(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(llm_service, "LLM_ROUTING_MODE", "hedged")
+    monkeypatch.setattr(provider_health.ProviderHealth, "hedge_delay", lambda self: 0.01)
+    # OpenAI streams first but is slow to finish; Anthropic, hedged in, wins the race
+    monkeypatch.setattr(llm_service, "_extract_with_openai",
+                        _streaming_provider({"vendor": "openai", "currency": "openai"}, delay=0.05))
+    monkeypatch.setattr(llm_service, "_extract_with_anthropic",
+                        _streaming_provider({"vendor": "anthropic", "due_days": "anthropic"}))
+    streamed = []
+
+    result = asyncio.run(llm_service._extract_with_fallback("prompt", lambda name, value: streamed.append(value)))
+
+    assert result == {"vendor": "anthropic", "due_days": "anthropic"}
+    assert set(streamed) == {"openai"}
+
+
+def test_fallback_after_cut_off_does_not_mix_streamed_fields(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    cut_off = llm_service.PartialExtractionError("openai", {"vendor": "openai"})
+    monkeypatch.setattr(llm_service, "_extract_with_openai", _streaming_provider({"vendor": "openai"}, error=cut_off))
+    monkeypatch.setattr(llm_service, "_extract_with_anthropic",
+                        _streaming_provider({"vendor": "anthropic", "due_days": "anthropic"}))
+    streamed = []
+
+    asyncio.run(llm_service._extract_with_fallback("prompt", lambda name, value: streamed.append((name, value))))
+
+    assert streamed == [("vendor", "openai")]
@@ -0,0 +1,28 @@
+from prometheus_client import REGISTRY
+
+from services.metrics import record_llm_usage, record_queue_depth, render_metrics
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_usage_is_counted_and_priced():
+    labels = {"provider": "anthropic", "model": "claude-opus-4-6"}
+    cached, cost = _sample("llm_tokens_total", direction="cached_input", **labels), _sample(
+        "llm_estimated_cost_usd_total", **labels)
+
+    record_llm_usage("anthropic", "claude-opus-4-6", 1_000, 100, cached_input_tokens=10_000)
+
+    assert _sample("llm_tokens_total", direction="cached_input", **labels) - cached == 10_000
+    # $5/M input, cache reads at 0.1x, $25/M output
+    assert round(_sample("llm_estimated_cost_usd_total", **labels) - cost, 6) == 0.0125
+
+
+def test_render_includes_queue_depth():
+    record_queue_depth({"queued": 3, "running": 1})
+
+    text = render_metrics().decode()
+
+    assert 'processing_jobs{status="queued"} 3.0' in text
+    assert "# TYPE contract_stage_duration_seconds histogram" in text
@@ -0,0 +1,20 @@
+from services.rule_extractor import MAX_SOURCE_CHARS, extract_rule_fields
+
+
+def test_long_final_sentence_with_match_near_its_end():
+    text = "word " * 80 + "payment is due Net 30 ok"
+
+    fields = extract_rule_fields(text).fields
+
+    source = fields["payment_schedule"]["source_text"]
+    assert "Net 30" in source and source.endswith("ok")
+    assert len(source) <= MAX_SOURCE_CHARS
+
+
+def test_long_first_sentence_with_match_near_its_start():
+    text = "Net 30 payment terms apply " + "word " * 80 + "."
+
+    source = extract_rule_fields(text).fields["payment_schedule"]["source_text"]
+
+    assert source.startswith("Net 30")
+    assert len(source) <= MAX_SOURCE_CHARS
@@ -0,0 +1,87 @@
+import asyncio
+import uuid
+
+from sqlalchemy import text
+
+from models import Contract, ContractStatus
+from services.search_service import index_contract_text, search_contracts, split_pages
+
+
+def _add_contract(db, raw_text: str, status=ContractStatus.COMPLETED) -> Contract:
+    contract = Contract(
+        id=uuid.uuid4(), filename="c.pdf", original_filename="c.pdf", file_path="uploads/c.pdf",
+        raw_text=raw_text, status=status,
+    )
+    db.add(contract)
+    db.commit()
+    index_contract_text(db, contract.id, raw_text)
+    db.commit()
+    return contract
+
+
+def _pages(db, contract_id) -> list[tuple[int, str]]:
+    rows = db.execute(
+        text("SELECT page, body FROM contract_search_pages WHERE contract_id = :id ORDER BY page"),
+        {"id": uuid.UUID(str(contract_id)).hex},
+    ).all()
+    return [(row.page, row.body) for row in rows]
+
+
+def test_split_pages_without_markers_is_one_page():
+    assert split_pages("  Net 30 payment terms.  ") == [(1, "Net 30 payment terms.")]
+    assert split_pages("   \n ") == []
+
+
+def test_split_pages_keeps_preamble_and_skips_empty_pages():
+    raw = "Master Agreement\n[Page 1]\nFees are due monthly.\n[Page 2]\n   \n[Page 3]\nLate fee of 1.5%."
+    assert split_pages(raw) == [
+        (1, "Master Agreement\n\nFees are due monthly."),
+        (3, "Late fee of 1.5%."),
+    ]
+
+
+def test_split_pages_joins_repeated_markers():
+    raw = "[Page 1]\nFirst part.\n[Page 2]\nSecond page.\n[Page 1]\n| Tier | Price |"
+    assert split_pages(raw) == [(1, "First part.\n\n| Tier | Price |"), (2, "Second page.")]
+
+
+def test_index_contract_text_with_repeated_markers(db):
+    contract = _add_contract(db, "[Page 1]\nAlpha\n[Page 1]\nBeta\n[Page 2]\nGamma")
+    assert _pages(db, contract.id) == [(1, "Alpha\n\nBeta"), (2, "Gamma")]
+
+
+def test_index_contract_text_replaces_previous_pages(db):
+    contract = _add_contract(db, "[Page 1]\nOld text\n[Page 2]\nMore old text")
+    assert index_contract_text(db, contract.id, "Replacement text") == 1
+    db.commit()
+    assert _pages(db, contract.id) == [(1, "Replacement text")]
+
+
+def test_search_returns_highlighted_snippets_by_page(db, async_session_factory):
+    late = _add_contract(db, "[Page 1]\nServices agreement.\n[Page 2]\nA late fee of 1.5% applies to overdue invoices.")
+    _add_contract(db, "[Page 1]\nNo billing penalties here.")
+    _add_contract(db, "[Page 1]\nAnother late fee clause.", status=ContractStatus.FAILED)
+
+    async def run(**kwargs):
+        async with async_session_factory() as session:
+            return await search_contracts(session, "late fee", limit=10, **kwargs)
+
+    results = asyncio.run(run())
+    assert len(results) == 2
+
+    results = asyncio.run(run(status="COMPLETED"))
+    assert [r["contract_id"] for r in results] == [str(late.id)]
+    assert results[0]["status"] == "completed"
+    assert results[0]["matching_pages"] == 1
+    assert results[0]["snippets"] == ["[Page 2] A <mark>late</mark> <mark>fee</mark> of 1.5% applies to overdue invoices."]
+
+
+def test_search_ignores_query_syntax(db, async_session_factory):
+    _add_contract(db, "[Page 1]\nNet 30 payment terms.")
+
+    async def run(query):
+        async with async_session_factory() as session:
+            return await search_contracts(session, query, limit=10)
+
+    assert len(asyncio.run(run('net "30 ('))) == 1
+    assert asyncio.run(run("***")) == []
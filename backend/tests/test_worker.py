@@ -0,0 +1,47 @@
+import asyncio
+import types
+
+import worker as worker_module
+
+
+def _fake_queue(monkeypatch, lease_held):
+    calls = []
+
+    async def queue_call(fn, *args):
+        calls.append(fn.__name__)
+        if fn is worker_module.heartbeat_job:
+            return lease_held
+    monkeypatch.setattr(worker_module, "_queue_call", queue_call)
+    monkeypatch.setattr(worker_module, "JOB_HEARTBEAT_SECONDS", 0.01)
+    return calls
+
+
+def _run(monkeypatch, seconds):
+    finished = []
+
+    async def process(self, contract_id):
+        await asyncio.sleep(seconds)
+        finished.append(contract_id)
+    monkeypatch.setattr(worker_module.Worker, "_process", process)
+
+    job = types.SimpleNamespace(id="job-1", contract_id="contract-1", attempts=1)
+    asyncio.run(worker_module.Worker(concurrency=1)._run_job(job))
+    return finished
+
+
+def test_lost_lease_cancels_the_attempt_without_completing_the_job(monkeypatch):
+    calls = _fake_queue(monkeypatch, lease_held=False)
+
+    finished = _run(monkeypatch, seconds=5)
+
+    assert finished == []
+    assert calls == ["heartbeat_job"]
+
+
+def test_held_lease_completes_the_job(monkeypatch):
+    calls = _fake_queue(monkeypatch, lease_held=True)
+
+    finished = _run(monkeypatch, seconds=0.05)
+
+    assert finished == ["contract-1"]
+    assert calls[-1] == "complete_job" and "fail_job" not in calls
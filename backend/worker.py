@@ -0,0 +1,189 @@
+# Contract processing worker
+# Runs separately from the API (`python worker.py`) and scales horizontally:
+# every worker process polls the processing_jobs table and claims work with
+# SELECT ... FOR UPDATE SKIP LOCKED, so adding replicas adds ingest throughput.
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+
+import uvicorn
+from dotenv import load_dotenv
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+load_dotenv()
+
+from database import AsyncSessionLocal, async_engine
+from services.job_queue import (
+    JOB_LEASE_SECONDS, claim_job, heartbeat_job, complete_job, count_open_jobs, fail_job, requeue_expired_jobs,
+)
+from services.extraction_executor import extraction_executor
+from services.llm_clients import aclose_llm_clients
+from services.metrics import METRICS_CONTENT_TYPE, record_queue_depth, render_metrics
+from services.provider_health import provider_health_snapshot
+from services.pipeline import process_contract
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s — %(name)s — %(levelname)s — %(message)s"
+)
+logger = logging.getLogger("worker")
+
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "4"))
+WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", str(JOB_LEASE_SECONDS / 4)))
+REAPER_INTERVAL_SECONDS = float(os.getenv("REAPER_INTERVAL_SECONDS", "30"))
+# Port for the worker's status endpoints; 0 disables them
+WORKER_STATUS_PORT = int(os.getenv("WORKER_STATUS_PORT", "8001"))
+
+# LLM calls happen in the worker, so provider health is served from here
+status_app = FastAPI(title="Contract Parser Worker")
+
+
+@status_app.get("/health")
+def worker_health():
+    return {"status": "ok", "service": "contract-parser-worker"}
+
+
+@status_app.get("/health/llm")
+def llm_health():
+    return {"providers": provider_health_snapshot()}
+
+
+# Stage timings, token usage and cost, cache and fallback counters of this worker process
+# (or every process sharing PROMETHEUS_MULTIPROC_DIR)
+@status_app.get("/metrics")
+async def worker_metrics():
+    try:
+        record_queue_depth(await _queue_call(count_open_jobs))
+    except Exception as e:
+        logger.error(f"Could not read the queue depth: {e}")
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+# Run a short-lived queue operation with its own session. The queue functions
+# are sync; run_sync drives them over the async connection without blocking the loop.
+async def _queue_call(fn, *args):
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(fn, *args)
+
+
+class Worker:
+    def __init__(self, concurrency: int = WORKER_CONCURRENCY):
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        if not self._stopping.is_set():
+            logger.info("Shutdown requested, finishing in-flight jobs...")
+            self._stopping.set()
+
+    async def run(self):
+        logger.info(f"Worker {self.worker_id} starting with concurrency={self.concurrency}")
+        slots = [asyncio.create_task(self._slot(i)) for i in range(self.concurrency)]
+        reaper = asyncio.create_task(self._reaper())
+        status_server = None
+        if WORKER_STATUS_PORT:
+            status_server = uvicorn.Server(uvicorn.Config(
+                status_app, host="0.0.0.0", port=WORKER_STATUS_PORT, log_level="warning",
+            ))
+            status_task = asyncio.create_task(status_server.serve())
+
+        await self._stopping.wait()
+        await asyncio.gather(*slots)
+        reaper.cancel()
+        if status_server:
+            status_server.should_exit = True
+            await status_task
+        extraction_executor.shutdown()
+        await aclose_llm_clients()
+        await async_engine.dispose()
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    # One slot processes one job at a time, so concurrency == number of slots
+    async def _slot(self, index: int):
+        while not self._stopping.is_set():
+            try:
+                job = await _queue_call(claim_job, self.worker_id)
+            except Exception as e:
+                logger.error(f"Slot {index} failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                await self._sleep(WORKER_POLL_INTERVAL)
+                continue
+
+            await self._run_job(job)
+
+    async def _run_job(self, job):
+        logger.info(f"Claimed job {job.id} for contract {job.contract_id} (attempt {job.attempts})")
+        processing = asyncio.create_task(self._process(job.contract_id))
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, processing))
+        try:
+            await processing
+        except asyncio.CancelledError:
+            # Cancelled by the heartbeat: the job now belongs to another worker, which records the outcome
+            if heartbeat.done() and not heartbeat.cancelled():
+                logger.warning(f"Abandoned job {job.id} after losing its lease")
+                return
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} crashed: {e}")
+            await _queue_call(fail_job, job.id, self.worker_id, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        await _queue_call(complete_job, job.id, self.worker_id)
+
+    async def _process(self, contract_id):
+        async with AsyncSessionLocal() as db:
+            await process_contract(contract_id, db)
+
+    # Extend the job's lease while it runs. Once the lease is lost the reaper may
+    # already have handed the job to another worker, so this attempt is cancelled
+    # rather than left to write results in parallel with the new one.
+    async def _heartbeat(self, job_id: str, processing: asyncio.Task):
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                if not await _queue_call(heartbeat_job, job_id, self.worker_id):
+                    logger.warning(f"Lost lease on job {job_id}; cancelling this attempt")
+                    processing.cancel()
+                    return
+            except Exception as e:
+                logger.error(f"Heartbeat for job {job_id} failed: {e}")
+
+    # Recover jobs whose worker died without finishing them
+    async def _reaper(self):
+        while True:
+            try:
+                recovered = await _queue_call(requeue_expired_jobs)
+                if recovered:
+                    logger.info(f"Recovered {recovered} stuck job(s)")
+            except Exception as e:
+                logger.error(f"Reaper failed: {e}")
+            await asyncio.sleep(REAPER_INTERVAL_SECONDS)
+
+    async def _sleep(self, seconds: float):
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def main():
+    worker = Worker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,47 +1,45 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useCallback } from "react";
 import { useRouter } from "next/navigation";
 import AppShell from "@/components/AppShell";
-import { listContracts, getContract, AuditEntry, ContractSummary } from "@/lib/api";
+import { getAuditFeed, AuditFeedEntry } from "@/lib/api";
 import { Loader2 } from "lucide-react";
 
-interface AuditWithContract extends AuditEntry {
-  contractName: string;
-  contractId: string;
-}
+const ACTION_FILTERS = ["all", "extracted", "edited", "exported"] as const;
+type ActionFilter = (typeof ACTION_FILTERS)[number];
+
+const feedFilters = (action: ActionFilter) => (action === "all" ? {} : { action });
 
 export default function AuditPage() {
-  const [entries, setEntries] = useState<AuditWithContract[]>([]);
+  const [entries, setEntries] = useState<AuditFeedEntry[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [action, setAction] = useState<ActionFilter>("all");
   const router = useRouter();
 
   useEffect(() => {
-    (async () => {
-      try {
-        const { contracts } = await listContracts(0, 50);
-        const all: AuditWithContract[] = [];
-
-        await Promise.all(
-          contracts
-            .filter(c => c.status === "completed")
-            .map(async (c: ContractSummary) => {
-              try {
-                const full = await getContract(c.id);
-                full.audit_log.forEach(entry => {
-                  all.push({ ...entry, contractName: c.filename, contractId: c.id });
-                });
-              } catch {}
-            })
-        );
+    setLoading(true);
+    getAuditFeed(feedFilters(action))
+      .then((page) => {
+        setEntries(page.entries);
+        setNextCursor(page.next_cursor);
+      })
+      .finally(() => setLoading(false));
+  }, [action]);
 
-        all.sort((a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime());
-        setEntries(all);
-      } finally {
-        setLoading(false);
-      }
-    })();
-  }, []);
+  const loadMore = useCallback(async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await getAuditFeed(feedFilters(action), nextCursor);
+      setEntries((prev) => [...prev, ...page.entries]);
+      setNextCursor(page.next_cursor);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [nextCursor, action]);
 
   const actionColor: Record<string, { color: string; bg: string; symbol: string }> = {
     extracted: { color: "var(--accent)",   bg: "var(--accent-light)",  symbol: "→" },
@@ -57,6 +55,22 @@ export default function AuditPage() {
           <p className="text-sm mt-0.5" style={{ color: "var(--text-secondary)" }}>
             Complete history of all contract processing activities
           </p>
+          <div className="flex gap-2 mt-4">
+            {ACTION_FILTERS.map((a) => (
+              <button
+                key={a}
+                onClick={() => setAction(a)}
+                className="px-3 py-1 rounded-full text-xs font-medium capitalize border transition-colors"
+                style={{
+                  borderColor: action === a ? "var(--accent)" : "var(--border)",
+                  color: action === a ? "var(--accent)" : "var(--text-secondary)",
+                  background: action === a ? "var(--accent-light)" : "var(--surface)",
+                }}
+              >
+                {a}
+              </button>
+            ))}
+          </div>
         </div>
 
         {loading ? (
@@ -77,7 +91,7 @@ export default function AuditPage() {
                   key={entry.id}
                   className="flex items-start gap-4 p-4 rounded-xl border cursor-pointer transition-colors"
                   style={{ background: "var(--surface)", borderColor: "var(--border)" }}
-                  onClick={() => router.push(`/contracts/${entry.contractId}`)}
+                  onClick={() => router.push(`/contracts/${entry.contract_id}`)}
                   onMouseEnter={e => (e.currentTarget.style.borderColor = "var(--border-strong)")}
                   onMouseLeave={e => (e.currentTarget.style.borderColor = "var(--border)")}
                 >
@@ -98,7 +112,7 @@ export default function AuditPage() {
                       </span>
                     </div>
                     <p className="text-xs truncate" style={{ color: "var(--text-secondary)" }}>
-                      {entry.contractName}
+                      {entry.contract_filename}
                     </p>
                     {entry.reason && (
                       <p className="text-xs mt-1" style={{ color: "var(--text-muted)" }}>{entry.reason}</p>
@@ -121,6 +135,12 @@ export default function AuditPage() {
                 </div>
               );
             })}
+            {nextCursor && (
+              <button onClick={loadMore} disabled={loadingMore}
+                className="text-sm mt-2 disabled:opacity-60" style={{ color: "var(--accent)" }}>
+                {loadingMore ? "Loading..." : "Load more"}
+              </button>
+            )}
           </div>
         )}
       </div>
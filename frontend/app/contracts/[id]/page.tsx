@@ -3,7 +3,9 @@
 import { useState, useEffect, useCallback } from "react";
 import { useParams, useRouter } from "next/navigation";
 import AppShell from "@/components/AppShell";
-import { getContract, updateField, exportContract, Contract, BillingConfig } from "@/lib/api";
+import {
+  getContract, getContractAudit, updateField, exportContract, subscribeToContract, Contract, BillingConfig, ContractEventName,
+} from "@/lib/api";
 import {
   ArrowLeft, Loader2, AlertTriangle, CheckCircle2, Download,
   Pencil, Check, X, ChevronDown, ChevronUp, FileJson, FileText as FileCsv
@@ -162,6 +164,13 @@ function Section({ title, children }: { title: string; children: React.ReactNode
   );
 }
 
+const STAGE_LABELS: Partial<Record<ContractEventName, string>> = {
+  processing: "Extracting text from the document...",
+  text_extracted: "Text extracted, preparing billing term extraction...",
+  llm_running: "Extracting billing terms, payment schedules, usage tiers...",
+  field_extracted: "Billing terms are being saved as they are extracted...",
+};
+
 // ── Main page ───────────────────────────────────────────────────────────────
 export default function ContractPage() {
   const { id } = useParams<{ id: string }>();
@@ -171,6 +180,9 @@ export default function ContractPage() {
   const [tab, setTab]           = useState<"fields" | "raw" | "audit">("fields");
   const [exporting, setExporting] = useState(false);
   const [pollingId, setPollingId] = useState<string | null>(null);
+  const [streamFailed, setStreamFailed] = useState(false);
+  const [stage, setStage] = useState<ContractEventName | null>(null);
+  const [loadingAudit, setLoadingAudit] = useState(false);
 
   const load = useCallback(async () => {
     try {
@@ -185,17 +197,56 @@ export default function ContractPage() {
 
   useEffect(() => { load(); }, [load]);
 
+  // Follow progress over SSE; poll only if the event stream is unavailable
   useEffect(() => {
     if (!pollingId) return;
+    if (!streamFailed) {
+      return subscribeToContract(
+        pollingId,
+        (event) => {
+          setStage(event.event);
+          setContract((c) => c && {
+            ...c,
+            status: event.status,
+            ...(event.billing_config !== undefined && { billing_config: event.billing_config ?? undefined }),
+            ...(event.error_message !== undefined && { error_message: event.error_message }),
+          });
+          // Fetch raw text and the audit log once, now that they are final
+          if (event.event === "completed" || event.event === "failed") load();
+        },
+        () => setStreamFailed(true)
+      );
+    }
     const iv = setInterval(load, 2500);
     return () => clearInterval(iv);
-  }, [pollingId, load]);
+  }, [pollingId, streamFailed, load]);
 
   const handleSave = async (path: string, val: string, reason: string) => {
-    await updateField(id, path, val, reason);
+    try {
+      await updateField(id, path, val, reason, contract?.version);
+    } catch (e) {
+      // Rejected as stale: show the other reviewer's changes before a retry
+      await load();
+      throw e;
+    }
     await load();
   };
 
+  const loadOlderAudit = async () => {
+    if (!contract?.audit_next_cursor) return;
+    setLoadingAudit(true);
+    try {
+      const page = await getContractAudit(id, contract.audit_next_cursor);
+      setContract((c) => c && {
+        ...c,
+        audit_log: [...c.audit_log, ...page.audit_log],
+        audit_next_cursor: page.next_cursor,
+      });
+    } finally {
+      setLoadingAudit(false);
+    }
+  };
+
   const handleExport = async (fmt: "json" | "csv") => {
     setExporting(true);
     try { await exportContract(id, fmt); await load(); }
@@ -273,7 +324,7 @@ export default function ContractPage() {
             <div>
               <p className="text-sm font-medium" style={{ color: "#1E3A8A" }}>Parsing contract...</p>
               <p className="text-xs mt-0.5" style={{ color: "#3B82F6" }}>
-                Extracting billing terms, payment schedules, usage tiers. This takes 5–15 seconds.
+                {(stage && STAGE_LABELS[stage]) || "Extracting billing terms, payment schedules, usage tiers."} This takes 5–15 seconds.
               </p>
             </div>
           </div>
@@ -497,6 +548,12 @@ export default function ContractPage() {
                     </div>
                   ))
                 )}
+                {contract.audit_next_cursor && (
+                  <button onClick={loadOlderAudit} disabled={loadingAudit}
+                    className="text-sm mt-2 disabled:opacity-60" style={{ color: "var(--accent)" }}>
+                    {loadingAudit ? "Loading..." : "Load older entries"}
+                  </button>
+                )}
               </div>
             )}
           </>
@@ -5,7 +5,7 @@ import { useRouter } from "next/navigation";
 import Link from "next/link";
 import AppShell from "@/components/AppShell";
 import StatCard from "@/components/StatCard";
-import { listContracts, ContractSummary } from "@/lib/api";
+import { listContracts, getStats, ContractSummary, DashboardStats } from "@/lib/api";
 import { Eye, Upload, AlertTriangle, CheckCircle2, Loader2, Clock } from "lucide-react";
 import clsx from "clsx";
 
@@ -18,18 +18,23 @@ const statusConfig: Record<string, { label: string; color: string; bg: string; i
 
 export default function DashboardPage() {
   const [contracts, setContracts] = useState<ContractSummary[]>([]);
+  const [stats, setStats] = useState<DashboardStats | null>(null);
   const [loading, setLoading] = useState(true);
   const router = useRouter();
 
   useEffect(() => {
-    listContracts(0, 50)
+    listContracts(50)
       .then((r) => setContracts(r.contracts))
       .finally(() => setLoading(false));
+    getStats().then(setStats).catch(() => setStats(null));
   }, []);
 
-  const completed   = contracts.filter((c) => c.status === "completed").length;
-  const needsReview = contracts.filter((c) => c.status === "processing" || c.status === "pending").length;
-  const failed      = contracts.filter((c) => c.status === "failed").length;
+  const counts      = stats?.status_counts;
+  const total       = stats?.total ?? 0;
+  const completed   = counts?.completed ?? 0;
+  const needsReview = (counts?.processing ?? 0) + (counts?.pending ?? 0);
+  const failed      = counts?.failed ?? 0;
+  const day         = stats?.windows["24h"];
 
   return (
     <AppShell>
@@ -52,12 +57,27 @@ export default function DashboardPage() {
         </div>
 
         <div className="grid grid-cols-4 gap-4 mb-8">
-          <StatCard label="Total" value={contracts.length} sub="All time" />
-          <StatCard label="Completed" value={completed} subPositive sub={completed > 0 ? "Processed" : "—"} />
+          <StatCard label="Total" value={total} sub={day ? `${day.uploaded} uploaded in 24h` : "All time"} />
+          <StatCard label="Completed" value={completed} subPositive sub={day && day.completed > 0 ? `${day.completed} in 24h` : completed > 0 ? "Processed" : "—"} />
           <StatCard label="In Progress" value={needsReview} sub={needsReview > 0 ? "Processing" : "Queue empty"} />
           <StatCard label="Failed" value={failed} sub={failed > 0 ? "Needs attention" : "None"} />
         </div>
 
+        {day && (day.avg_processing_seconds !== null || day.low_confidence_field_share !== null) && (
+          <div className="grid grid-cols-4 gap-4 mb-8">
+            <StatCard
+              label="Avg. Processing (24h)"
+              value={day.avg_processing_seconds !== null ? `${day.avg_processing_seconds.toFixed(1)}s` : "—"}
+              sub={day.failed > 0 ? `${day.failed} failed in 24h` : "No failures in 24h"}
+            />
+            <StatCard
+              label="Low Confidence (24h)"
+              value={day.low_confidence_field_share !== null ? `${Math.round(day.low_confidence_field_share * 100)}%` : "—"}
+              sub="Of extracted fields"
+            />
+          </div>
+        )}
+
         <div className="rounded-xl border overflow-hidden" style={{ background: "var(--surface)", borderColor: "var(--border)" }}>
           <div className="px-5 py-4 border-b" style={{ borderColor: "var(--border)" }}>
             <h2 className="text-sm font-semibold" style={{ color: "var(--text-primary)" }}>All Contracts</h2>
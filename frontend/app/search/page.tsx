@@ -0,0 +1,123 @@
+"use client";
+
+import { useState, useCallback } from "react";
+import { useRouter } from "next/navigation";
+import AppShell from "@/components/AppShell";
+import { searchContracts, SearchResult } from "@/lib/api";
+import { Loader2, Search } from "lucide-react";
+
+const PAGE_SIZE = 20;
+
+// Snippets mark matches with <mark>…</mark>; render them without injecting HTML
+function Snippet({ text }: { text: string }) {
+  const parts = text.split(/(<mark>.*?<\/mark>)/g);
+  return (
+    <p className="text-xs leading-relaxed" style={{ color: "var(--text-secondary)" }}>
+      {parts.map((part, i) =>
+        part.startsWith("<mark>") ? (
+          <mark key={i} className="rounded px-0.5" style={{ background: "var(--amber-light)", color: "var(--text-primary)" }}>
+            {part.slice(6, -7)}
+          </mark>
+        ) : (
+          <span key={i}>{part}</span>
+        )
+      )}
+    </p>
+  );
+}
+
+export default function SearchPage() {
+  const [query, setQuery] = useState("");
+  const [submitted, setSubmitted] = useState<string | null>(null);
+  const [results, setResults] = useState<SearchResult[]>([]);
+  const [hasMore, setHasMore] = useState(false);
+  const [loading, setLoading] = useState(false);
+  const router = useRouter();
+
+  const runSearch = useCallback(async (q: string, offset: number) => {
+    setLoading(true);
+    try {
+      const page = await searchContracts(q, offset, PAGE_SIZE);
+      setResults((prev) => (offset === 0 ? page.results : [...prev, ...page.results]));
+      setHasMore(page.results.length === PAGE_SIZE);
+      setSubmitted(q);
+    } finally {
+      setLoading(false);
+    }
+  }, []);
+
+  return (
+    <AppShell>
+      <div className="animate-in">
+        <div className="mb-8">
+          <h1 className="text-xl font-semibold" style={{ color: "var(--text-primary)" }}>Search</h1>
+          <p className="text-sm mt-0.5" style={{ color: "var(--text-secondary)" }}>
+            Find clauses across the text of every processed contract
+          </p>
+          <form
+            className="flex gap-2 mt-4 max-w-3xl"
+            onSubmit={(e) => { e.preventDefault(); if (query.trim()) runSearch(query.trim(), 0); }}
+          >
+            <input
+              value={query}
+              onChange={(e) => setQuery(e.target.value)}
+              placeholder='e.g. late fee, "termination for convenience"'
+              className="flex-1 px-3 py-2 rounded-lg border text-sm outline-none"
+              style={{ borderColor: "var(--border)", background: "var(--surface)", color: "var(--text-primary)" }}
+            />
+            <button
+              type="submit"
+              className="flex items-center gap-2 px-4 py-2 rounded-lg text-sm font-medium text-white"
+              style={{ backgroundColor: "var(--accent)" }}
+            >
+              <Search className="w-4 h-4" />
+              Search
+            </button>
+          </form>
+        </div>
+
+        {loading && results.length === 0 ? (
+          <div className="flex items-center gap-2 py-16 justify-center" style={{ color: "var(--text-muted)" }}>
+            <Loader2 className="w-4 h-4 spinner" />
+            <span className="text-sm">Searching...</span>
+          </div>
+        ) : submitted !== null && results.length === 0 ? (
+          <p className="text-sm py-16 text-center" style={{ color: "var(--text-muted)" }}>
+            No contracts mention &ldquo;{submitted}&rdquo;.
+          </p>
+        ) : (
+          <div className="max-w-3xl space-y-2">
+            {results.map((result) => (
+              <div
+                key={result.contract_id}
+                className="p-4 rounded-xl border cursor-pointer transition-colors"
+                style={{ background: "var(--surface)", borderColor: "var(--border)" }}
+                onClick={() => router.push(`/contracts/${result.contract_id}`)}
+                onMouseEnter={e => (e.currentTarget.style.borderColor = "var(--border-strong)")}
+                onMouseLeave={e => (e.currentTarget.style.borderColor = "var(--border)")}
+              >
+                <div className="flex items-baseline justify-between gap-2 mb-2">
+                  <span className="text-sm font-medium truncate" style={{ color: "var(--text-primary)" }}>
+                    {result.filename}
+                  </span>
+                  <span className="text-xs font-mono flex-shrink-0" style={{ color: "var(--text-muted)" }}>
+                    {result.matching_pages} {result.matching_pages === 1 ? "page" : "pages"}
+                  </span>
+                </div>
+                <div className="space-y-1.5">
+                  {result.snippets.map((snippet, i) => <Snippet key={i} text={snippet} />)}
+                </div>
+              </div>
+            ))}
+            {hasMore && submitted && (
+              <button onClick={() => runSearch(submitted, results.length)} disabled={loading}
+                className="text-sm mt-2 disabled:opacity-60" style={{ color: "var(--accent)" }}>
+                {loading ? "Loading..." : "More results"}
+              </button>
+            )}
+          </div>
+        )}
+      </div>
+    </AppShell>
+  );
+}
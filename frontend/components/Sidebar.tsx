@@ -2,12 +2,13 @@
 
 import { usePathname } from "next/navigation";
 import Link from "next/link";
-import { LayoutDashboard, Upload, History, FileText } from "lucide-react";
+import { LayoutDashboard, Upload, History, FileText, Search } from "lucide-react";
 import clsx from "clsx";
 
 const nav = [
   { href: "/", label: "Dashboard", icon: LayoutDashboard },
   { href: "/upload", label: "Upload Contract", icon: Upload },
+  { href: "/search", label: "Search", icon: Search },
   { href: "/audit", label: "Audit Log", icon: History },
 ];
 
@@ -62,6 +62,18 @@ export interface AuditEntry {
   created_at: string;
 }
 
+export interface AuditFeedEntry extends AuditEntry {
+  contract_id: string;
+  contract_filename: string;
+}
+
+export interface AuditFeedFilters {
+  action?: string;
+  field?: string;
+  since?: string;
+  until?: string;
+}
+
 export interface Contract {
   id: string;
   filename: string;
@@ -71,7 +83,29 @@ export interface Contract {
   error_message?: string | null;
   created_at: string;
   updated_at: string;
+  version: number;
   audit_log: AuditEntry[];
+  audit_next_cursor?: string | null;
+}
+
+export type ContractEventName =
+  | "status"
+  | "processing"
+  | "text_extracted"
+  | "llm_running"
+  | "field_extracted"
+  | "completed"
+  | "failed";
+
+export interface ContractEvent {
+  contract_id: string;
+  event: ContractEventName;
+  status: Contract["status"];
+  chars?: number;
+  cache_hit?: boolean;
+  fields?: string[];
+  billing_config?: BillingConfig | null;
+  error_message?: string | null;
 }
 
 export interface ContractSummary {
@@ -82,6 +116,30 @@ export interface ContractSummary {
   updated_at: string;
 }
 
+export interface SearchResult {
+  contract_id: string;
+  filename: string;
+  status: string;
+  rank: number;
+  matching_pages: number;
+  snippets: string[];
+}
+
+export interface StatsWindow {
+  uploaded: number;
+  completed: number;
+  failed: number;
+  avg_processing_seconds: number | null;
+  low_confidence_field_share: number | null;
+}
+
+export interface DashboardStats {
+  status_counts: Record<"pending" | "processing" | "completed" | "failed", number>;
+  total: number;
+  windows: Record<"1h" | "24h" | "7d", StatsWindow>;
+  generated_at: string;
+}
+
 // ── API functions ─────────────────────────────────────────────────────────
 
 export async function uploadContract(file: File): Promise<{ contract_id: string; status: string }> {
@@ -107,30 +165,138 @@ export async function getContract(id: string): Promise<Contract> {
   return res.json();
 }
 
-export async function listContracts(skip = 0, limit = 20): Promise<{
+export async function getContractAudit(
+  id: string,
+  cursor?: string | null,
+  limit = 50
+): Promise<{ audit_log: AuditEntry[]; next_cursor: string | null }> {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) params.set("cursor", cursor);
+  const res = await fetch(`${API_URL}/api/contracts/${id}/audit?${params}`);
+  if (!res.ok) throw new Error("Failed to load audit log");
+  return res.json();
+}
+
+export async function getAuditFeed(
+  filters: AuditFeedFilters = {},
+  cursor?: string | null,
+  limit = 50
+): Promise<{ entries: AuditFeedEntry[]; next_cursor: string | null }> {
+  const params = new URLSearchParams({ limit: String(limit) });
+  for (const [key, value] of Object.entries(filters)) {
+    if (value) params.set(key, value);
+  }
+  if (cursor) params.set("cursor", cursor);
+  const res = await fetch(`${API_URL}/api/audit?${params}`);
+  if (!res.ok) throw new Error("Failed to load audit log");
+  return res.json();
+}
+
+/**
+ * Subscribe to processing progress over Server-Sent Events. The stream ends
+ * after a "completed" or "failed" event; onError is called if the stream cannot
+ * be used, so callers can fall back to polling. Returns an unsubscribe function.
+ */
+export function subscribeToContract(
+  id: string,
+  onEvent: (event: ContractEvent) => void,
+  onError: () => void
+): () => void {
+  if (typeof EventSource === "undefined") {
+    onError();
+    return () => {};
+  }
+
+  const source = new EventSource(`${API_URL}/api/contracts/${id}/events`);
+  const names: ContractEventName[] = [
+    "status", "processing", "text_extracted", "llm_running", "field_extracted", "completed", "failed",
+  ];
+  for (const name of names) {
+    source.addEventListener(name, (msg) => {
+      const event = JSON.parse((msg as MessageEvent).data) as ContractEvent;
+      if (name === "completed" || name === "failed") source.close();
+      onEvent(event);
+    });
+  }
+  source.onerror = () => {
+    source.close();
+    onError();
+  };
+  return () => source.close();
+}
+
+export async function listContracts(limit = 20, cursor?: string | null): Promise<{
   contracts: ContractSummary[];
   total: number;
+  next_cursor: string | null;
 }> {
-  const res = await fetch(`${API_URL}/api/contracts?skip=${skip}&limit=${limit}`);
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) params.set("cursor", cursor);
+  const res = await fetch(`${API_URL}/api/contracts?${params}`);
   if (!res.ok) throw new Error("Failed to list contracts");
   return res.json();
 }
 
+export async function searchContracts(
+  q: string,
+  offset = 0,
+  limit = 20
+): Promise<{ query: string; results: SearchResult[]; limit: number; offset: number }> {
+  const params = new URLSearchParams({ q, limit: String(limit), offset: String(offset) });
+  const res = await fetch(`${API_URL}/api/search?${params}`);
+  if (!res.ok) throw new Error("Search failed");
+  return res.json();
+}
+
+export async function getStats(): Promise<DashboardStats> {
+  const res = await fetch(`${API_URL}/api/stats`);
+  if (!res.ok) throw new Error("Failed to load stats");
+  return res.json();
+}
+
+export interface FieldEdit {
+  field: string;
+  value: unknown;
+  reason?: string;
+}
+
+// version is the contract version the edit was based on; a stale one is
+// rejected with 409 so concurrent reviewers don't overwrite each other
 export async function updateField(
   contractId: string,
   field: string,
   value: unknown,
-  reason?: string
+  reason?: string,
+  version?: number
 ): Promise<void> {
   const res = await fetch(`${API_URL}/api/contracts/${contractId}/fields`, {
     method: "PATCH",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ field, value, reason }),
+    body: JSON.stringify({ field, value, reason, version }),
+  });
+  if (!res.ok) {
+    const err = await res.json().catch(() => ({}));
+    throw new Error(err.detail || "Update failed");
+  }
+}
+
+// Apply several edits atomically; returns the contract's new version
+export async function updateFields(
+  contractId: string,
+  version: number,
+  edits: FieldEdit[],
+  reason?: string
+): Promise<number> {
+  const res = await fetch(`${API_URL}/api/contracts/${contractId}/fields/batch`, {
+    method: "PATCH",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ version, edits, reason }),
   });
   if (!res.ok) {
     const err = await res.json().catch(() => ({}));
     throw new Error(err.detail || "Update failed");
   }
+  return (await res.json()).version;
 }
 
 export async function exportContract(contractId: string, format: "json" | "csv"): Promise<void> {